@@ -1,89 +1,523 @@
 import json
-from typing import List, Optional
-from datetime import datetime
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+from datetime import date, datetime, timedelta
 from customer import Customer
 from room import Room
 from card import Card
 from stay import Stay
 from item_service import ItemService
 from service_provider import ServiceProvider
+from stay_archive import StayArchive
+from availability import AvailabilityIndex
+from change_feed import ChangeFeed
+from lazy_section import LazyList
+from guest_search import GuestSearchIndex
+from card_auth import CardAuthorizer
+from scheduler import TimerWheel
+from housekeeping import HousekeepingScheduler, HousekeepingTask
+from service_leases import ServiceLeaseBoard
+from snapshot import AdminSnapshot, SnapshotStore
+from service_ledger import ServiceLedger
+from reporting import KpiReports
+from night_audit import NightAudit
+from forecast import OccupancyForecast
+from rates import RateEngine
+from room_inventory import RoomInventoryIndex
+from segment_store import SegmentStore
+from checkpoint import Checkpointer
 
 class Admin:
-    DATA_FILE = "hotel_data.json"
+    DATA_FILE = "hotel_data.json"  # single-file layout, read only to migrate it
+    DATA_DIR = "hotel_data"
+    MAX_UNSAVED_SECONDS = 2.0
+    ARCHIVE_DIR = "stay_archive"
+    LEDGER_DIR = "service_ledger"
+    KPI_CACHE_FILE = "kpi_days.jsonl"
+    AUDIT_DIR = "night_audit"
+    CUSTOMER_ID_PREFIX = "CUST"
+    LATE_CHECKOUT_GRACE = timedelta(hours=2)
+    HOUSEKEEPING_HOUR = 9
+    LEASE_SECONDS = 300
+    LEASE_DIR = "service_leases"
+    SECTIONS = ("rooms", "cards", "customers", "reservations", "service_providers",
+                "room_services", "room_pending_services", "housekeeping")
+    SECTION_DEPENDENCIES = {
+        "cards": ("rooms",),
+        "customers": ("rooms", "cards"),
+        "reservations": ("rooms", "customers"),
+    }
 
-    def __init__(self, name: str):
+    def __init__(self, name: str, clock=time.time):
         self.name = name
-        self.customers: List[Customer] = []
+        self.customers: List[Customer] = LazyList()
         self.rooms: List[Room] = []
         self.reservations = {}
         self.service_providers = {}
-        self.cards: List[Card] = []
+        self.cards: List[Card] = LazyList()
         self.room_services = {}
         self.room_pending_services = {}
+        self.store = SegmentStore(self.DATA_DIR)
+        self.checkpoints = Checkpointer(self.store, self.MAX_UNSAVED_SECONDS)
+        self.archive = StayArchive(self.ARCHIVE_DIR)
+        self.ledger = ServiceLedger(self.LEDGER_DIR)
+        self.reports = KpiReports(self, self.KPI_CACHE_FILE)
+        self.availability = AvailabilityIndex()
+        self.inventory = RoomInventoryIndex()
+        self.forecast = OccupancyForecast()
+        self.rates = RateEngine()
+        self._batch_depth = 0
+        self._save_pending = False
+        self._customer_index = {}
+        self._room_index = {}
+        self._card_index = {}
+        self._occupants = {}
+        self._service_catalog = {}
+        self.card_auth = CardAuthorizer()
+        self._room_cards = {}
+        self._deferred_card_rooms = {}
+        self.scheduler = TimerWheel(clock)
+        self.overdue_customers = set()
+        self.housekeeping = HousekeepingScheduler()
+        self.leases = ServiceLeaseBoard(clock, self.LEASE_SECONDS, self.LEASE_DIR)
+        self.leases.on_change = self._publish_lease
+        self._pending_index = {}
+        self.changes = ChangeFeed()
+        self.snapshots = SnapshotStore()
+        self.next_request_id = 1
+        self.next_customer_number = 1
+        self.guests = GuestSearchIndex()
+        self._guests_indexed = False
+        self.version = 0
+        self.loaded_sections = set(self.SECTIONS)
+        self._schedule_daily_housekeeping()
+
+    def rebuild_indexes(self):
+        # Only loaded entries are indexed; deferred ones are added when their section loads
+        self._customer_index = {customer.customer_id: customer for customer in self.customers.loaded_items()}
+        self._room_index = {room.room_number: room for room in self.rooms}
+        self._card_index = {card.card_id: card for card in self.cards.loaded_items()}
+        self._occupants = {stay.room.room_number: cid for cid, stay in self.reservations.items() if stay.is_active}
+        self.inventory = RoomInventoryIndex()
+        for room in self.rooms:
+            self.inventory.add(room)
+            self._refresh_room_status(room.room_number)
+        self.card_auth = CardAuthorizer()
+        self._room_cards = {}
+        self._index_cards(self.cards.loaded_items())
+        for card in self.cards.loaded_items():
+            self._authorize_card(card)
+        for customer_id, stay in self.reservations.items():
+            if stay.is_active:
+                self._schedule_stay(customer_id, stay)
+        self._service_catalog = {}
+        for provider in self.service_providers.values():
+            self._index_provider(provider)
+
+    def _index_provider(self, provider: ServiceProvider):
+        for item in provider.items:
+            self._service_catalog.setdefault(item.name, (provider.name, item))
+
+    def _index_customers(self, customers: List[Customer]):
+        for customer in customers:
+            self._customer_index.setdefault(customer.customer_id, customer)
+            self.store.adopt("customers", customer.customer_id, customer)
+
+    def _index_cards(self, cards: List[Card]):
+        for card in cards:
+            self._card_index.setdefault(card.card_id, card)
+            self._room_cards.setdefault(card.room.room_number, {}).setdefault(card.card_id, card)
+            self.store.adopt("cards", card.card_id, card)
+
+    def find_customer(self, customer_id: str) -> Optional[Customer]:
+        customer = self._customer_index.get(customer_id)
+        if customer is None and not self.customers.loaded:
+            self.customers.load()
+            customer = self._customer_index.get(customer_id)
+        return customer
+
+    def find_room(self, room_number: str) -> Optional[Room]:
+        return self._room_index.get(room_number)
+
+    def find_card(self, card_id: str) -> Optional[Card]:
+        card = self._card_index.get(card_id)
+        if card is None and not self.cards.loaded:
+            self.cards.load()
+            card = self._card_index.get(card_id)
+        return card
+
+    def occupant_of(self, room_number: str) -> Optional[Customer]:
+        customer_id = self._occupants.get(room_number)
+        return self._customer_index.get(customer_id) if customer_id else None
+
+    @contextmanager
+    def batch(self):
+        # Mutations inside the block share a single save when the outermost batch exits
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._save_pending:
+                self._save_pending = False
+                self.save_to_file()
+
+    def commit(self):
+        # Writes now even inside a batch, e.g. between the chunks of a long import
+        depth, self._batch_depth = self._batch_depth, 0
+        self._save_pending = False
+        try:
+            self.save_to_file()
+        finally:
+            self._batch_depth = depth
 
     def save_to_file(self):
-        data = self.to_dict()
-        with open(self.DATA_FILE, 'w') as f:
-            json.dump(data, f, indent=4)
+        # Every mutation ends in a save, so this is where cached views learn the data moved on
+        self.version += 1
+        if self._batch_depth:
+            self._save_pending = True
+            return
+        self.snapshots.publish(self)
+        if self.loaded_sections != set(self.SECTIONS):
+            print("Refusing to save: only part of the data file was loaded.")
+            return
+        checkpoint = self.store.capture(self)
+        if checkpoint is not None:
+            self.checkpoints.submit(checkpoint)
+
+    def flush(self) -> bool:
+        # Saves return before their checkpoint is on disk; this waits for it
+        if not self.checkpoints.flush():
+            print(f"Could not write the data files: {self.checkpoints.last_error}")
+            return False
+        return True
 
     @classmethod
-    def load_from_file(cls, name: str):
-        try:
-            with open(cls.DATA_FILE, 'r') as f:
-                data = json.load(f)
-            return cls.from_dict(data)
-        except FileNotFoundError:
-            return cls(name)
+    def load_from_file(cls, name: str, sections=None):
+        # A checkpoint still in flight in this process would be missed, and its new files swept as strays
+        Checkpointer.flush_all(cls.DATA_DIR)
+        store = SegmentStore(cls.DATA_DIR)
+        if store.exists():
+            # Guests and reservations are always read: they decide which guests are built up front
+            data = store.load(cls.resolve_sections(sections) | {"customers", "reservations"})
+            for section in cls.SECTIONS:
+                data.setdefault(section, [] if section in store.LIST_SECTIONS else {})
+        else:
+            try:
+                with open(cls.DATA_FILE, 'r') as f:
+                    data = json.load(f)
+            except FileNotFoundError:
+                return cls(name)
+        admin = cls.from_dict(data, sections)
+        if store.exists():
+            admin.store = store
+            admin.checkpoints = Checkpointer(store, cls.MAX_UNSAVED_SECONDS)
+            store.adopt_all(admin)
+        return admin
 
     def to_dict(self):
         return {
             "name": self.name,
-            "customers": [customer.to_dict() for customer in self.customers],
+            "next_request_id": self.next_request_id,
+            "next_customer_number": self.next_customer_number,
+            "customers": self.customers.to_dicts(lambda customer: customer.to_dict()),
             "rooms": [room.to_dict() for room in self.rooms],
             "reservations": {cid: stay.to_dict() for cid, stay in self.reservations.items()},
             "service_providers": {name: provider.to_dict() for name, provider in self.service_providers.items()},
-            "cards": [card.to_dict() for card in self.cards],
+            "cards": self.cards.to_dicts(lambda card: card.to_dict()),
             "room_services": {room_number: [item.to_dict() for item in items] 
                              for room_number, items in self.room_services.items()},
             "room_pending_services": {room_number: [item.to_dict() for item in items] 
-                                     for room_number, items in self.room_pending_services.items()}
+                                     for room_number, items in self.room_pending_services.items()},
+            "housekeeping": self.housekeeping.to_dict(),
+            "rates": self.rates.to_dict()
         }
 
     @classmethod
-    def from_dict(cls, data):
+    def resolve_sections(cls, sections=None) -> set:
+        if sections is None:
+            return set(cls.SECTIONS)
+        resolved = set()
+        pending = list(sections)
+        while pending:
+            section = pending.pop()
+            if section not in resolved:
+                resolved.add(section)
+                pending.extend(cls.SECTION_DEPENDENCIES.get(section, ()))
+        return resolved
+
+    @classmethod
+    def from_dict(cls, data, sections=None):
         admin = cls(data["name"])
-        admin.rooms = [Room.from_dict(r) for r in data["rooms"]]
+        wanted = cls.resolve_sections(sections)
+        admin.loaded_sections = wanted
+        if "rooms" in wanted:
+            admin.rooms = [Room.from_dict(r) for r in data["rooms"]]
         room_map = {room.room_number: room for room in admin.rooms}
-        admin.cards = [Card.from_dict(card, room_map) for card in data["cards"]]
-        card_map = {card.card_id: card for card in admin.cards}
-        admin.customers = [Customer.from_dict(c, room_map, card_map) for c in data["customers"]]
-        admin.reservations = {
-            cid: Stay.from_dict(stay_data, admin.customers, room_map)
-            for cid, stay_data in data["reservations"].items()
-        }
-        for customer in admin.customers:
-            customer.stay = admin.reservations.get(customer.customer_id)
-        admin.service_providers = {name: ServiceProvider.from_dict(provider) 
-                                  for name, provider in data["service_providers"].items()}
-        admin.room_services = {
-            room_number: [ItemService.from_dict(item) for item in items]
-            for room_number, items in data.get("room_services", {}).items()
-        }
-        admin.room_pending_services = {
-            room_number: [ItemService.from_dict(item) for item in items]
-            for room_number, items in data.get("room_pending_services", {}).items()
-        }
+        # Guests with a reservation, their cards and every active card are built
+        # now; past guests and idle cards stay as raw dicts until first needed.
+        current_customers, past_customers = [], []
+        for customer_data in data["customers"]:
+            is_current = customer_data["customer_id"] in data["reservations"]
+            (current_customers if is_current else past_customers).append(customer_data)
+        held_cards = {c["card"]["card_id"] for c in current_customers if c["card"]}
+        if "cards" in wanted:
+            live_cards, idle_cards = [], []
+            for card_data in data["cards"]:
+                is_live = card_data["is_active"] or card_data["card_id"] in held_cards
+                (live_cards if is_live else idle_cards).append(card_data)
+            admin.cards = LazyList([Card.from_dict(card, room_map) for card in live_cards], idle_cards,
+                                   lambda card: Card.from_dict(card, admin._room_index), admin._index_cards)
+            # (card_id, is_active) of the deferred cards per room, so listings need not build them
+            for card in idle_cards:
+                admin._deferred_card_rooms.setdefault(card["room"]["room_number"], []).append(
+                    (card["card_id"], card["is_active"]))
+        card_map = {card.card_id: card for card in admin.cards.loaded_items()}
+        if "customers" in wanted:
+            admin.customers = LazyList([Customer.from_dict(c, room_map, card_map) for c in current_customers],
+                                       past_customers,
+                                       lambda c: Customer.from_dict(c, admin._room_index, admin._card_index),
+                                       admin._index_customers)
+        if "reservations" in wanted:
+            customer_map = {customer.customer_id: customer for customer in admin.customers.loaded_items()}
+            admin.reservations = {
+                cid: Stay.from_dict(stay_data, customer_map, room_map)
+                for cid, stay_data in data["reservations"].items()
+            }
+            for customer in admin.customers.loaded_items():
+                customer.stay = admin.reservations.get(customer.customer_id)
+            for cid, stay in admin.reservations.items():
+                admin.availability.book(cid, stay.room.room_number, stay.start_date, stay.length, force=True)
+                admin._forecast_stay(cid, stay)
+        if "service_providers" in wanted:
+            admin.service_providers = {name: ServiceProvider.from_dict(provider)
+                                      for name, provider in data["service_providers"].items()}
+        admin.rebuild_indexes()
+        if "room_services" in wanted:
+            admin.room_services = {
+                room_number: [ItemService.from_dict(item) for item in items]
+                for room_number, items in data.get("room_services", {}).items()
+            }
+        if "room_pending_services" in wanted:
+            admin.room_pending_services = {
+                room_number: [ItemService.from_dict(item) for item in items]
+                for room_number, items in data.get("room_pending_services", {}).items()
+            }
+        requested = [item for items in admin.room_pending_services.values() for item in items]
+        requested += [item for items in admin.room_services.values() for item in items]
+        known_ids = [item.request_id for item in requested if item.request_id is not None]
+        admin.next_request_id = max([data.get("next_request_id", 1)] + [rid + 1 for rid in known_ids])
+        for room_number, items in admin.room_pending_services.items():
+            for item in items:
+                if item.request_id is None:
+                    item.request_id = admin._allocate_request_id()
+                admin._track_pending(room_number, item)
+        if "housekeeping" in wanted:
+            admin.housekeeping = HousekeepingScheduler.from_dict(data.get("housekeeping", {}))
+            for room_number in {task.room_number for task in admin.housekeeping.tasks.values()}:
+                admin._refresh_room_status(room_number)
+        admin.rates = RateEngine.from_dict(data.get("rates", {}))
+        if "next_customer_number" in data:
+            admin.next_customer_number = data["next_customer_number"]
+        else:
+            # Files written before the sequence was persisted: continue after the highest ID ever issued
+            known_ids = [c["customer_id"] for c in data["customers"]] + admin.archive.customer_ids()
+            numbers = [n for n in map(cls._customer_number, known_ids) if n is not None]
+            admin.next_customer_number = max(numbers, default=0) + 1
+        admin.snapshots.reset(admin)
         return admin
 
+    @classmethod
+    def _customer_number(cls, customer_id: str) -> Optional[int]:
+        digits = customer_id[len(cls.CUSTOMER_ID_PREFIX):]
+        if customer_id.startswith(cls.CUSTOMER_ID_PREFIX) and digits.isdigit():
+            return int(digits)
+        return None
+
+    def allocate_customer_id(self) -> str:
+        customer_id = f"{self.CUSTOMER_ID_PREFIX}{self.next_customer_number:03d}"
+        self.next_customer_number += 1
+        return customer_id
+
+    def _allocate_request_id(self) -> int:
+        request_id = self.next_request_id
+        self.next_request_id += 1
+        return request_id
+
+    @staticmethod
+    def stay_end(stay: Stay) -> datetime:
+        return stay.start_date + timedelta(days=stay.length)
+
+    def _authorize_card(self, card: Card):
+        # Cards for an occupied room stop opening it when the occupant's stay is due to end
+        occupant = self.occupant_of(card.room.room_number)
+        stay = occupant.stay if occupant else None
+        self.card_auth.grant(card.card_id, card.room.room_number, card.is_active,
+                             self.stay_end(stay) if stay else None)
+
+    def _schedule_stay(self, customer_id: str, stay: Stay):
+        end = self.stay_end(stay)
+        self.scheduler.schedule(("stay_end", customer_id), end.timestamp(), self._on_stay_end)
+        self.scheduler.schedule(("late_checkout", customer_id), (end + self.LATE_CHECKOUT_GRACE).timestamp(),
+                                self._on_late_checkout)
+
+    def _cancel_stay_timers(self, customer_id: str):
+        self.scheduler.cancel(("stay_end", customer_id))
+        self.scheduler.cancel(("late_checkout", customer_id))
+        self.overdue_customers.discard(customer_id)
+
+    def _on_stay_end(self, key: tuple):
+        customer_id = key[1]
+        stay = self.reservations.get(customer_id)
+        if not stay or not stay.is_active:
+            return
+        room_number = stay.room.room_number
+        for card in self._room_cards.get(room_number, {}).values():
+            if card.is_active:
+                card.deactivate()
+                self._publish_card(card, "updated")
+        self.overdue_customers.add(customer_id)
+        self.snapshots.touch(room_number)
+        self.changes.publish("stay", customer_id, "overdue", {"room_number": room_number})
+        print(f"Stay for customer {customer_id} in Room {room_number} has ended; its cards were deactivated.")
+        self.save_to_file()
+
+    def _on_late_checkout(self, key: tuple):
+        customer_id = key[1]
+        stay = self.reservations.get(customer_id)
+        if not stay or not stay.is_active:
+            return
+        self.changes.publish("stay", customer_id, "late_checkout", {"room_number": stay.room.room_number})
+        print(f"Customer {customer_id} has not checked out of Room {stay.room.room_number}.")
+
+    def _schedule_daily_housekeeping(self):
+        now = datetime.fromtimestamp(self.scheduler.clock())
+        run_at = now.replace(hour=self.HOUSEKEEPING_HOUR, minute=0, second=0, microsecond=0)
+        if run_at <= now:
+            run_at += timedelta(days=1)
+        self.scheduler.schedule(("housekeeping", "daily"), run_at.timestamp(), self._on_daily_housekeeping)
+
+    def _on_daily_housekeeping(self, key: tuple):
+        self.generate_daily_housekeeping()
+        self._schedule_daily_housekeeping()
+
+    def _add_housekeeping_task(self, room_number: str, kind: str, deadline: datetime = None,
+                               request_id: int = None) -> HousekeepingTask:
+        task = self.housekeeping.add_task(room_number, self._room_index[room_number].floor, kind,
+                                          datetime.fromtimestamp(self.scheduler.clock()), deadline, request_id)
+        self.changes.publish("housekeeping", task.task_id, "added",
+                             {"room_number": room_number, "kind": kind, "assigned_to": task.assigned_to})
+        self._refresh_room_status(room_number)
+        return task
+
+    def _close_housekeeping_task(self, task_id: int) -> Optional[HousekeepingTask]:
+        task = self.housekeeping.close(task_id)
+        if task:
+            self.changes.publish("housekeeping", task_id, "removed",
+                                 {"room_number": task.room_number, "assigned_to": task.assigned_to})
+            self._refresh_room_status(task.room_number)
+        return task
+
+    def _refresh_room_status(self, room_number: str):
+        # Occupied while a guest is checked in; dirty until its turnover clean is done
+        self.inventory.set_occupied(room_number, room_number in self._occupants)
+        self.inventory.set_dirty(room_number, any(task.kind == HousekeepingTask.CHECKOUT_CLEAN
+                                                  for task in self.housekeeping.open_tasks_for_room(room_number)))
+
+    def generate_daily_housekeeping(self) -> int:
+        # One routine service per occupied room, unless one is still outstanding
+        created = 0
+        for room_number in sorted(self._occupants):
+            open_kinds = {task.kind for task in self.housekeeping.open_tasks_for_room(room_number)}
+            if HousekeepingTask.DAILY_SERVICE not in open_kinds:
+                self._add_housekeeping_task(room_number, HousekeepingTask.DAILY_SERVICE)
+                created += 1
+        if created:
+            self.save_to_file()
+        return created
+
+    def add_housekeeping_staff(self, name: str, floor: int):
+        self.housekeeping.add_staff(name, floor)
+        self.save_to_file()
+
+    def remove_housekeeping_staff(self, name: str):
+        self.housekeeping.remove_staff(name)
+        self.save_to_file()
+
+    def complete_housekeeping_task(self, task_id: int, completion_details: str = None,
+                                   worker: str = None) -> (bool, str):
+        task = self.housekeeping.tasks.get(task_id)
+        if not task:
+            return False, f"Housekeeping task {task_id} not found."
+        if task.request_id is not None:
+            # The task stands for a requested RoomSupport service; finishing one finishes both,
+            # and a service claimed by another worker leaves the task open
+            completed, message = self._finish_service(task.room_number, task.kind, "RoomSupport",
+                                                      task.request_id, worker)
+            if not completed:
+                return False, message
+        self._close_housekeeping_task(task_id)
+        attendant = task.assigned_to or "housekeeping"
+        self._write_completion_log([self._completion_log_entry(task.room_number, task.kind, attendant,
+                                                               completion_details or "None")])
+        self.save_to_file()
+        return True, f"{task} completed by {attendant}."
+
+    def run_scheduled_tasks(self, now: float = None) -> int:
+        with self.batch():
+            return self.scheduler.advance(now)
+
+    def _track_pending(self, room_number: str, item: ItemService):
+        self._pending_index[item.request_id] = (room_number, item)
+        # Named by request id and request time, which together mean the same request in every process
+        name = f"{item.request_id}-{item.requested_at:%Y%m%d%H%M%S%f}" if item.requested_at else None
+        self.leases.add(item.provider_name, item.request_id, name)
+        self.snapshots.touch(room_number)
+
+    def _untrack_pending(self, request_id: int):
+        entry = self._pending_index.pop(request_id, None)
+        if entry:
+            self.snapshots.touch(entry[0])
+        self.leases.discard(request_id)
+
+    def _publish_lease(self, request_id: int, action: str, worker: Optional[str]):
+        self.changes.publish("service", request_id, action, {"holder": worker})
+
+    def _publish_card(self, card: Card, action: str):
+        # Every card mutation goes through here, so the swipe table is kept current alongside the feed
+        if action == "removed":
+            self.card_auth.revoke(card.card_id)
+        else:
+            self._authorize_card(card)
+        self.snapshots.touch(card.room.room_number)
+        self.changes.publish("card", card.card_id, action, {"room_number": card.room.room_number, "is_active": card.is_active})
+
+    def authorize_swipe(self, card_id: str, room_number: str) -> bool:
+        return self.card_auth.authorize(card_id, room_number)
+
+    def validate_swipes(self, swipes: List[tuple]) -> List[bool]:
+        return self.card_auth.authorize_many(swipes)
+
     def add_service_provider(self, provider):
         self.service_providers[provider.name] = provider
+        self._index_provider(provider)
+        self.snapshots.services_changed()
         self.save_to_file()
 
     def get_service_provider(self, name: str):
         return self.service_providers.get(name)
 
     def add_room(self, room: Room):
+        room.opened_on = room.opened_on or date.today()
         self.rooms.append(room)
+        self._room_index[room.room_number] = room
+        self.inventory.add(room)
+        self._refresh_room_status(room.room_number)
+        self.snapshots.touch(room.room_number)
+        for section in ("rooms", "room_services", "room_pending_services"):
+            self.store.touch(section, room.room_number)
+        self.snapshots.rooms_changed()
         if room.room_number not in self.room_services:
             self.room_services[room.room_number] = []
         if room.room_number not in self.room_pending_services:
@@ -92,34 +526,136 @@ class Admin:
 
     def add_customer(self, customer: Customer):
         self.customers.append(customer)
+        self._customer_index[customer.customer_id] = customer
+        self.store.touch("customers", customer.customer_id)
+        number = self._customer_number(customer.customer_id)
+        if number is not None and number >= self.next_customer_number:
+            self.next_customer_number = number + 1
+        self.guests.add(customer.customer_id, customer.name)
         self.save_to_file()
 
-    def add_reservation(self, customer_id: str, room: Room, length: int):
-        customer = next((c for c in self.customers if c.customer_id == customer_id), None)
+    def search_guests(self, query: str, limit: int = 20) -> List[tuple]:
+        # Past guests come from the archive's name list, loaded on the first search
+        if not self._guests_indexed:
+            self._guests_indexed = True
+            self.guests.add_many((customer_id, name) for customer_id, name in self.archive.guest_names().items()
+                                 if customer_id not in self.guests)
+            self.guests.add_many((customer.customer_id, customer.name) for customer in self.customers)
+        return self.guests.search(query, limit)
+
+    def archive_customer(self, customer: Customer, services: List[ItemService] = None, archived_at: datetime = None):
+        self.archive.append(customer, customer.stay, services or [], archived_at)
+        # Dropped by identity: a list remove would compare against, and so build, every deferred guest
+        if self._customer_index.get(customer.customer_id) is customer:
+            self.customers.remove_items([customer])
+        self._customer_index.pop(customer.customer_id, None)
+        self.store.touch("customers", customer.customer_id)
+
+    def archive_past_customers(self) -> int:
+        # Runs at every start; deferred past guests are archived from their saved form, never built
+        is_past = lambda data: data["customer_id"] not in self.reservations
+        past = [c for c in self.customers.loaded_items() if c.customer_id not in self.reservations]
+        past_raw = self.customers.deferred_matching(is_past)
+        for customer in past:
+            self.archive.append(customer, customer.stay, [])
+            self._customer_index.pop(customer.customer_id, None)
+            self.store.touch("customers", customer.customer_id)
+        for customer_data in past_raw:
+            self.archive.append_raw(customer_data)
+            self.store.touch("customers", customer_data["customer_id"])
+        self.customers.remove_items(past, is_past if past_raw else None)
+        return len(past) + len(past_raw)
+
+    def _forecast_stay(self, customer_id: str, stay: Stay):
+        self.forecast.book(customer_id, stay.room.room_type, stay.start_date.date(), stay.length,
+                           stay.booked_at.date())
+
+    def add_reservation(self, customer_id: str, room: Room, length: int, start_date: datetime = None):
+        customer = self.find_customer(customer_id)
         if not customer:
             return False
-        stay = Stay(customer, room, datetime.now(), length)
+        start_date = start_date or datetime.now()
+        if not self.availability.book(customer_id, room.room_number, start_date, length):
+            print(f"Room {room.room_number} is already booked for the requested dates.")
+            return False
+        stay = Stay(customer, room, start_date, length)
         stay.is_active = False
         self.reservations[customer_id] = stay
+        self.store.touch("reservations", customer_id)
+        self.snapshots.touch_reservation(customer_id)
         customer.assign_stay(stay)
+        self._forecast_stay(customer_id, stay)
         self.save_to_file()
         return True
 
-    def update_reservation(self, customer_id: str, room: Room = None, length: int = None):
+    def update_reservation(self, customer_id: str, room: Room = None, length: int = None, start_date: datetime = None):
         if customer_id not in self.reservations or not self.reservations[customer_id]:
             return False
         stay = self.reservations[customer_id]
         if stay.is_active:
             return False
-        if room:
-            stay.room = room
-        if length is not None:
-            stay.length = length
+        new_room = room or stay.room
+        new_length = length if length is not None else stay.length
+        new_start = start_date or stay.start_date
+        if not self.availability.book(customer_id, new_room.room_number, new_start, new_length):
+            print(f"Room {new_room.room_number} is already booked for the requested dates.")
+            return False
+        stay.room = new_room
+        stay.length = new_length
+        stay.start_date = new_start
         self.reservations[customer_id] = stay
+        self.snapshots.touch_reservation(customer_id)
         stay.customer.assign_stay(stay)
+        self._forecast_stay(customer_id, stay)
         self.save_to_file()
         return True
 
+    def assign_rooms(self, requests: List['StayRequest']) -> List[tuple]:
+        from room_assignment import RoomAssigner
+        assignments = RoomAssigner(self).assign(requests)
+        with self.batch():
+            for request, room in assignments:
+                if not room:
+                    continue
+                if not self.find_customer(request.customer_id):
+                    self.add_customer(Customer(request.customer_name, request.customer_id))
+                self.add_reservation(request.customer_id, room, request.nights, request.start_date)
+        return assignments
+
+    def occupancy_forecast(self, days: int = 30, room_type: str = None) -> List[tuple]:
+        # (night, rooms booked, occupancy rate) from today; the rate is against rooms of that type
+        self.forecast.roll()
+        rooms = [room for room in self.rooms if room_type is None or room.room_type == room_type]
+        counts = self.forecast.occupancy if room_type is None else self.forecast.demand.get(room_type, [])
+        rates = self.forecast.occupancy_rates(len(rooms), days, room_type)
+        return [(night, counts[n] if n < len(counts) else 0, rates[n])
+                for n, night in enumerate(self.forecast.nights(days))]
+
+    def pickup_curve(self, arrival_start: date, arrival_end: date, max_lead: int = 90,
+                     room_type: str = None) -> List[int]:
+        return self.forecast.pickup_curve(arrival_start, arrival_end, max_lead, room_type)
+
+    def find_rooms(self, room_type: str = None, floors=None, features=(), min_capacity: int = None,
+                   status=()) -> List[Room]:
+        mask = self.inventory.match(room_type, floors, features, min_capacity, status)
+        return [self._room_index[room_number] for room_number in self.inventory.room_numbers(mask)]
+
+    def quote_rooms(self, start_date: datetime, nights: int, room_type: str = None) -> List[tuple]:
+        # (room_number, room_type, free for the whole range, total) for every room, priced once per room type
+        rooms = [room for room in self.rooms if room_type is None or room.room_type == room_type]
+        free = {room.room_number for room in self.find_available_rooms(start_date, nights)}
+        totals = self.rates.quote_rooms(rooms, start_date.date(), nights)
+        return [(room.room_number, room.room_type, room.room_number in free, totals[room.room_number])
+                for room in rooms]
+
+    def is_room_available(self, room_number: str, start_date: datetime, length: int) -> bool:
+        return self.availability.is_available(room_number, start_date, length)
+
+    def find_available_rooms(self, start_date: datetime, nights: int) -> List[Room]:
+        room_map = {room.room_number: room for room in self.rooms}
+        available = self.availability.find_available_rooms(list(room_map), start_date, nights)
+        return [room_map[room_number] for room_number in available]
+
     def delete_reservation(self, customer_id: str):
         if customer_id not in self.reservations or not self.reservations[customer_id]:
             return False
@@ -127,86 +663,196 @@ class Admin:
         if stay.is_active:
             return False
         del self.reservations[customer_id]
-        customer = next((c for c in self.customers if c.customer_id == customer_id), None)
+        self.store.touch("reservations", customer_id)
+        self.snapshots.touch_reservation(customer_id)
+        self.availability.release(customer_id)
+        self.forecast.cancel(customer_id)
+        customer = self.find_customer(customer_id)
         if customer:
             customer.stay = None
+            self.archive_customer(customer)
         self.save_to_file()
         return True
 
-    def check_in(self, customer_id: str, payment_done: bool = False) -> bool:
-        customer = next((c for c in self.customers if c.customer_id == customer_id), None)
+    def _check_in_error(self, customer_id: str, payment_done: bool, claimed_rooms=()) -> Optional[str]:
+        customer = self.find_customer(customer_id)
         if not customer:
-            print(f"Customer with ID {customer_id} not found.")
-            return False
-
+            return f"Customer with ID {customer_id} not found."
         if customer_id not in self.reservations or not self.reservations[customer_id]:
-            print(f"Reservation for customer {customer_id} not found.")
-            return False
-
+            return f"Reservation for customer {customer_id} not found."
         if not payment_done:
-            print(f"Customer {customer.name} needs to pay for the reservation.")
-            return False
-
+            return f"Customer {customer.name} needs to pay for the reservation."
         stay = self.reservations[customer_id]
         if stay.is_active:
-            print(f"Customer {customer.name} is already checked in.")
-            return False
-
-        room = stay.room
-        for c in self.customers:
-            if c.stay and c.stay.room == room and c.stay.is_active:
-                print(f"Room {room.room_number} is already occupied by another customer.")
-                return False
+            return f"Customer {customer.name} is already checked in."
+        # The nights before the start date are not booked and may belong to another guest
+        if datetime.now().date() < stay.start_date.date():
+            return f"Reservation for {customer.name} starts on {stay.start_date:%Y-%m-%d}; check-in is not open yet."
+        room_number = stay.room.room_number
+        if room_number in self._occupants or room_number in claimed_rooms:
+            return f"Room {room_number} is already occupied by another customer."
+        return None
 
-        card = Card(card_id=f"CARD-{customer_id}", room=room)
+    def _start_stay(self, customer_id: str) -> Card:
+        customer = self.find_customer(customer_id)
+        stay = self.reservations[customer_id]
+        card = Card(card_id=f"CARD-{customer_id}", room=stay.room)
         card.activate()
         customer.assign_card(card)
-        self.cards.append(card)
-
+        stay.checked_in_at = datetime.now()
         stay.is_active = True
+        self.snapshots.touch_reservation(customer_id)
         customer.assign_stay(stay)
-        self.reservations[customer_id] = stay
+        self._occupants[stay.room.room_number] = customer_id
+        self._refresh_room_status(stay.room.room_number)
+        self.snapshots.touch(stay.room.room_number)
+        self._index_cards([card])
+        self.store.touch("cards", card.card_id)
+        self._publish_card(card, "added")
+        self._schedule_stay(customer_id, stay)
+        return card
+
+    def check_in(self, customer_id: str, payment_done: bool = False) -> bool:
+        error = self._check_in_error(customer_id, payment_done)
+        if error:
+            print(error)
+            return False
 
-        print(f"Customer {customer.name} successfully checked in to {room} and received {card}.")
+        card = self._start_stay(customer_id)
+        self.cards.append(card)
+        customer = self.find_customer(customer_id)
+        print(f"Customer {customer.name} successfully checked in to {card.room} and received {card}.")
         self.save_to_file()
         return True
 
+    def bulk_check_in(self, customer_ids: List[str], payment_done: bool = False) -> (bool, List[str]):
+        # Validate the whole group first so a bad entry leaves nothing half checked in
+        errors = []
+        claimed_rooms = set()
+        for customer_id in customer_ids:
+            error = self._check_in_error(customer_id, payment_done, claimed_rooms)
+            if error:
+                errors.append(error)
+            else:
+                claimed_rooms.add(self.reservations[customer_id].room.room_number)
+        if len(set(customer_ids)) != len(customer_ids):
+            errors.append("Duplicate customer IDs in check-in batch.")
+        if errors:
+            return False, errors
+
+        cards = [self._start_stay(customer_id) for customer_id in customer_ids]
+        self.cards.extend(cards)
+        self.save_to_file()
+        return True, [f"{card.card_id} issued for {card.room}" for card in cards]
+
+    def bulk_create_reservations(self, guests: List[tuple]) -> (bool, List[str]):
+        # Each guest is (name, customer_id, room_number, length[, start_date])
+        errors = []
+        seen_ids = set()
+        booked = []
+        entries = []
+        for guest in guests:
+            name, customer_id, room_number, length = guest[:4]
+            start_date = (guest[4] if len(guest) > 4 else None) or datetime.now()
+            room = self.find_room(room_number)
+            if not room:
+                errors.append(f"Room {room_number} not found.")
+            elif customer_id in seen_ids or self.find_customer(customer_id):
+                errors.append(f"Customer ID {customer_id} already exists.")
+            elif length <= 0:
+                errors.append(f"Invalid stay length {length} for {customer_id}.")
+            elif not self.availability.book(customer_id, room_number, start_date, length):
+                errors.append(f"Room {room_number} is not available for {customer_id}.")
+            else:
+                booked.append(customer_id)
+                entries.append((Customer(name, customer_id), room, length, start_date))
+            seen_ids.add(customer_id)
+        if errors:
+            for customer_id in booked:
+                self.availability.release(customer_id)
+            return False, errors
+
+        with self.batch():
+            for customer, room, length, start_date in entries:
+                self.add_customer(customer)
+                self.add_reservation(customer.customer_id, room, length, start_date)
+        return True, [f"Reservation created for {c.name} (ID: {c.customer_id}) in Room {r.room_number}."
+                      for c, r, _, _ in entries]
+
     def check_out(self, customer_id: str) -> (bool, str):
-        customer = next((c for c in self.customers if c.customer_id == customer_id), None)
+        customer = self.find_customer(customer_id)
         if not customer or not customer.stay or not customer.stay.is_active:
             return False, f"Customer {customer_id} is not checked in or has no active stay."
 
-        # Check if there is at least one active card associated with the customer's room
-        room = customer.stay.room
-        room_cards = [card for card in self.cards if card.room == room and card.is_active]
-        if not room_cards:
-            return False, f"No active cards available for Room {room.room_number}. Cannot check out."
-
+        # Check if there is at least one active card associated with the customer's room;
+        # an overdue stay has had its cards switched off by the scheduler
         room_number = customer.stay.room.room_number
+        room_cards = self._room_cards.get(room_number, {})
+        if not any(card.is_active for card in room_cards.values()) and customer_id not in self.overdue_customers:
+            return False, f"No active cards available for Room {room_number}. Cannot check out."
+
+        check_out_time = datetime.now()
+        stay = customer.stay
+        # Nights are charged from the actual arrival; stays checked in before it was recorded use the booked date
+        arrival = (stay.checked_in_at or stay.start_date).date()
+        nights = max(1, (check_out_time.date() - arrival).days)
+        stay.room_charges = self.rates.quote(stay.room.room_type, arrival, nights)
+        if stay.room_charges > 0:
+            print(f"Customer {customer.name} room charges for {nights} night(s): ${stay.room_charges:.2f}")
+
         charges = sum(item.price for item in self.room_services.get(room_number, []))
         if charges > 0:
             print(f"Customer {customer.name} incurred additional charges: ${charges}")
             print(f"Customer {customer.name} paid additional charges: ${charges}")
 
-        # Deactivate and remove all cards associated with the room
-        all_room_cards = [card for card in self.cards if card.room == room]  # Get all cards for the room (active or not)
-        for card in all_room_cards:
+        # Deactivate and remove all cards associated with the room in a single pass over the card list
+        room_cards = list(self._room_cards.pop(room_number, {}).values())
+        for card in room_cards:
             card.deactivate()
-            self.cards.remove(card)
+            self._card_index.pop(card.card_id, None)
+            self.store.touch("cards", card.card_id)
+            self._publish_card(card, "removed")
+        deferred_filter = None
+        if not self.cards.loaded and room_number in self._deferred_card_rooms:
+            for card_id, _ in self._deferred_card_rooms.pop(room_number):
+                self.store.touch("cards", card_id)
+            deferred_filter = lambda data: data["room"]["room_number"] == room_number
+        self.cards.remove_items(room_cards, deferred_filter)
 
         # Clear the customer's assigned card reference (if it exists)
         customer.card = None
 
-        check_in_time = customer.stay.start_date
-        check_out_time = datetime.now()
+        check_in_time = customer.stay.checked_in_at or customer.stay.start_date
         customer.stay.end_stay(check_out_time)
 
         if customer_id in self.reservations:
             del self.reservations[customer_id]
+            self.store.touch("reservations", customer_id)
+            self.snapshots.touch_reservation(customer_id)
+        self.availability.release(customer_id)
+        self.forecast.cancel(customer_id)
+        self._occupants.pop(room_number, None)
+        self._refresh_room_status(room_number)
+        self.snapshots.touch(room_number)
+        self._cancel_stay_timers(customer_id)
 
+        # Move the guest, the ended stay and its service lines out of the live state
+        self.archive_customer(customer, self.room_services.get(room_number, []), check_out_time)
         self.room_services[room_number] = []
+        self.store.touch("room_services", room_number)
+        self.store.touch("room_pending_services", room_number)
+        for item in self.room_pending_services.get(room_number, []):
+            self._untrack_pending(item.request_id)
+            self.changes.publish("service", item.request_id, "removed", {"room_number": room_number})
         self.room_pending_services[room_number] = []
 
+        # Outstanding room work is superseded by a full turnover clean, ranked by the next arrival
+        for task in self.housekeeping.open_tasks_for_room(room_number):
+            self._close_housekeeping_task(task.task_id)
+        next_arrival = self.availability.next_arrival(room_number, check_out_time.date())
+        self._add_housekeeping_task(room_number, HousekeepingTask.CHECKOUT_CLEAN,
+                                    datetime.combine(next_arrival, datetime.min.time()) if next_arrival else None)
+
         message = (f"Customer {customer.name} (ID: {customer_id}) checked in at {check_in_time} "
                 f"and checked out at {check_out_time}.")
         print(message)
@@ -214,18 +860,13 @@ class Admin:
         return True, message
 
     def add_service_to_room(self, room_number: str, service_name: str):
-        room = next((r for r in self.rooms if r.room_number == room_number), None)
+        room = self.find_room(room_number)
         if not room:
             print(f"Room {room_number} not found.")
             return False
 
-        hotel_provider = self.get_service_provider("Hotel")
-        room_support_provider = self.get_service_provider("RoomSupport")
-        service_item = None
-        if hotel_provider:
-            service_item = next((item for item in hotel_provider.items if item.name == service_name), None)
-        if not service_item and room_support_provider:
-            service_item = next((item for item in room_support_provider.items if item.name == service_name), None)
+        entry = self._service_catalog.get(service_name)
+        service_item = entry[1] if entry and entry[0] in ("Hotel", "RoomSupport") else None
 
         if not service_item:
             print(f"Service '{service_name}' not found in available services.")
@@ -235,6 +876,9 @@ class Admin:
             if room_number not in self.room_services:
                 self.room_services[room_number] = []
             self.room_services[room_number].append(service_item)
+            self.snapshots.touch(room_number)
+            self.store.touch("room_services", room_number)
+            self.ledger.append(datetime.now(), room_number, service_item.name, entry[0], service_item.price)
             print(f"Service '{service_name}' added to Room {room.room_number}.")
             self.save_to_file()
             return True
@@ -242,76 +886,67 @@ class Admin:
             print(f"Error adding service: {e}")
             return False
 
-    def generate_customer_service_record(self, customer_id: str) -> Optional[str]:
-        customer = next((c for c in self.customers if c.customer_id == customer_id), None)
-        if not customer or not customer.stay:
-            return f"Customer with ID {customer_id} has no active stay."
+    def snapshot(self) -> AdminSnapshot:
+        # Last committed state; costs nothing to take and is safe to read from any thread
+        return self.snapshots.current
 
-        room_number = customer.stay.room.room_number
-        service_record = self.room_services.get(room_number, [])
-        if not service_record:
-            return f"No services used in Room {room_number} during the stay of Customer {customer.name}."
-
-        report = f"--- Service Record for Customer {customer.name} (ID: {customer.customer_id}) ---\n"
-        report += f"Room: {room_number}\n"
-        for item in service_record:
-            report += f"- {item.name}: ${item.price}\n"
-        report += f"-------------------------------------------------------------------\n"
-        report += f"Total Service Charges: ${sum(item.price for item in service_record)}\n"
-        return report
+    def _read_view(self) -> AdminSnapshot:
+        # Inside a batch the writer reads its own uncommitted changes
+        return self.snapshots.preview(self) if self._batch_depth else self.snapshots.current
+
+    def generate_customer_service_record(self, customer_id: str) -> Optional[str]:
+        return self._read_view().service_record(customer_id)
 
     def get_room_occupancy_details(self) -> str:
-        report = "--- Room Occupancy Status ---\n"
-        for room in self.rooms:
-            customer = next((c for c in self.customers if c.stay and c.stay.room == room and c.stay.is_active), None)
-            cards = [card for card in self.cards if card.room == room]
+        return self._read_view().occupancy_report()
 
-            customer_info = "Vacant"
-            if customer:
-                customer_info = f"Occupied by Customer: {customer.name} (ID: {customer.customer_id})"
+    def run_night_audit(self, business_date: date = None, workers: int = None) -> dict:
+        # Reads the last committed snapshot, so it is safe to run while the desk keeps working
+        return NightAudit(self.AUDIT_DIR, workers).run(self.snapshot(), business_date)
 
-            report += f"Room: {room.room_number}, Status: {customer_info}\n"
-            report += "  Cards:\n"
-            if not cards:
-                report += "    - None\n"
-            else:
-                for card in cards:
-                    assigned_to = "Unassigned"
-                    for cust in self.customers:
-                        if cust.card == card:
-                            assigned_to = f"Assigned to: {cust.name}"
-                            break
-                    report += f"    - Card ID: {card.card_id}, Active: {card.is_active}, {assigned_to}\n"
-            pending = self.room_pending_services.get(room.room_number, [])
-            report += f"  Pending Services: {', '.join([s.name for s in pending]) or 'None'}\n"
-        report += "-----------------------------\n"
-        return report
+    def card_entries(self, room_number: str) -> List[tuple]:
+        entries = [(card.card_id, card.is_active) for card in self._room_cards.get(room_number, {}).values()]
+        if not self.cards.loaded:
+            entries += self._deferred_card_rooms.get(room_number, [])
+        return entries
 
     def get_cards_for_room(self, room_number: str) -> List[Card]:
-        room = next((r for r in self.rooms if r.room_number == room_number), None)
-        if not room:
+        if not self.find_room(room_number):
             return []
-        return [card for card in self.cards if card.room == room]
+        if room_number in self._deferred_card_rooms and not self.cards.loaded:
+            # Only this room's idle cards are built; other rooms' stay deferred
+            self.cards.load_matching(lambda data: data["room"]["room_number"] == room_number)
+            self._deferred_card_rooms.pop(room_number)
+        return list(self._room_cards.get(room_number, {}).values())
 
     def add_card_to_room(self, room_number: str, card_id: str) -> Optional[Card]:
-        room = next((r for r in self.rooms if r.room_number == room_number), None)
+        room = self.find_room(room_number)
         if not room:
             print(f"Room {room_number} not found.")
             return None
+        if card_id in self._card_index:
+            print(f"Card {card_id} already exists.")
+            return None
         new_card = Card(card_id=card_id, room=room)
         self.cards.append(new_card)
+        self._index_cards([new_card])
+        self.store.touch("cards", card_id)
+        self._publish_card(new_card, "added")
         print(f"Card {card_id} added to Room {room_number}.")
         self.save_to_file()
         return new_card
 
     def delete_card(self, card_id: str) -> bool:
-        card_to_delete = next((card for card in self.cards if card.card_id == card_id), None)
+        card_to_delete = self.find_card(card_id)
         if card_to_delete:
-            for customer in self.customers:
-                if customer.card == card_to_delete:
-                    customer.card = None
-                    break
+            holder = self.occupant_of(card_to_delete.room.room_number)
+            if holder and holder.card == card_to_delete:
+                holder.card = None
             self.cards.remove(card_to_delete)
+            del self._card_index[card_id]
+            self.store.touch("cards", card_id)
+            self._room_cards.get(card_to_delete.room.room_number, {}).pop(card_id, None)
+            self._publish_card(card_to_delete, "removed")
             print(f"Card {card_id} deleted.")
             self.save_to_file()
             return True
@@ -319,9 +954,10 @@ class Admin:
         return False
 
     def activate_card(self, card_id: str) -> bool:
-        card = next((c for c in self.cards if c.card_id == card_id), None)
+        card = self.find_card(card_id)
         if card:
             card.activate()
+            self._publish_card(card, "updated")
             print(f"Card {card_id} activated for Room {card.room.room_number}.")
             self.save_to_file()
             return True
@@ -329,80 +965,178 @@ class Admin:
         return False
 
     def deactivate_card(self, card_id: str) -> bool:
-        card = next((c for c in self.cards if c.card_id == card_id), None)
+        card = self.find_card(card_id)
         if card:
             card.deactivate()
+            self._publish_card(card, "updated")
             print(f"Card {card_id} deactivated for Room {card.room.room_number}.")
             self.save_to_file()
             return True
         print(f"Card with ID {card_id} not found.")
         return False
 
+    def _new_service_request(self, room_number: str, service_name: str) -> (Optional[ItemService], str):
+        if not self.find_room(room_number):
+            return None, f"Room {room_number} not found."
+        if not self.occupant_of(room_number):
+            return None, f"Room {room_number} is not occupied."
+        entry = self._service_catalog.get(service_name)
+        if not entry:
+            return None, f"Service '{service_name}' not found in any provider."
+        provider_name, item = entry
+        service_item = ItemService(item.name, item.price, provider_name)  # Create a new instance with provider_name
+        service_item.request_id = self._allocate_request_id()
+        service_item.requested_at = datetime.now()
+        self.room_pending_services.setdefault(room_number, []).append(service_item)
+        self.store.touch("room_pending_services", room_number)
+        self._track_pending(room_number, service_item)
+        self.changes.publish("service", service_item.request_id, "added",
+                             {"room_number": room_number, "name": service_name, "provider_name": provider_name})
+        if provider_name == "RoomSupport":
+            self._add_housekeeping_task(room_number, service_name, request_id=service_item.request_id)
+        return service_item, f"Service '{service_name}' requested for Room {room_number} by {provider_name}."
+
     def request_service(self, room_number: str, service_name: str) -> (bool, str):
-        room = next((r for r in self.rooms if r.room_number == room_number), None)
-        if not room:
-            return False, f"Room {room_number} not found."
+        service_item, message = self._new_service_request(room_number, service_name)
+        if not service_item:
+            return False, message
+        self.save_to_file()
+        return True, message
 
-        customer = next((c for c in self.customers if c.stay and c.stay.room == room and c.stay.is_active), None)
-        if not customer:
-            return False, f"Room {room_number} is not occupied."
-
-        # Search for the service across all providers
-        service_item = None
-        provider_name = None
-        for name, provider in self.service_providers.items():
-            item = next((item for item in provider.items if item.name == service_name), None)
-            if item:
-                service_item = ItemService(item.name, item.price, name)  # Create a new instance with provider_name
-                provider_name = name
-                break
+    def request_services(self, requests: List[tuple]) -> (bool, List[str]):
+        # requests is a list of (room_number, service_name); valid entries are queued
+        # even if others fail, and everything is saved once if anything was queued.
+        messages = []
+        queued = 0
+        for room_number, service_name in requests:
+            service_item, message = self._new_service_request(room_number, service_name)
+            queued += service_item is not None
+            messages.append(message)
+        if queued:
+            self.save_to_file()
+        return queued == len(requests), messages
 
-        if not service_item:
-            return False, f"Service '{service_name}' not found in any provider."
+    def occupied_rooms_on_floor(self, floor: int) -> List[str]:
+        return sorted(room_number for room_number in self._occupants if self._room_index[room_number].floor == floor)
 
-        if room_number not in self.room_pending_services:
-            self.room_pending_services[room_number] = []
-        self.room_pending_services[room_number].append(service_item)
-        self.save_to_file()
-        return True, f"Service '{service_name}' requested for Room {room_number} by {provider_name}."
+    def request_service_for_floor(self, floor: int, service_name: str) -> (bool, List[str]):
+        room_numbers = self.occupied_rooms_on_floor(floor)
+        if not room_numbers:
+            return False, [f"No occupied rooms on floor {floor}."]
+        return self.request_services([(room_number, service_name) for room_number in room_numbers])
 
-    def complete_service(self, room_number: str, service_name: str, user_role: str, completion_details: str = None) -> (bool, str):
-        provider_name = "Hotel" if user_role == "service_provider_a" else "RoomSupport"
-        room = next((r for r in self.rooms if r.room_number == room_number), None)
-        if not room:
-            return False, f"Room {room_number} not found."
+    def _provider_for_role(self, user_role: str) -> str:
+        return "Hotel" if user_role == "service_provider_a" else "RoomSupport"
+
+    def _finish_service(self, room_number: str, service_name: str, provider_name: str,
+                        request_id: int = None, worker: str = None) -> (Optional[ItemService], str):
+        if not self.find_room(room_number):
+            return None, f"Room {room_number} not found."
         pending_services = self.room_pending_services.get(room_number, [])
-        pending_service = next((s for s in pending_services if s.name == service_name and not s.completed), None)
+        pending_service = next((s for s in pending_services if s.name == service_name and not s.completed
+                                and (request_id is None or s.request_id == request_id)), None)
         if not pending_service:
-            return False, "Pending service not found."
+            return None, "Pending service not found."
         if pending_service.provider_name != provider_name:
-            return False, f"Service '{service_name}' is not managed by {provider_name}."
-        
-        # Mark the service as completed
+            return None, f"Service '{service_name}' is not managed by {provider_name}."
+        holder = self.leases.holder(pending_service.request_id)
+        if holder and holder != worker:
+            return None, f"Service '{service_name}' for Room {room_number} has been claimed by another worker."
+
+        # Mark the service as completed; it stays pending if the ledger cannot record it
         pending_service.mark_completed()
+        try:
+            self.ledger.append(pending_service.completed_at, room_number, pending_service.name, provider_name,
+                               pending_service.price, pending_service.wait_seconds())
+        except (ValueError, OSError) as e:
+            pending_service.completed = False
+            pending_service.completed_at = None
+            return None, f"Could not record service '{service_name}' in the service ledger: {e}"
         pending_services.remove(pending_service)
-        self.room_pending_services[room_number] = pending_services
-        if room_number not in self.room_services:
-            self.room_services[room_number] = []
-        self.room_services[room_number].append(pending_service)
+        self._untrack_pending(pending_service.request_id)
+        self.room_services.setdefault(room_number, []).append(pending_service)
+        self.store.touch("room_pending_services", room_number)
+        self.store.touch("room_services", room_number)
+        self.changes.publish("service", pending_service.request_id, "removed", {"room_number": room_number})
+        task = self.housekeeping.task_for_request(pending_service.request_id)
+        if task:
+            self._close_housekeeping_task(task.task_id)
+        return pending_service, f"Service '{service_name}' completed for Room {room_number}."
+
+    def service_revenue_by_day(self, start: date, end: date, group: str = "provider") -> Dict[tuple, float]:
+        # Completed-service revenue per (day, provider|item|room) from the ledger, start <= day < end
+        return {key: totals[1] / 100 for key, totals in self.ledger.daily_totals(start, end, group).items()}
+
+    def _write_completion_log(self, entries: List[str]):
+        if not entries:
+            return
+        try:
+            with open("service_completion_log.txt", "a") as log_file:
+                log_file.write("".join(entries))
+        except Exception as e:
+            print(f"Error writing to service completion log: {e}")
+
+    def _completion_log_entry(self, room_number: str, service_name: str, provider_name: str, completion_details: str) -> str:
+        return f"[{datetime.now()}] Room {room_number} - Service '{service_name}' completed by {provider_name}. Details: {completion_details}\n"
+
+    def complete_service(self, room_number: str, service_name: str, user_role: str, completion_details: str = None,
+                         request_id: int = None, worker: str = None) -> (bool, str):
+        provider_name = self._provider_for_role(user_role)
+        service, message = self._finish_service(room_number, service_name, provider_name, request_id, worker)
+        if not service:
+            return False, message
 
         # Log completion details to a text file if provided
         if completion_details:
-            log_entry = f"[{datetime.now()}] Room {room_number} - Service '{service_name}' completed by {provider_name}. Details: {completion_details}\n"
-            try:
-                with open("service_completion_log.txt", "a") as log_file:
-                    log_file.write(log_entry)
-            except Exception as e:
-                print(f"Error writing to service completion log: {e}")
+            self._write_completion_log([self._completion_log_entry(room_number, service_name, provider_name, completion_details)])
+
+        self.save_to_file()
+        return True, message
 
+    def complete_services(self, completions: List[tuple], user_role: str, completion_details: str = None,
+                          worker: str = None) -> (bool, List[str]):
+        provider_name = self._provider_for_role(user_role)
+        messages = []
+        log_entries = []
+        all_ok = True
+        for room_number, service_name in completions:
+            service, message = self._finish_service(room_number, service_name, provider_name, worker=worker)
+            messages.append(message)
+            if not service:
+                all_ok = False
+            elif completion_details:
+                log_entries.append(self._completion_log_entry(room_number, service_name, provider_name, completion_details))
+        self._write_completion_log(log_entries)
         self.save_to_file()
-        return True, f"Service '{service_name}' completed for Room {room_number}."
+        return all_ok, messages
 
     def get_pending_services(self, user_role: str) -> List[tuple]:
-        provider_name = "Hotel" if user_role == "service_provider_a" else "RoomSupport"
+        provider_name = self._provider_for_role(user_role)
         pending = []
         for room_number, services in self.room_pending_services.items():
             for service in services:
                 if not service.completed and service.provider_name == provider_name:
                     pending.append((room_number, service.name))
-        return pending
\ No newline at end of file
+        return pending
+
+    def get_pending_service_rows(self, user_role: str) -> List[tuple]:
+        provider_name = self._provider_for_role(user_role)
+        return [(service.request_id, room_number, service.name, self.leases.holder(service.request_id))
+                for room_number, services in self.room_pending_services.items()
+                for service in services
+                if not service.completed and service.provider_name == provider_name]
+
+    def claim_services(self, user_role: str, worker: str, count: int) -> List[tuple]:
+        # Leases up to `count` of the oldest unclaimed requests; renew_claims keeps them alive
+        claimed = self.leases.claim(self._provider_for_role(user_role), worker, count)
+        rows = []
+        for request_id in claimed:
+            room_number, service = self._pending_index[request_id]
+            rows.append((request_id, room_number, service.name))
+        return rows
+
+    def renew_claims(self, worker: str) -> int:
+        return self.leases.renew(worker)
+
+    def release_claims(self, worker: str, request_ids: List[int] = None) -> int:
+        return self.leases.release(worker, request_ids)
@@ -0,0 +1,114 @@
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import Dict, List, Optional
+
+class RoomCalendar:
+    def __init__(self):
+        # Parallel arrays sorted by start night; bookings in a room never overlap,
+        # so the end nights are sorted as well.
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        self.owners: List[str] = []
+
+    def conflicts(self, start: int, end: int, ignore: str = None) -> bool:
+        i = bisect_left(self.starts, end) - 1
+        while i >= 0:
+            if self.owners[i] == ignore:
+                i -= 1
+                continue
+            return self.ends[i] > start
+        return False
+
+    def insert(self, start: int, end: int, owner: str):
+        i = bisect_right(self.starts, start)
+        self.starts.insert(i, start)
+        self.ends.insert(i, end)
+        self.owners.insert(i, owner)
+
+    def remove(self, start: int, owner: str):
+        i = bisect_left(self.starts, start)
+        while i < len(self.starts) and self.starts[i] == start:
+            if self.owners[i] == owner:
+                del self.starts[i], self.ends[i], self.owners[i]
+                return
+            i += 1
+
+    def fit_score(self, start: int, end: int, edge_penalty: int) -> Optional[int]:
+        # Lower is tighter: gaps left on either side of the booking, each capped
+        # at edge_penalty (an open-ended side costs the full penalty).
+        i = bisect_left(self.starts, end)
+        if i > 0 and self.ends[i - 1] > start:
+            return None
+        before = min(start - self.ends[i - 1], edge_penalty) if i > 0 else edge_penalty
+        after = min(self.starts[i] - end, edge_penalty) if i < len(self.starts) else edge_penalty
+        return before + after
+
+    def bookings_between(self, start: int, end: int) -> List[tuple]:
+        first = bisect_right(self.ends, start)
+        last = bisect_left(self.starts, end)
+        return list(zip(self.starts[first:last], self.ends[first:last], self.owners[first:last]))
+
+class AvailabilityIndex:
+    def __init__(self):
+        self._calendars: Dict[str, RoomCalendar] = {}
+        self._bookings: Dict[str, tuple] = {}
+
+    @staticmethod
+    def night_span(start_date: date, nights: int) -> (int, int):
+        start = start_date.toordinal()
+        return start, start + max(nights, 1)
+
+    def is_available(self, room_number: str, start_date: date, nights: int, ignore: str = None) -> bool:
+        calendar = self._calendars.get(room_number)
+        if not calendar:
+            return True
+        start, end = self.night_span(start_date, nights)
+        return not calendar.conflicts(start, end, ignore)
+
+    def book(self, customer_id: str, room_number: str, start_date: date, nights: int, force: bool = False) -> bool:
+        if not force and not self.is_available(room_number, start_date, nights, ignore=customer_id):
+            return False
+        self.release(customer_id)
+        start, end = self.night_span(start_date, nights)
+        self._calendars.setdefault(room_number, RoomCalendar()).insert(start, end, customer_id)
+        self._bookings[customer_id] = (room_number, start, end)
+        return True
+
+    def release(self, customer_id: str):
+        booking = self._bookings.pop(customer_id, None)
+        if booking:
+            room_number, start, _ = booking
+            self._calendars[room_number].remove(start, customer_id)
+
+    def booking_for(self, customer_id: str) -> Optional[tuple]:
+        return self._bookings.get(customer_id)
+
+    def next_arrival(self, room_number: str, after: date) -> Optional[date]:
+        calendar = self._calendars.get(room_number)
+        if not calendar:
+            return None
+        index = bisect_left(calendar.starts, after.toordinal())
+        return date.fromordinal(calendar.starts[index]) if index < len(calendar.starts) else None
+
+    def bookings_for_room(self, room_number: str, start_date: date, nights: int) -> List[tuple]:
+        calendar = self._calendars.get(room_number)
+        if not calendar:
+            return []
+        start, end = self.night_span(start_date, nights)
+        return calendar.bookings_between(start, end)
+
+    def fit_score(self, room_number: str, start_date: date, nights: int, edge_penalty: int = 7) -> Optional[int]:
+        start, end = self.night_span(start_date, nights)
+        calendar = self._calendars.get(room_number)
+        if not calendar:
+            return 2 * edge_penalty
+        return calendar.fit_score(start, end, edge_penalty)
+
+    def find_available_rooms(self, room_numbers: List[str], start_date: date, nights: int) -> List[str]:
+        start, end = self.night_span(start_date, nights)
+        available = []
+        for room_number in room_numbers:
+            calendar = self._calendars.get(room_number)
+            if not calendar or not calendar.conflicts(start, end):
+                available.append(room_number)
+        return available
@@ -0,0 +1,213 @@
+import csv
+import json
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from customer import Customer
+from room import Room
+
+# Flat record layout per kind, shared by import and export. List fields are
+# written ";"-separated in CSV and as JSON arrays in JSONL.
+FIELDS = {
+    "customers": ("customer_id", "name"),
+    "reservations": ("customer_id", "name", "room_number", "start_date", "length", "booked_at", "is_active"),
+    "rooms": ("room_number", "room_type", "floor", "capacity", "features"),
+    "cards": ("card_id", "room_number", "is_active"),
+}
+LIST_FIELDS = ("features",)
+
+def detect_format(path: str, fmt: str = None) -> str:
+    return fmt or ("jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv")
+
+def read_rows(f, fmt: str) -> Iterator[tuple]:
+    # (line number, raw dict) one row at a time, so memory does not grow with the file
+    if fmt == "jsonl":
+        for line_number, line in enumerate(f, 1):
+            if line.strip():
+                try:
+                    yield line_number, json.loads(line)
+                except ValueError as e:
+                    yield line_number, e
+    else:
+        reader = csv.DictReader(f)
+        for row in reader:
+            yield reader.line_num, row
+
+def chunked(rows: Iterable, size: int) -> Iterator[list]:
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+def _parse_date(value) -> Optional[datetime]:
+    if not value:
+        return None
+    return datetime.fromisoformat(value)
+
+def _parse_bool(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("1", "true", "yes", "y")
+
+def _parse_list(value) -> list:
+    if isinstance(value, list):
+        return value
+    return [part for part in (value or "").split(";") if part]
+
+class BulkImporter:
+    # Rows are validated a chunk at a time against the admin's indexes (and the
+    # rest of the chunk), then the valid ones are applied and committed together.
+    # A bad row is reported with its line number and skipped; committed chunks
+    # stay committed if a later one fails.
+    CHUNK_ROWS = 1000
+    MAX_REPORTED_ERRORS = 1000
+
+    def __init__(self, admin: 'Admin', kind: str, chunk_rows: int = None):
+        if kind not in FIELDS:
+            raise ValueError(f"Unknown record kind {kind!r}")
+        self.admin = admin
+        self.kind = kind
+        self.chunk_rows = chunk_rows or self.CHUNK_ROWS
+        self.imported = 0
+        self.failed = 0
+        self.errors: List[tuple] = []  # (line number, message), the first MAX_REPORTED_ERRORS only
+        self.committed_through = 0
+
+    def run(self, rows: Iterable[tuple]) -> 'BulkImporter':
+        validate = getattr(self, f"_validate_{self.kind}")
+        apply = getattr(self, f"_apply_{self.kind}")
+        for chunk in chunked(rows, self.chunk_rows):
+            seen = set()
+            valid = []
+            for line_number, row in chunk:
+                try:
+                    if isinstance(row, Exception):
+                        raise ValueError(f"Unreadable row: {row}")
+                    valid.append(validate(row, seen))
+                except (KeyError, ValueError, TypeError) as e:
+                    message = f"Missing field {e}" if isinstance(e, KeyError) else str(e)
+                    self._error(line_number, message)
+            with self.admin.batch():
+                for record in valid:
+                    apply(record)
+                self.admin.commit()
+            self.imported += len(valid)
+            self.committed_through = chunk[-1][0]
+        return self
+
+    def _error(self, line_number: int, message: str):
+        self.failed += 1
+        if len(self.errors) < self.MAX_REPORTED_ERRORS:
+            self.errors.append((line_number, message))
+
+    def _claim(self, seen: set, key: str, message: str):
+        if key in seen:
+            raise ValueError(message)
+        seen.add(key)
+
+    def _validate_customers(self, row: dict, seen: set) -> Customer:
+        customer_id, name = row["customer_id"].strip(), row["name"].strip()
+        if not customer_id or not name:
+            raise ValueError("customer_id and name are required.")
+        if self.admin.find_customer(customer_id):
+            raise ValueError(f"Customer ID {customer_id} already exists.")
+        self._claim(seen, customer_id, f"Customer ID {customer_id} appears twice in this chunk.")
+        return Customer(name, customer_id)
+
+    def _apply_customers(self, customer: Customer):
+        self.admin.add_customer(customer)
+
+    def _validate_reservations(self, row: dict, seen: set) -> tuple:
+        customer_id = row["customer_id"].strip()
+        room = self.admin.find_room(str(row["room_number"]).strip())
+        length = int(row["length"])
+        start_date = _parse_date(row.get("start_date")) or datetime.now()
+        if not room:
+            raise ValueError(f"Room {row['room_number']} not found.")
+        if length <= 0:
+            raise ValueError(f"Invalid stay length {length} for {customer_id}.")
+        customer = self.admin.find_customer(customer_id)
+        if customer is None and not (row.get("name") or "").strip():
+            raise ValueError(f"Customer {customer_id} does not exist and the row has no name.")
+        if customer_id in self.admin.reservations:
+            raise ValueError(f"Customer {customer_id} already has a reservation.")
+        self._claim(seen, customer_id, f"Customer ID {customer_id} appears twice in this chunk.")
+        # Booking here also holds the room against later rows of the same chunk
+        if not self.admin.availability.book(customer_id, room.room_number, start_date, length):
+            raise ValueError(f"Room {room.room_number} is not available for {customer_id}.")
+        return customer_id, row.get("name", "").strip(), customer is None, room, length, start_date
+
+    def _apply_reservations(self, record: tuple):
+        customer_id, name, is_new, room, length, start_date = record
+        if is_new:
+            self.admin.add_customer(Customer(name, customer_id))
+        self.admin.add_reservation(customer_id, room, length, start_date)
+
+    def _validate_rooms(self, row: dict, seen: set) -> Room:
+        room_number = str(row["room_number"]).strip()
+        if not room_number:
+            raise ValueError("room_number is required.")
+        if self.admin.find_room(room_number):
+            raise ValueError(f"Room {room_number} already exists.")
+        self._claim(seen, room_number, f"Room {room_number} appears twice in this chunk.")
+        floor = row.get("floor")
+        return Room(room_number, row.get("room_type") or "standard", int(floor) if floor not in (None, "") else None,
+                    int(row.get("capacity") or 2), _parse_list(row.get("features")))
+
+    def _apply_rooms(self, room: Room):
+        self.admin.add_room(room)
+
+    def _validate_cards(self, row: dict, seen: set) -> tuple:
+        card_id, room_number = row["card_id"].strip(), str(row["room_number"]).strip()
+        if not self.admin.find_room(room_number):
+            raise ValueError(f"Room {room_number} not found.")
+        if self.admin.find_card(card_id):
+            raise ValueError(f"Card {card_id} already exists.")
+        self._claim(seen, card_id, f"Card {card_id} appears twice in this chunk.")
+        return card_id, room_number, _parse_bool(row.get("is_active", False))
+
+    def _apply_cards(self, record: tuple):
+        card_id, room_number, is_active = record
+        if self.admin.add_card_to_room(room_number, card_id) and is_active:
+            self.admin.activate_card(card_id)
+
+def export_records(admin: 'Admin', kind: str) -> Iterator[Dict]:
+    # Flat records straight from the live store; unbuilt past guests and idle cards are read from their raw dicts
+    if kind == "customers":
+        for data in admin.customers.iter_dicts(lambda customer: customer.to_dict()):
+            yield {"customer_id": data["customer_id"], "name": data["name"]}
+    elif kind == "reservations":
+        for customer_id, stay in admin.reservations.items():
+            yield {"customer_id": customer_id, "name": stay.customer.name, "room_number": stay.room.room_number,
+                   "start_date": stay.start_date.isoformat(), "length": stay.length,
+                   "booked_at": stay.booked_at.isoformat(), "is_active": stay.is_active}
+    elif kind == "rooms":
+        for room in admin.rooms:
+            yield {"room_number": room.room_number, "room_type": room.room_type, "floor": room.floor,
+                   "capacity": room.capacity, "features": list(room.features)}
+    elif kind == "cards":
+        for data in admin.cards.iter_dicts(lambda card: card.to_dict()):
+            yield {"card_id": data["card_id"], "room_number": data["room"]["room_number"],
+                   "is_active": data["is_active"]}
+    else:
+        raise ValueError(f"Unknown record kind {kind!r}")
+
+def write_records(records: Iterable[Dict], kind: str, f, fmt: str) -> int:
+    count = 0
+    if fmt == "jsonl":
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+            count += 1
+        return count
+    writer = csv.DictWriter(f, fieldnames=FIELDS[kind])
+    writer.writeheader()
+    for record in records:
+        for field in LIST_FIELDS:
+            if field in record:
+                record[field] = ";".join(record[field])
+        writer.writerow(record)
+        count += 1
+    return count
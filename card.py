@@ -1,4 +1,8 @@
-class Card:
+from tracking import Tracked
+
+class Card(Tracked):
+    NESTED = ("room",)
+
     def __init__(self, card_id: str, room: 'Room'):
         self.card_id = card_id
         self.room = room
@@ -0,0 +1,40 @@
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+class CardAuthorizer:
+    def __init__(self):
+        # card_id -> (room_number, is_active, valid_until as a POSIX timestamp or None)
+        self._cards: Dict[str, tuple] = {}
+
+    def __len__(self):
+        return len(self._cards)
+
+    def grant(self, card_id: str, room_number: str, is_active: bool, valid_until: Optional[datetime] = None):
+        self._cards[card_id] = (room_number, is_active, valid_until.timestamp() if valid_until else None)
+
+    def revoke(self, card_id: str):
+        self._cards.pop(card_id, None)
+
+    def entry(self, card_id: str) -> Optional[tuple]:
+        return self._cards.get(card_id)
+
+    def authorize(self, card_id: str, room_number: str, now: float = None) -> bool:
+        entry = self._cards.get(card_id)
+        if entry is None:
+            return False
+        card_room, is_active, valid_until = entry
+        if not is_active or card_room != room_number:
+            return False
+        return valid_until is None or (now if now is not None else time.time()) <= valid_until
+
+    def authorize_many(self, swipes: Iterable[tuple], now: float = None) -> List[bool]:
+        # For lock controllers syncing a backlog of (card_id, room_number) swipes at once
+        now = now if now is not None else time.time()
+        cards = self._cards
+        results = []
+        for card_id, room_number in swipes:
+            entry = cards.get(card_id)
+            results.append(entry is not None and entry[1] and entry[0] == room_number
+                           and (entry[2] is None or now <= entry[2]))
+        return results
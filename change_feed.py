@@ -0,0 +1,22 @@
+from collections import deque
+from typing import List, Optional
+
+class ChangeFeed:
+    def __init__(self, max_events: int = 5000):
+        self.seq = 0
+        self._events = deque(maxlen=max_events)
+
+    def publish(self, kind: str, key, action: str, data: dict = None):
+        self.seq += 1
+        self._events.append((self.seq, kind, key, action, data or {}))
+
+    def since(self, seq: int, kind: str = None) -> Optional[List[tuple]]:
+        # None means the caller has fallen behind the retained window and must resync
+        if seq == self.seq:
+            return []
+        if not self._events or self._events[0][0] > seq + 1:
+            return None
+        events = [event for event in self._events if event[0] > seq]
+        if kind:
+            events = [event for event in events if event[1] == kind]
+        return events
@@ -0,0 +1,114 @@
+import atexit
+import os
+import threading
+import time
+import weakref
+from typing import Dict, Optional
+
+class Checkpoint:
+    # One capture of the store: the segment files it adds and the manifest that
+    # puts them in force. Payloads are plain data copied when the capture was
+    # taken, so later changes to the live objects never leak into it.
+    def __init__(self, generation: int, manifest: dict, writes: Dict[str, object]):
+        self.generation = generation
+        self.manifest = manifest
+        self.writes = writes  # file name -> payload, or text already serialized
+        self.captured_at = time.monotonic()
+
+    def merge(self, later: 'Checkpoint') -> 'Checkpoint':
+        # The later manifest wins; older writes are kept because it may still name some of their files
+        merged = Checkpoint(later.generation, later.manifest, {**self.writes, **later.writes})
+        merged.captured_at = self.captured_at
+        return merged
+
+class Checkpointer:
+    # Writes the store's checkpoints on a background thread, so saving costs the
+    # caller only the capture. Captures that arrive while a write is running are
+    # merged and written together. A caller waits only when the oldest unwritten
+    # capture is older than max_unsaved_seconds, which bounds what a crash can lose.
+    COALESCE_SECONDS = 0.05
+    RETRY_SECONDS = 1.0
+    _live = weakref.WeakSet()
+
+    def __init__(self, store: 'SegmentStore', max_unsaved_seconds: float = 2.0):
+        self.store = store
+        self.max_unsaved_seconds = max_unsaved_seconds
+        self.written_generation = store.generation
+        self.last_error: Optional[Exception] = None
+        self._cond = threading.Condition()
+        self._pending: Optional[Checkpoint] = None
+        self._writing: Optional[Checkpoint] = None
+        self._attempts = 0
+        self._flushing = 0
+        self._thread: Optional[threading.Thread] = None
+        Checkpointer._live.add(self)
+
+    def submit(self, checkpoint: Checkpoint):
+        with self._cond:
+            self._pending = self._pending.merge(checkpoint) if self._pending else checkpoint
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+            while self.last_error is None and self.unsaved_seconds() > self.max_unsaved_seconds:
+                self._cond.wait(self.RETRY_SECONDS)
+
+    def unsaved_seconds(self) -> float:
+        oldest = self._writing or self._pending
+        return time.monotonic() - oldest.captured_at if oldest else 0.0
+
+    def flush(self) -> bool:
+        # Blocks until everything submitted is on disk; False if a write failed meanwhile
+        with self._cond:
+            self._flushing += 1
+            self._cond.notify_all()
+            try:
+                attempts = self._attempts
+                while self._pending or self._writing:
+                    if self.last_error is not None and self._attempts > attempts:
+                        return False
+                    self._cond.wait()
+                return True
+            finally:
+                self._flushing -= 1
+
+    @classmethod
+    def flush_all(cls, directory: str = None):
+        for checkpointer in list(cls._live):
+            if directory is None or os.path.abspath(checkpointer.store.directory) == os.path.abspath(directory):
+                checkpointer.flush()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if self._pending is None:
+                    # Idle writers exit; the next submit starts a new one
+                    self._thread = None
+                    return
+                delay = self._pending.captured_at + self.COALESCE_SECONDS - time.monotonic()
+                if delay > 0 and not self._flushing:
+                    self._cond.wait(delay)
+                    continue
+                work, self._pending = self._pending, None
+                self._writing = work
+            try:
+                self.store.write(work)
+                error = None
+            except OSError as e:
+                error = e
+            with self._cond:
+                self._writing = None
+                self._attempts += 1
+                self.last_error = error
+                if error is None:
+                    self.written_generation = work.generation
+                else:
+                    # Nothing is dropped: the failed capture is retried along with anything newer
+                    self._pending = work.merge(self._pending) if self._pending else work
+                self._cond.notify_all()
+            if error is not None:
+                print(f"Checkpoint {work.generation} could not be written: {error}")
+                time.sleep(self.RETRY_SECONDS)
+
+# Daemon writers would otherwise be cut off mid-checkpoint when the interpreter exits
+atexit.register(Checkpointer.flush_all)
@@ -1,22 +1,39 @@
 from admin import Admin
 from room import Room
+from room_inventory import load_inventory
 from customer import Customer
 from card import Card
 from service_provider import ServiceProvider
 from item_service import ItemService
 from typing import List, Optional
+from datetime import datetime
+import os
+import uuid
 
 class Controller:
+    INVENTORY_FILE = "room_inventory.json"
+
     def __init__(self, admin_name: str):
         self.admin = Admin.load_from_file(admin_name)
         self.current_user_role = None
+        # Service claims are held per session so two terminals on the same role do not collide
+        self.session_id = uuid.uuid4().hex[:8]
+        self.worker_id = None
         self.setup_initial_data()
+        if self.admin.archive_past_customers():
+            self.admin.save_to_file()
+        self.admin.run_scheduled_tasks()
 
     def setup_initial_data(self):
-        # Initialize 15 rooms (101 to 115)
+        # Rooms come from the inventory file when there is one, otherwise 15 rooms (101 to 115)
         if not self.admin.rooms:
-            for i in range(101, 116):  # 101 to 115 inclusive
-                self.admin.add_room(Room(str(i)))
+            if os.path.exists(self.INVENTORY_FILE):
+                rooms = load_inventory(self.INVENTORY_FILE)
+            else:
+                rooms = [Room(str(i)) for i in range(101, 116)]  # 101 to 115 inclusive
+            with self.admin.batch():
+                for room in rooms:
+                    self.admin.add_room(room)
         
         # Initialize two service providers
         if not self.admin.service_providers:
@@ -37,43 +54,91 @@ class Controller:
             room_support_provider.add_item(ItemService("Technical Support", 20.00))
             self.admin.add_service_provider(room_support_provider)
 
+        # Nightly rates: weekend nights cost more, longer stays are discounted
+        if not self.admin.rates.base_rates:
+            self.admin.rates.set_base_rate("standard", 120.00)
+            self.admin.rates.set_base_rate("suite", 240.00)
+            self.admin.rates.set_weekday_modifier(4, 1.15)  # Friday
+            self.admin.rates.set_weekday_modifier(5, 1.15)  # Saturday
+            self.admin.rates.set_length_discount(3, 0.05)
+            self.admin.rates.set_length_discount(7, 0.10)
+            self.admin.save_to_file()
+
+        # Two housekeeping attendants on the ground floor
+        if not self.admin.housekeeping.staff:
+            self.admin.add_housekeeping_staff("Attendant 1", 1)
+            self.admin.add_housekeeping_staff("Attendant 2", 1)
+
     def login(self, password: str) -> (bool, str):
         if password == "AD01":
             self.current_user_role = "admin"
-            return True, "Logged in as Admin."
+            message = "Logged in as Admin."
         elif password == "SERV01":
             self.current_user_role = "service_provider_a"
-            return True, "Logged in as Room Service A."
+            message = "Logged in as Room Service A."
         elif password == "SERV02":
             self.current_user_role = "service_provider_b"
-            return True, "Logged in as Room Service B."
+            message = "Logged in as Room Service B."
         else:
             return False, "Invalid password."
+        self.worker_id = f"{self.current_user_role}:{self.session_id}"
+        return True, message
+
+    def logout(self):
+        self.release_claims()
+        self.current_user_role = None
+        self.worker_id = None
 
-    def create_reservation(self, customer_name: str, customer_id: str, room_number: str, length: int) -> (bool, str):
+    def create_reservation(self, customer_name: str, customer_id: Optional[str], room_number: str, length: int,
+                           start_date: datetime = None) -> (bool, str):
         if self.current_user_role != "admin":
             return False, "Unauthorized access."
-        room = next((r for r in self.admin.rooms if r.room_number == room_number), None)
+        room = self.admin.find_room(room_number)
         if not room:
             return False, f"Room {room_number} not found."
+        start_date = start_date or datetime.now()
+        if not self.admin.is_room_available(room_number, start_date, length):
+            return False, f"Room {room_number} is not available for {length} night(s) from {start_date.date()}."
+        customer_id = customer_id or self.admin.allocate_customer_id()
         customer = Customer(customer_name, customer_id)
         self.admin.add_customer(customer)
-        if self.admin.add_reservation(customer_id, room, length):
+        if self.admin.add_reservation(customer_id, room, length, start_date):
             return True, f"Reservation created for {customer_name} (ID: {customer_id}) in Room {room_number}."
         return False, "Failed to create reservation."
 
-    def update_reservation(self, customer_id: str, room_number: str = None, length: int = None) -> (bool, str):
+    def update_reservation(self, customer_id: str, room_number: str = None, length: int = None,
+                           start_date: datetime = None) -> (bool, str):
         if self.current_user_role != "admin":
             return False, "Unauthorized access."
         room = None
         if room_number:
-            room = next((r for r in self.admin.rooms if r.room_number == room_number), None)
+            room = self.admin.find_room(room_number)
             if not room:
                 return False, f"Room {room_number} not found."
-        if self.admin.update_reservation(customer_id, room, length):
+        if self.admin.update_reservation(customer_id, room, length, start_date):
             return True, f"Reservation updated for Customer ID {customer_id}."
         return False, "Failed to update reservation."
 
+    def assign_rooms(self, requests: List['StayRequest']) -> (bool, str):
+        if self.current_user_role != "admin":
+            return False, "Unauthorized access."
+        assignments = self.admin.assign_rooms(requests)
+        unassigned = list(dict.fromkeys(request.customer_id for request, room in assignments if not room))
+        if unassigned:
+            assigned = sum(1 for request, room in assignments if room)
+            return False, f"Assigned {assigned} of {len(assignments)} stays. Unassigned: {', '.join(unassigned)}."
+        return True, f"Assigned rooms for {len(assignments)} stays."
+
+    def find_available_rooms(self, start_date: datetime, nights: int) -> List[str]:
+        if self.current_user_role != "admin":
+            return []
+        return [room.room_number for room in self.admin.find_available_rooms(start_date, nights)]
+
+    def quote_rooms(self, start_date: datetime, nights: int) -> List[tuple]:
+        if self.current_user_role != "admin" or nights <= 0:
+            return []
+        return self.admin.quote_rooms(start_date, nights)
+
     def delete_reservation(self, customer_id: str) -> (bool, str):
         if self.current_user_role != "admin":
             return False, "Unauthorized access."
@@ -89,6 +154,22 @@ class Controller:
             return True, f"Customer ID {customer_id} checked in successfully."
         return False, "Failed to check in customer."
 
+    def create_group_reservation(self, guests: List[tuple]) -> (bool, str):
+        if self.current_user_role != "admin":
+            return False, "Unauthorized access."
+        success, messages = self.admin.bulk_create_reservations(guests)
+        if success:
+            return True, f"Created {len(messages)} reservations."
+        return False, "Group reservation rejected:\n" + "\n".join(messages)
+
+    def check_in_group(self, customer_ids: List[str], payment_done: bool) -> (bool, str):
+        if self.current_user_role != "admin":
+            return False, "Unauthorized access."
+        success, messages = self.admin.bulk_check_in(customer_ids, payment_done)
+        if success:
+            return True, f"Checked in {len(messages)} guests and issued their cards."
+        return False, "Group check-in rejected:\n" + "\n".join(messages)
+
     def check_out_customer(self, customer_id: str) -> (bool, str):
         if self.current_user_role != "admin":
             return False, "Unauthorized access."
@@ -99,25 +180,111 @@ class Controller:
             return False, "Unauthorized access."
         return self.admin.request_service(room_number, service_name)
 
-    def complete_service(self, room_number: str, service_name: str, completion_details: str = None) -> (bool, str):
+    def request_services(self, requests: List[tuple]) -> (bool, str):
+        if self.current_user_role != "admin":
+            return False, "Unauthorized access."
+        success, messages = self.admin.request_services(requests)
+        return success, "\n".join(messages)
+
+    def request_service_for_floor(self, floor: int, service_name: str) -> (bool, str):
+        if self.current_user_role != "admin":
+            return False, "Unauthorized access."
+        success, messages = self.admin.request_service_for_floor(floor, service_name)
+        return success, "\n".join(messages)
+
+    def complete_service(self, room_number: str, service_name: str, completion_details: str = None,
+                         request_id: int = None) -> (bool, str):
+        if not (self.current_user_role in ["service_provider_a", "service_provider_b"]):
+            return False, "Unauthorized access."
+        return self.admin.complete_service(room_number, service_name, self.current_user_role, completion_details,
+                                           request_id, self.worker_id)
+
+    def complete_services(self, completions: List[tuple], completion_details: str = None) -> (bool, str):
         if not (self.current_user_role in ["service_provider_a", "service_provider_b"]):
             return False, "Unauthorized access."
-        return self.admin.complete_service(room_number, service_name, self.current_user_role, completion_details)
+        success, messages = self.admin.complete_services(completions, self.current_user_role, completion_details,
+                                                         self.worker_id)
+        return success, "\n".join(messages)
 
     def get_pending_services(self) -> List[tuple]:
         if not (self.current_user_role in ["service_provider_a", "service_provider_b"]):
             return []
         return self.admin.get_pending_services(self.current_user_role)
 
+    def get_pending_service_rows(self) -> List[tuple]:
+        if not (self.current_user_role in ["service_provider_a", "service_provider_b"]):
+            return []
+        return self.admin.get_pending_service_rows(self.current_user_role)
+
+    def claim_services(self, count: int) -> List[tuple]:
+        if not (self.current_user_role in ["service_provider_a", "service_provider_b"]):
+            return []
+        return self.admin.claim_services(self.current_user_role, self.worker_id, count)
+
+    def renew_claims(self) -> int:
+        if not self.worker_id:
+            return 0
+        return self.admin.renew_claims(self.worker_id)
+
+    def release_claims(self) -> int:
+        if not self.worker_id:
+            return 0
+        return self.admin.release_claims(self.worker_id)
+
+    def get_housekeeping_staff(self) -> List[str]:
+        if self.current_user_role not in ["admin", "service_provider_b"]:
+            return []
+        return sorted(self.admin.housekeeping.staff)
+
+    def get_housekeeping_queue(self, attendant: str) -> List[tuple]:
+        if self.current_user_role not in ["admin", "service_provider_b"]:
+            return []
+        return [(task.task_id, task.room_number, task.kind,
+                 task.deadline.strftime("%Y-%m-%d") if task.deadline else "")
+                for task in self.admin.housekeeping.queue_for(attendant)]
+
+    def complete_housekeeping_task(self, task_id: int, completion_details: str = None) -> (bool, str):
+        if self.current_user_role != "service_provider_b":
+            return False, "Unauthorized access."
+        return self.admin.complete_housekeeping_task(task_id, completion_details, self.worker_id)
+
+    def add_housekeeping_staff(self, name: str, floor: int) -> (bool, str):
+        if self.current_user_role != "admin":
+            return False, "Unauthorized access."
+        if name in self.admin.housekeeping.staff:
+            return False, f"{name} is already on the housekeeping staff."
+        self.admin.add_housekeeping_staff(name, floor)
+        return True, f"{name} added to housekeeping on floor {floor}."
+
+    def get_changes(self, since: int, kind: str = None) -> (int, Optional[List[tuple]]):
+        return self.admin.changes.seq, self.admin.changes.since(since, kind)
+
+    # Reports read a committed snapshot, so they may run off the writer thread
     def generate_customer_service_record(self, customer_id: str) -> str:
         if self.current_user_role != "admin":
             return "Unauthorized access."
-        return self.admin.generate_customer_service_record(customer_id)
+        return self.admin.snapshot().service_record(customer_id)
 
     def get_room_occupancy_details(self) -> str:
+        return self.get_versioned_occupancy_details()[1]
+
+    def get_versioned_occupancy_details(self) -> (int, str):
+        # The snapshot version lets a screen skip redrawing when nothing has changed
         if self.current_user_role != "admin":
-            return "Unauthorized access."
-        return self.admin.get_room_occupancy_details()
+            return 0, "Unauthorized access."
+        snapshot = self.admin.snapshot()
+        return snapshot.version, snapshot.occupancy_report()
+
+    def run_night_audit(self) -> (bool, str):
+        if self.current_user_role != "admin":
+            return False, "Unauthorized access."
+        report = self.admin.run_night_audit()
+        lines = [f"Night audit for {report['business_date']}: {report['occupied']}/{report['rooms']} rooms occupied, "
+                 f"${report['service_charges']:.2f} in service charges."]
+        lines += [f"Room {issue['room_number']}: {issue['issue']}" for issue in report["issues"]]
+        if not report["issues"]:
+            lines.append("No inconsistencies found.")
+        return True, "\n".join(lines)
 
     def get_cards_for_room(self, room_number: str) -> List[Card]:
         if self.current_user_role != "admin":
@@ -142,4 +309,23 @@ class Controller:
     def deactivate_card(self, card_id: str) -> bool:
         if self.current_user_role != "admin":
             return False
-        return self.admin.deactivate_card(card_id)
\ No newline at end of file
+        return self.admin.deactivate_card(card_id)
+
+    def run_scheduled_tasks(self) -> int:
+        # Card expiry and stay deadlines run regardless of who is logged in
+        return self.admin.run_scheduled_tasks()
+
+    def search_guests(self, query: str, limit: int = 20) -> List[tuple]:
+        if self.current_user_role != "admin":
+            return []
+        results = []
+        for customer_id, name in self.admin.search_guests(query, limit):
+            stay = self.admin.reservations.get(customer_id)
+            status = "Past guest" if not stay else ("Checked in" if stay.is_active else "Reserved")
+            results.append((customer_id, name, status))
+        return results
+
+    def get_stay_history(self, customer_id: str) -> List[dict]:
+        if self.current_user_role != "admin":
+            return []
+        return self.admin.archive.records_for_customer(customer_id)
\ No newline at end of file
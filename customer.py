@@ -1,7 +1,10 @@
 from stay import Stay
 from card import Card
+from tracking import Tracked
+
+class Customer(Tracked):
+    NESTED = ("stay", "card")
 
-class Customer:
     def __init__(self, name: str, customer_id: str):
         self.name = name
         self.customer_id = customer_id
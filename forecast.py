@@ -0,0 +1,66 @@
+from array import array
+from collections import Counter
+from datetime import date, timedelta
+from itertools import accumulate
+from typing import Dict, List, Tuple
+
+class OccupancyForecast:
+    # Rooms booked per night for a rolling window starting today, overall and
+    # per room type. Bookings adjust only the nights they cover; the window is
+    # rebuilt from the tracked bookings once a day when it rolls forward.
+    def __init__(self, horizon: int = 365, today: date = None):
+        self.horizon = horizon
+        self.start = today or date.today()
+        self.occupancy = array('i', [0] * horizon)
+        self.demand: Dict[str, array] = {}
+        self._bookings: Dict[str, Tuple[str, date, int, int]] = {}  # owner -> (room_type, first night, nights, lead days)
+
+    def _apply(self, room_type: str, first: date, nights: int, delta: int):
+        lo = max(0, (first - self.start).days)
+        hi = min(self.horizon, (first - self.start).days + nights)
+        if lo >= hi:
+            return
+        demand = self.demand.get(room_type)
+        if demand is None:
+            demand = self.demand[room_type] = array('i', [0] * self.horizon)
+        for night in range(lo, hi):
+            self.occupancy[night] += delta
+            demand[night] += delta
+
+    def book(self, owner: str, room_type: str, start_date: date, nights: int, booked_on: date):
+        self.cancel(owner)
+        lead = max(0, (start_date - booked_on).days)
+        self._bookings[owner] = (room_type, start_date, nights, lead)
+        self._apply(room_type, start_date, nights, 1)
+
+    def cancel(self, owner: str):
+        booking = self._bookings.pop(owner, None)
+        if booking:
+            self._apply(booking[0], booking[1], booking[2], -1)
+
+    def roll(self, today: date = None):
+        today = today or date.today()
+        if today == self.start:
+            return
+        self.start = today
+        self.occupancy = array('i', [0] * self.horizon)
+        self.demand = {}
+        for room_type, first, nights, _ in self._bookings.values():
+            self._apply(room_type, first, nights, 1)
+
+    def nights(self, days: int = None) -> List[date]:
+        return [self.start + timedelta(days=n) for n in range(min(days or self.horizon, self.horizon))]
+
+    def occupancy_rates(self, room_count: int, days: int = None, room_type: str = None) -> List[float]:
+        counts = self.occupancy if room_type is None else self.demand.get(room_type, array('i', [0] * self.horizon))
+        counts = counts[:days or self.horizon]
+        return [round(count / room_count, 4) for count in counts] if room_count else [0.0] * len(counts)
+
+    def pickup_curve(self, arrival_start: date, arrival_end: date, max_lead: int = 90,
+                     room_type: str = None) -> List[int]:
+        # curve[d] = bookings for arrivals in [arrival_start, arrival_end) already on the books
+        # d days before arrival; leads beyond max_lead are counted at max_lead
+        leads = Counter(min(lead, max_lead) for kind, first, _, lead in self._bookings.values()
+                        if arrival_start <= first < arrival_end and (room_type is None or kind == room_type))
+        histogram = [leads.get(d, 0) for d in range(max_lead, -1, -1)]
+        return list(accumulate(histogram))[::-1]
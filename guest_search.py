@@ -0,0 +1,122 @@
+import re
+from bisect import bisect_left, insort
+from typing import Dict, List, Set
+
+WORD = re.compile(r"[^\W_]+")
+
+def tokenize(text: str) -> List[str]:
+    return WORD.findall(text.lower())
+
+def trigrams(token: str) -> Set[str]:
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+class GuestSearchIndex:
+    def __init__(self):
+        self._names: Dict[str, str] = {}
+        # (token, customer_id) pairs kept sorted so a prefix is a single bisect
+        # range; new guests are appended and the list is re-sorted on the next search.
+        self._tokens: List[tuple] = []
+        self._sorted = True
+        # Trigrams point at distinct name tokens rather than guests, so the index
+        # grows with the vocabulary of names, not with the number of guests.
+        self._gram_tokens: Dict[str, Set[str]] = {}
+        self._known_tokens: Set[str] = set()
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, customer_id: str):
+        return customer_id in self._names
+
+    def add(self, customer_id: str, name: str):
+        self.add_many([(customer_id, name)])
+
+    def add_many(self, guests):
+        # A handful of guests is inserted in place; bulk loads append and sort once
+        entries = []
+        for customer_id, name in guests:
+            current = self._names.get(customer_id)
+            if current == name:
+                continue
+            if current is not None:
+                self.remove(customer_id)
+            self._names[customer_id] = name
+            entries.append((customer_id.lower(), customer_id))
+            for token in set(tokenize(name)):
+                entries.append((token, customer_id))
+                if token not in self._known_tokens:
+                    self._known_tokens.add(token)
+                    for gram in trigrams(token):
+                        self._gram_tokens.setdefault(gram, set()).add(token)
+        if self._sorted and len(entries) <= 16:
+            for entry in entries:
+                insort(self._tokens, entry)
+        elif entries:
+            self._tokens.extend(entries)
+            self._sorted = False
+
+    def remove(self, customer_id: str):
+        # Trigram entries are left in place; a token with no guests simply matches nobody
+        if self._names.pop(customer_id, None) is not None:
+            self._tokens = [entry for entry in self._tokens if entry[1] != customer_id]
+
+    def _range(self, prefix: str) -> tuple:
+        if not self._sorted:
+            self._tokens.sort()
+            self._sorted = True
+        return bisect_left(self._tokens, (prefix,)), bisect_left(self._tokens, (prefix + "\uffff",))
+
+    def _substring_tokens(self, fragment: str) -> List[str]:
+        grams = sorted(trigrams(fragment), key=lambda gram: len(self._gram_tokens.get(gram, ())))
+        tokens = set(self._gram_tokens.get(grams[0], ()))
+        for gram in grams[1:]:
+            tokens &= self._gram_tokens.get(gram, set())
+        return sorted(token for token in tokens if fragment in token)
+
+    def _matches(self, customer_id: str, terms: List[str], substring: bool) -> bool:
+        tokens = tokenize(self._names[customer_id])
+        keys = tokens + [customer_id.lower()]
+        for term in terms:
+            if not any(key.startswith(term) for key in keys):
+                if not (substring and len(term) >= 3 and any(term in token for token in tokens)):
+                    return False
+        return True
+
+    def _collect(self, ranges, terms, substring, found, limit):
+        # Walk the candidate ranges in token order, checking the other terms per guest
+        for lo, hi in ranges:
+            for i in range(lo, hi):
+                customer_id = self._tokens[i][1]
+                if customer_id not in found and self._matches(customer_id, terms, substring):
+                    found[customer_id] = None
+                    if len(found) >= limit:
+                        return
+
+    def search(self, query: str, limit: int = 20) -> List[tuple]:
+        # Every query term must match a name token or the ID by prefix, or a name
+        # token by substring once it is 3+ characters. Prefix matches rank first.
+        # Candidates come from the term with the fewest index entries, so the
+        # cost follows the most selective term and stops once `limit` are found.
+        terms = tokenize(query)
+        if not terms:
+            return []
+        found = {}
+        prefix_ranges = {term: [self._range(term)] for term in terms}
+        self._collect(min(prefix_ranges.values(), key=self._span), terms, False, found, limit)
+        if len(found) < limit and any(len(term) >= 3 for term in terms):
+            candidate_ranges = []
+            for term in terms:
+                ranges = list(prefix_ranges[term])
+                if len(term) >= 3:
+                    ranges += [self._range_exact(token) for token in self._substring_tokens(term)]
+                candidate_ranges.append(ranges)
+            self._collect(min(candidate_ranges, key=self._span), terms, True, found, limit)
+        return [(customer_id, self._names[customer_id]) for customer_id in found]
+
+    def _range_exact(self, token: str) -> tuple:
+        lo = bisect_left(self._tokens, (token,))
+        return lo, bisect_left(self._tokens, (token, "\uffff"))
+
+    @staticmethod
+    def _span(ranges) -> int:
+        return sum(hi - lo for lo, hi in ranges)
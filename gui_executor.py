@@ -0,0 +1,98 @@
+import queue
+import threading
+import tkinter as tk
+from tkinter import ttk
+
+class BackgroundExecutor:
+    POLL_MS = 50
+    PROGRESS_DELAY_MS = 300
+
+    def __init__(self, root):
+        self.root = root
+        self._tasks = queue.Queue()
+        self._results = queue.Queue()
+        self._pending = 0
+        self._progress_window = None
+        self._progress_job = None
+        # A single worker runs every Controller call in submission order, so
+        # writes never interleave and the Tk thread never touches the disk.
+        self._worker = threading.Thread(target=self._run, args=(self._tasks,), daemon=True)
+        self._worker.start()
+        # Reports only read published snapshots, so they get their own thread and
+        # never wait behind (or hold up) front-desk writes.
+        self._reads = queue.Queue()
+        self._reader = threading.Thread(target=self._run, args=(self._reads,), daemon=True)
+        self._reader.start()
+        self._poll_job = self.root.after(self.POLL_MS, self._poll)
+
+    def submit(self, func, *args, on_done=None, on_error=None, label: str = "Working...", read_only: bool = False):
+        self._pending += 1
+        (self._reads if read_only else self._tasks).put((func, args, on_done, on_error))
+        if self._progress_job is None and self._progress_window is None:
+            self._progress_job = self.root.after(self.PROGRESS_DELAY_MS, lambda: self._show_progress(label))
+
+    def busy(self) -> bool:
+        return self._pending > 0
+
+    def shutdown(self):
+        self._tasks.put(None)
+        self._reads.put(None)
+        self._worker.join()
+        self._reader.join()
+        self.root.after_cancel(self._poll_job)
+        self._drain()
+
+    def _run(self, tasks: queue.Queue):
+        while True:
+            task = tasks.get()
+            if task is None:
+                return
+            func, args, on_done, on_error = task
+            try:
+                self._results.put((on_done, func(*args), None, on_error))
+            except Exception as e:
+                self._results.put((on_done, None, e, on_error))
+
+    def _poll(self):
+        self._drain()
+        self._poll_job = self.root.after(self.POLL_MS, self._poll)
+
+    def _drain(self):
+        while True:
+            try:
+                on_done, result, error, on_error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._pending -= 1
+            if self._pending == 0:
+                self._hide_progress()
+            if error is not None:
+                if on_error:
+                    on_error(error)
+                else:
+                    print(f"Background task failed: {error}")
+            elif on_done:
+                on_done(result)
+
+    def _show_progress(self, label: str):
+        self._progress_job = None
+        if not self._pending:
+            return
+        window = tk.Toplevel(self.root)
+        window.title("Please wait")
+        window.transient(self.root)
+        window.resizable(False, False)
+        tk.Label(window, text=label, font=("Arial", 12)).pack(padx=20, pady=(15, 5))
+        bar = ttk.Progressbar(window, mode="indeterminate", length=200)
+        bar.pack(padx=20, pady=(5, 15))
+        bar.start(10)
+        self._progress_window = window
+
+    def _hide_progress(self):
+        if self._progress_job is not None:
+            self.root.after_cancel(self._progress_job)
+            self._progress_job = None
+        if self._progress_window is not None:
+            if self._progress_window.winfo_exists():
+                self._progress_window.destroy()
+            self._progress_window = None
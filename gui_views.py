@@ -0,0 +1,142 @@
+import tkinter as tk
+from tkinter import ttk
+from typing import Dict, List
+
+class VirtualTreeview:
+    def __init__(self, parent, columns: List[str], headings: List[str], height: int = 15):
+        self.frame = tk.Frame(parent)
+        self.height = height
+        self.tree = ttk.Treeview(self.frame, columns=columns, show="headings", height=height, selectmode="browse")
+        for column, heading in zip(columns, headings):
+            self.tree.heading(column, text=heading)
+        self.scrollbar = tk.Scrollbar(self.frame, command=self._on_scroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        # Only `height` Treeview items ever exist; the full list lives here and
+        # the scrollbar moves a window over it.
+        self._keys: List = []
+        self._rows: Dict = {}
+        self.offset = 0
+        self.selected_key = None
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+        self.tree.bind("<MouseWheel>", lambda e: self.scroll_by(-1 if e.delta > 0 else 1))
+        self.tree.bind("<Button-4>", lambda e: self.scroll_by(-1))
+        self.tree.bind("<Button-5>", lambda e: self.scroll_by(1))
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def bind(self, sequence, func):
+        self.tree.bind(sequence, func)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def values(self, key):
+        return self._rows.get(key)
+
+    def upsert(self, key, values, render: bool = True):
+        if key not in self._rows:
+            self._keys.append(key)
+        self._rows[key] = values
+        if render:
+            self.render()
+
+    def remove(self, key, render: bool = True):
+        if key not in self._rows:
+            return
+        del self._rows[key]
+        self._keys.remove(key)
+        if self.selected_key == key:
+            self.selected_key = None
+        if render:
+            self.render()
+
+    def set_rows(self, rows: List[tuple]):
+        # Diff against the current rows so unchanged entries keep their position
+        incoming = {key: values for key, values in rows}
+        for key in [k for k in self._keys if k not in incoming]:
+            self.remove(key, render=False)
+        for key, values in rows:
+            self.upsert(key, values, render=False)
+        self.render()
+
+    def scroll_by(self, rows: int):
+        self._scroll_to(self.offset + rows)
+        return "break"
+
+    def render(self):
+        self.offset = max(0, min(self.offset, len(self._keys) - self.height))
+        visible = self._keys[self.offset:self.offset + self.height]
+        wanted = {str(key) for key in visible}
+        for iid in self.tree.get_children():
+            if iid not in wanted:
+                self.tree.delete(iid)
+        for index, key in enumerate(visible):
+            iid = str(key)
+            if self.tree.exists(iid):
+                self.tree.move(iid, "", index)
+                self.tree.item(iid, values=self._rows[key])
+            else:
+                self.tree.insert("", index, iid=iid, values=self._rows[key])
+        if self.selected_key is not None and self.tree.exists(str(self.selected_key)):
+            self.tree.selection_set(str(self.selected_key))
+        total = max(len(self._keys), 1)
+        self.scrollbar.set(self.offset / total, min((self.offset + self.height) / total, 1.0))
+
+    def _scroll_to(self, offset: int):
+        self.offset = offset
+        self.render()
+
+    def _on_scroll(self, *args):
+        if args[0] == "moveto":
+            self._scroll_to(int(float(args[1]) * len(self._keys)))
+        elif args[0] == "scroll":
+            step = int(args[1]) * (self.height if args[2] == "pages" else 1)
+            self._scroll_to(self.offset + step)
+
+    def _on_select(self, event):
+        selection = self.tree.selection()
+        if selection:
+            iid = selection[0]
+            self.selected_key = next((key for key in self._keys[self.offset:self.offset + self.height]
+                                      if str(key) == iid), self.selected_key)
+
+class ScreenManager:
+    def __init__(self, root):
+        self.container = tk.Frame(root)
+        self.container.pack(fill=tk.BOTH, expand=True)
+        self.container.grid_rowconfigure(0, weight=1)
+        self.container.grid_columnconfigure(0, weight=1)
+        self._screens: Dict[str, tuple] = {}
+        self.current = None
+
+    def show(self, name: str, build, refresh=None):
+        # Each screen is built once into its own frame; later visits only raise
+        # the frame and run its refresh callback.
+        if name not in self._screens:
+            frame = tk.Frame(self.container)
+            frame.grid(row=0, column=0, sticky="nsew")
+            build(frame)
+            self._screens[name] = (frame, refresh)
+        frame, refresh = self._screens[name]
+        if refresh:
+            refresh()
+        frame.tkraise()
+        self.current = name
+        return frame
+
+class ViewModelCache:
+    # View models are computed from the published snapshot, never the live Admin,
+    # because the executor's worker may be mutating it while the Tk thread reads
+    def __init__(self, admin: 'Admin'):
+        self.admin = admin
+        self._entries: Dict[str, tuple] = {}
+
+    def get(self, name: str, compute):
+        snapshot = self.admin.snapshot()
+        entry = self._entries.get(name)
+        if entry is None or entry[0] != snapshot.version:
+            entry = (snapshot.version, compute(snapshot))
+            self._entries[name] = entry
+        return entry[1]
@@ -0,0 +1,301 @@
+import argparse
+import shlex
+import sys
+
+# Only argparse/shlex are imported up front; the domain modules are pulled in
+# by load_admin once we know what the commands actually need.
+
+def load_admin(sections):
+    from admin import Admin
+    if sections is not None and not sections:
+        return Admin("Hotel Admin")
+    return Admin.load_from_file("Hotel Admin", sections)
+
+def cmd_occupancy(admin, args):
+    return True, admin.get_room_occupancy_details()
+
+def cmd_service_record(admin, args):
+    return True, admin.generate_customer_service_record(args.customer_id)
+
+def cmd_pending(admin, args):
+    role = "service_provider_a" if args.provider == "a" else "service_provider_b"
+    rows = admin.get_pending_service_rows(role)
+    return True, "\n".join(f"{request_id}\t{room_number}\t{name}\t{holder or ''}"
+                           for request_id, room_number, name, holder in rows)
+
+def cmd_available(admin, args):
+    from datetime import datetime
+    start_date = datetime.strptime(args.start_date, "%Y-%m-%d")
+    rooms = admin.find_available_rooms(start_date, args.nights)
+    return True, " ".join(room.room_number for room in rooms)
+
+def cmd_history(admin, args):
+    import json
+    records = admin.archive.records_for_customer(args.customer_id)
+    if not records:
+        return False, f"No archived stays for customer {args.customer_id}."
+    return True, "\n".join(json.dumps(record) for record in records)
+
+def cmd_validate_swipes(admin, args):
+    import csv
+    with open(args.path, newline="") as f:
+        swipes = [(row[0], row[1]) for row in csv.reader(f) if len(row) >= 2]
+    results = admin.validate_swipes(swipes)
+    return True, "\n".join(f"{card_id}\t{room_number}\t{'ALLOW' if allowed else 'DENY'}"
+                           for (card_id, room_number), allowed in zip(swipes, results))
+
+def cmd_activate_card(admin, args):
+    return admin.activate_card(args.card_id), f"activate {args.card_id}"
+
+def cmd_deactivate_card(admin, args):
+    return admin.deactivate_card(args.card_id), f"deactivate {args.card_id}"
+
+def cmd_check_out(admin, args):
+    return admin.check_out(args.customer_id)
+
+def cmd_request_service(admin, args):
+    return admin.request_service(args.room_number, args.service_name)
+
+def cmd_housekeeping_queue(admin, args):
+    if args.attendant not in admin.housekeeping.staff:
+        return False, f"No attendant named {args.attendant}."
+    return True, "\n".join(f"{task.task_id}\t{task.room_number}\t{task.kind}"
+                           for task in admin.housekeeping.queue_for(args.attendant))
+
+def cmd_run_scheduler(admin, args):
+    return True, f"{admin.run_scheduled_tasks()} scheduled task(s) ran."
+
+def cmd_import_reservations(admin, args):
+    import csv
+    from datetime import datetime
+    guests = []
+    with open(args.path, newline="") as f:
+        for row in csv.DictReader(f):
+            start_date = datetime.strptime(row["start_date"], "%Y-%m-%d") if row.get("start_date") else None
+            guests.append((row["name"], row["customer_id"], row["room_number"], int(row["length"]), start_date))
+    success, messages = admin.bulk_create_reservations(guests)
+    return success, "\n".join(messages)
+
+def cmd_revenue(admin, args):
+    from datetime import datetime
+    start = datetime.strptime(args.start_date, "%Y-%m-%d").date()
+    end = datetime.strptime(args.end_date, "%Y-%m-%d").date()
+    revenue = admin.service_revenue_by_day(start, end, args.by)
+    return True, "\n".join(f"{day.isoformat()}\t{label}\t{amount:.2f}" for (day, label), amount in sorted(revenue.items()))
+
+def cmd_kpi(admin, args):
+    from datetime import date, datetime
+    if args.period == "mtd":
+        rows = [admin.reports.month_to_date()]
+    else:
+        if not (args.start_date and args.end_date):
+            return False, "daily and monthly reports need START and END dates."
+        start = datetime.strptime(args.start_date, "%Y-%m-%d").date()
+        end = datetime.strptime(args.end_date, "%Y-%m-%d").date()
+        report = admin.reports.daily if args.period == "daily" else admin.reports.monthly
+        rows = report(start, end)
+    if args.output:
+        export = admin.reports.export_csv if args.format == "csv" else admin.reports.export_json
+        export(rows, args.output)
+        return True, f"{len(rows)} row(s) written to {args.output}."
+    return True, "\n".join(f"{row['date']}\tocc {row['occupancy_rate']:.1%}\tADR {row['adr']:.2f}"
+                           f"\tRevPAR {row['revpar']:.2f}\tservices {row['service_revenue']:.2f}"
+                           f"\tturnaround {row['avg_turnaround_minutes'] if row['avg_turnaround_minutes'] is not None else '-'}"
+                           for row in rows)
+
+def cmd_night_audit(admin, args):
+    from datetime import datetime
+    business_date = datetime.strptime(args.date, "%Y-%m-%d").date() if args.date else None
+    report = admin.run_night_audit(business_date, args.workers)
+    lines = [f"{report['business_date']}: {report['occupied']}/{report['rooms']} occupied, "
+             f"{report['service_charges']:.2f} in service charges, {len(report['issues'])} issue(s)"]
+    lines += [f"{issue['room_number']}\t{issue['issue']}" for issue in report["issues"]]
+    return True, "\n".join(lines)
+
+def cmd_forecast(admin, args):
+    rows = admin.occupancy_forecast(args.days, args.room_type)
+    return True, "\n".join(f"{night.isoformat()}\t{booked}\t{rate:.1%}" for night, booked, rate in rows)
+
+def cmd_pickup(admin, args):
+    from datetime import datetime
+    start = datetime.strptime(args.start_date, "%Y-%m-%d").date()
+    end = datetime.strptime(args.end_date, "%Y-%m-%d").date()
+    curve = admin.pickup_curve(start, end, args.max_lead, args.room_type)
+    return True, "\n".join(f"{lead}\t{booked}" for lead, booked in enumerate(curve))
+
+def cmd_quote(admin, args):
+    from datetime import datetime
+    if args.nights <= 0:
+        return False, "Nights must be a positive number."
+    start = datetime.strptime(args.start_date, "%Y-%m-%d")
+    rows = admin.quote_rooms(start, args.nights, args.room_type)
+    return True, "\n".join(f"{room_number}\t{room_type}\t{'free' if free else 'booked'}\t{total:.2f}"
+                           for room_number, room_type, free, total in rows if free or args.all)
+
+def _floor_range(value: str) -> range:
+    first, _, last = value.partition("-")
+    return range(int(first), int(last or first) + 1)
+
+def cmd_rooms(admin, args):
+    rooms = admin.find_rooms(args.room_type, _floor_range(args.floors) if args.floors else None,
+                             args.feature, args.min_capacity, args.status)
+    return True, "\n".join(f"{room.room_number}\t{room.room_type}\tfloor {room.floor}\t{room.capacity}\t"
+                           f"{','.join(room.features)}\t{'/'.join(admin.inventory.status_of(room.room_number))}"
+                           for room in rooms)
+
+def cmd_add_rooms(admin, args):
+    from room_inventory import load_inventory
+    rooms = [room for room in load_inventory(args.path) if not admin.find_room(room.room_number)]
+    for room in rooms:
+        admin.add_room(room)
+    return True, f"{len(rooms)} room(s) added."
+
+def cmd_import(admin, args):
+    from bulk_io import BulkImporter, detect_format, read_rows
+    with open(args.path, newline="") as f:
+        importer = BulkImporter(admin, args.kind, args.chunk_rows).run(read_rows(f, detect_format(args.path, args.format)))
+    lines = [f"{importer.imported} {args.kind} imported, {importer.failed} row(s) rejected; "
+             f"committed through line {importer.committed_through}."]
+    lines += [f"line {line_number}: {message}" for line_number, message in importer.errors]
+    if importer.failed > len(importer.errors):
+        lines.append(f"... {importer.failed - len(importer.errors)} more rejected row(s) not shown.")
+    return not importer.failed, "\n".join(lines)
+
+def cmd_export(admin, args):
+    from bulk_io import detect_format, export_records, write_records
+    with open(args.path, 'w', newline="") as f:
+        count = write_records(export_records(admin, args.kind), args.kind, f, detect_format(args.path, args.format))
+    return True, f"{count} {args.kind} written to {args.path}."
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="haven", description="Headless Haven Hotel operations.")
+    parser.add_argument("--batch", action="store_true",
+                        help="read one command per line from stdin and run them under a single load/save")
+    commands = parser.add_subparsers(dest="command")
+
+    def command(name, func, sections, help_text):
+        sub = commands.add_parser(name, help=help_text)
+        sub.set_defaults(func=func, sections=sections)
+        return sub
+
+    command("occupancy", cmd_occupancy,
+            ["rooms", "cards", "reservations", "room_pending_services"], "print room occupancy")
+    command("service-record", cmd_service_record, ["reservations", "room_services"],
+            "print a guest's service record").add_argument("customer_id")
+    command("pending", cmd_pending, ["room_pending_services"],
+            "list pending service requests").add_argument("--provider", choices=["a", "b"], default="a")
+    sub = command("available", cmd_available, ["rooms", "reservations"], "list rooms free for a date range")
+    sub.add_argument("start_date", help="YYYY-MM-DD")
+    sub.add_argument("nights", type=int)
+    command("history", cmd_history, [], "print archived stays").add_argument("customer_id")
+    command("validate-swipes", cmd_validate_swipes, ["cards", "reservations"],
+            "check card_id,room_number swipes from a CSV").add_argument("path")
+    command("activate-card", cmd_activate_card, None, "activate a card").add_argument("card_id")
+    command("deactivate-card", cmd_deactivate_card, None, "deactivate a card").add_argument("card_id")
+    command("check-out", cmd_check_out, None, "check a guest out").add_argument("customer_id")
+    sub = command("request-service", cmd_request_service, None, "request a service for a room")
+    sub.add_argument("room_number")
+    sub.add_argument("service_name")
+    command("housekeeping-queue", cmd_housekeeping_queue, ["housekeeping"],
+            "list an attendant's housekeeping tasks").add_argument("attendant")
+    command("run-scheduler", cmd_run_scheduler, None, "expire cards and flag overdue stays that are due")
+    command("import-reservations", cmd_import_reservations, None,
+            "create reservations from a CSV (name,customer_id,room_number,length[,start_date])").add_argument("path")
+    sub = command("revenue", cmd_revenue, [], "print completed-service revenue per day")
+    sub.add_argument("start_date", help="YYYY-MM-DD (inclusive)")
+    sub.add_argument("end_date", help="YYYY-MM-DD (exclusive)")
+    sub.add_argument("--by", choices=["provider", "item", "room"], default="provider")
+    sub = command("kpi", cmd_kpi, ["rooms", "reservations"],
+                  "occupancy, ADR, RevPAR, service revenue and turnaround per day or month")
+    sub.add_argument("period", choices=["daily", "monthly", "mtd"])
+    sub.add_argument("start_date", nargs="?", help="YYYY-MM-DD (inclusive)")
+    sub.add_argument("end_date", nargs="?", help="YYYY-MM-DD (exclusive)")
+    sub.add_argument("--format", choices=["csv", "json"], default="csv")
+    sub.add_argument("--output", help="write the rows to this file instead of printing them")
+    sub = command("night-audit", cmd_night_audit,
+                  ["rooms", "cards", "reservations", "room_services", "room_pending_services"],
+                  "write the end-of-day folio and consistency snapshot")
+    sub.add_argument("--date", help="business date, YYYY-MM-DD (default: today)")
+    sub.add_argument("--workers", type=int, help="worker processes (default: one per CPU)")
+    sub = command("forecast", cmd_forecast, ["rooms", "reservations"], "rooms booked per night from today")
+    sub.add_argument("--days", type=int, default=30)
+    sub.add_argument("--room-type", dest="room_type")
+    sub = command("pickup", cmd_pickup, ["rooms", "reservations"],
+                  "bookings on the books by days before arrival, for arrivals in a date range")
+    sub.add_argument("start_date", help="YYYY-MM-DD (inclusive)")
+    sub.add_argument("end_date", help="YYYY-MM-DD (exclusive)")
+    sub.add_argument("--max-lead", dest="max_lead", type=int, default=90)
+    sub.add_argument("--room-type", dest="room_type")
+    sub = command("quote", cmd_quote, ["rooms", "reservations"], "price a stay in every room for a date range")
+    sub.add_argument("start_date", help="YYYY-MM-DD")
+    sub.add_argument("nights", type=int)
+    sub.add_argument("--room-type", dest="room_type")
+    sub.add_argument("--all", action="store_true", help="include rooms that are already booked")
+    sub = command("rooms", cmd_rooms, ["rooms", "reservations", "housekeeping"],
+                  "list rooms by type, floor, features, capacity and status")
+    sub.add_argument("--room-type", dest="room_type")
+    sub.add_argument("--floors", help="a floor or an inclusive range, e.g. 3-5")
+    sub.add_argument("--feature", action="append", default=[], help="required feature; repeat for several")
+    sub.add_argument("--min-capacity", dest="min_capacity", type=int)
+    sub.add_argument("--status", action="append", default=[], choices=["vacant", "occupied", "clean", "dirty"])
+    command("add-rooms", cmd_add_rooms, None,
+            "add the rooms of an inventory file that are not set up yet").add_argument("path")
+    kinds = ["customers", "reservations", "rooms", "cards"]
+    sub = command("import", cmd_import, None, "stream records from a CSV or JSONL file, committing in chunks")
+    sub.add_argument("kind", choices=kinds)
+    sub.add_argument("path")
+    sub.add_argument("--format", choices=["csv", "jsonl"], help="default: from the file extension")
+    sub.add_argument("--chunk-rows", dest="chunk_rows", type=int, help="rows per commit (default 1000)")
+    sub = command("export", cmd_export, None, "stream records to a CSV or JSONL file")
+    sub.add_argument("kind", choices=kinds)
+    sub.add_argument("path")
+    sub.add_argument("--format", choices=["csv", "jsonl"], help="default: from the file extension")
+    return parser
+
+def merge_sections(commands):
+    sections = set()
+    for args in commands:
+        if args.sections is None:
+            return None
+        sections.update(args.sections)
+    return sorted(sections)
+
+def run(commands) -> int:
+    admin = load_admin(merge_sections(commands))
+    failures = 0
+    with admin.batch():
+        for args in commands:
+            try:
+                success, output = args.func(admin, args)
+            except Exception as e:
+                success, output = False, f"Error: {e}"
+            if output:
+                print(output)
+            if not success:
+                failures += 1
+    if not admin.flush():
+        failures += 1
+    return 1 if failures else 0
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.batch:
+        commands = []
+        for line_number, line in enumerate(sys.stdin, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                commands.append(parser.parse_args(shlex.split(line)))
+            except SystemExit:
+                print(f"Line {line_number}: could not parse '{line}'", file=sys.stderr)
+                return 2
+        return run([c for c in commands if c.command])
+    if not args.command:
+        parser.print_help()
+        return 2
+    return run([args])
+
+if __name__ == "__main__":
+    sys.exit(main())
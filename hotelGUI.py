@@ -1,108 +1,220 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
+from datetime import datetime
 from controller import Controller
+from gui_executor import BackgroundExecutor
+from gui_views import VirtualTreeview, ScreenManager, ViewModelCache
 
 class HotelManagementGUI:
+    REFRESH_MS = 2000
+    SCHEDULER_MS = 60000
+    CLAIM_HEARTBEAT_MS = 60000
+    CLAIM_BATCH = 5
+
     def __init__(self, root):
         self.root = root
         self.root.title("Hotel Management System")
         self.controller = Controller("Hotel Admin")
-        self.customer_counter = 1
-        self.selected_service_line = None
+        self.executor = BackgroundExecutor(self.root)
+        self.screens = ScreenManager(self.root)
+        self.view_models = ViewModelCache(self.controller.admin)
+        self.refresh_job = None
+        self.refresh_token = 0
+        self.feed_seq = 0
         self.show_login_screen()
+        self.scheduler_job = self.root.after(self.SCHEDULER_MS, self.run_scheduled_tasks)
+        self.heartbeat_job = self.root.after(self.CLAIM_HEARTBEAT_MS, self.renew_claims)
         self.root.geometry("800x700")
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
 
+    def run_scheduled_tasks(self):
+        self.executor.submit(self.controller.run_scheduled_tasks)
+        self.scheduler_job = self.root.after(self.SCHEDULER_MS, self.run_scheduled_tasks)
+
+    def renew_claims(self):
+        # Keeps this session's service claims alive; they lapse back to the queue if the app dies
+        self.executor.submit(self.controller.renew_claims)
+        self.heartbeat_job = self.root.after(self.CLAIM_HEARTBEAT_MS, self.renew_claims)
+
+    def logout(self):
+        self.executor.submit(self.controller.logout)
+        self.show_login_screen()
+
     def on_closing(self):
-        self.controller.admin.save_to_file()
+        self.root.after_cancel(self.scheduler_job)
+        self.root.after_cancel(self.heartbeat_job)
+        self.executor.submit(self.controller.release_claims)
+        self.executor.submit(self.controller.admin.save_to_file)
+        self.executor.submit(self.controller.admin.flush)
+        self.executor.shutdown()
         self.root.destroy()
 
-    def clear_window(self):
-        for widget in self.root.winfo_children():
-            widget.destroy()
+    def run_action(self, func, *args, on_success=None, label="Working...", read_only=False):
+        # Runs a Controller call that returns (success, message) off the Tk thread
+        def done(result):
+            success, message = result
+            if success:
+                messagebox.showinfo("Success", message)
+                if on_success:
+                    on_success()
+            else:
+                messagebox.showerror("Error", message)
+        self.executor.submit(func, *args, on_done=done,
+                             on_error=lambda e: messagebox.showerror("Error", str(e)), label=label,
+                             read_only=read_only)
+
+    def load_with_seq(self, func, *args):
+        # Runs on the worker: pairs a snapshot with the change-feed position it reflects
+        return self.controller.admin.changes.seq, func(*args)
+
+    def start_refresh(self, kind, apply_changes, resync):
+        self.cancel_refresh()
+        token = self.refresh_token
+
+        def tick():
+            def done(result):
+                if token != self.refresh_token:
+                    return
+                seq, events = result
+                if events is None:
+                    resync()
+                elif events:
+                    apply_changes(events)
+                self.feed_seq = seq
+                self.refresh_job = self.root.after(self.REFRESH_MS, tick)
+            self.executor.submit(self.controller.get_changes, self.feed_seq, kind, on_done=done)
+        self.refresh_job = self.root.after(self.REFRESH_MS, tick)
+
+    def cancel_refresh(self):
+        self.refresh_token += 1
+        if self.refresh_job is not None:
+            self.root.after_cancel(self.refresh_job)
+            self.refresh_job = None
+
+    def show_screen(self, name, build, refresh=None):
+        self.cancel_refresh()
+        return self.screens.show(name, build, refresh)
+
+    def fill_combobox(self, combobox, values):
+        # Cached view-model lists are reused while Admin.version is unchanged,
+        # so an identical list object means there is nothing to redraw.
+        if getattr(combobox, "applied_values", None) is values:
+            return
+        combobox.applied_values = values
+        combobox["values"] = values
+        if combobox.get() not in values:
+            combobox.set(values[0] if values else "")
+
+    def show_either(self, widget, placeholder, condition):
+        # Swaps a screen section with its empty-state placeholder without rebuilding either
+        if condition:
+            placeholder.pack_forget()
+            widget.pack(pady=5)
+        else:
+            widget.pack_forget()
+            placeholder.pack(pady=5)
+
+    def room_numbers(self):
+        return self.view_models.get("room_numbers", lambda snapshot: list(snapshot.room_order))
+
+    def pending_reservation_choices(self):
+        return self.view_models.get("pending_reservations", lambda snapshot: snapshot.pending_reservations())
+
+    def checked_in_choices(self):
+        return self.view_models.get("checked_in_customers", lambda snapshot: [
+            f"{cid} - {name}" for cid, name in snapshot.checked_in()
+        ])
 
     def show_login_screen(self):
-        self.clear_window()
-        tk.Label(self.root, text="Enter Password:", font=("Arial", 14)).pack(pady=10)
-        password_entry = tk.Entry(self.root, show="*", font=("Arial", 12))
-        password_entry.pack(pady=5)
-        tk.Button(self.root, text="Login", command=lambda: self.process_login(password_entry.get()), font=("Arial", 12)).pack(pady=10)
+        def build(frame):
+            tk.Label(frame, text="Enter Password:", font=("Arial", 14)).pack(pady=10)
+            self.password_entry = tk.Entry(frame, show="*", font=("Arial", 12))
+            self.password_entry.pack(pady=5)
+            tk.Button(frame, text="Login", command=lambda: self.process_login(self.password_entry.get()), font=("Arial", 12)).pack(pady=10)
+        self.show_screen("login", build, lambda: self.password_entry.delete(0, tk.END))
 
     def process_login(self, password):
         success, message = self.controller.login(password)
         if success:
-            if self.controller.admin.customers:
-                last_customer_id = max(int(c.customer_id.replace("CUST", "")) for c in self.controller.admin.customers)
-                self.customer_counter = last_customer_id + 1
             self.show_main_menu()
         else:
             messagebox.showerror("Error", message)
 
     def show_main_menu(self):
-        self.clear_window()
         role = self.controller.current_user_role
-        # Custom welcome messages for service providers
-        if role == "admin":
-            welcome_text = "Welcome, Admin!"
-        elif role == "service_provider_a":
-            welcome_text = "Welcome, Room Service A!"
-        elif role == "service_provider_b":
-            welcome_text = "Welcome, Room Service B!"
-        else:
-            welcome_text = "Welcome!"
-
-        tk.Label(self.root, text=welcome_text, font=("Arial", 16)).pack(pady=10)
-
-        if role == "admin":
-            tk.Button(self.root, text="Manage Customer Reservation", command=self.show_manage_customer_reservation, font=("Arial", 12)).pack(pady=5)
-            tk.Button(self.root, text="Check-in Customer", command=self.show_check_in, font=("Arial", 12)).pack(pady=5)
-            tk.Button(self.root, text="Check-out Customer", command=self.show_check_out, font=("Arial", 12)).pack(pady=5)
-            tk.Button(self.root, text="Request Service", command=self.show_request_service, font=("Arial", 12)).pack(pady=5)
-            tk.Button(self.root, text="Generate Service Record", command=self.show_generate_service_record, font=("Arial", 12)).pack(pady=5)
-            tk.Button(self.root, text="View Room Occupancy", command=self.show_room_occupancy, font=("Arial", 12)).pack(pady=5)
-            tk.Button(self.root, text="Manage Cards", command=self.show_manage_cards_menu, font=("Arial", 12)).pack(pady=5)
-            tk.Button(self.root, text="Logout", command=self.show_login_screen, font=("Arial", 12)).pack(pady=5)
-        elif role in ["service_provider_a", "service_provider_b"]:
-            tk.Button(self.root, text="View Pending Service Requests", command=self.show_pending_requests, font=("Arial", 12)).pack(pady=5)
-            tk.Button(self.root, text="Logout", command=self.show_login_screen, font=("Arial", 12)).pack(pady=5)
+
+        def build(frame):
+            # Custom welcome messages for service providers
+            if role == "admin":
+                welcome_text = "Welcome, Admin!"
+            elif role == "service_provider_a":
+                welcome_text = "Welcome, Room Service A!"
+            elif role == "service_provider_b":
+                welcome_text = "Welcome, Room Service B!"
+            else:
+                welcome_text = "Welcome!"
+
+            tk.Label(frame, text=welcome_text, font=("Arial", 16)).pack(pady=10)
+
+            if role == "admin":
+                tk.Button(frame, text="Manage Customer Reservation", command=self.show_manage_customer_reservation, font=("Arial", 12)).pack(pady=5)
+                tk.Button(frame, text="Find Guest", command=self.show_find_guest, font=("Arial", 12)).pack(pady=5)
+                tk.Button(frame, text="Check-in Customer", command=self.show_check_in, font=("Arial", 12)).pack(pady=5)
+                tk.Button(frame, text="Check-out Customer", command=self.show_check_out, font=("Arial", 12)).pack(pady=5)
+                tk.Button(frame, text="Request Service", command=self.show_request_service, font=("Arial", 12)).pack(pady=5)
+                tk.Button(frame, text="Generate Service Record", command=self.show_generate_service_record, font=("Arial", 12)).pack(pady=5)
+                tk.Button(frame, text="View Room Occupancy", command=self.show_room_occupancy, font=("Arial", 12)).pack(pady=5)
+                tk.Button(frame, text="Manage Cards", command=self.show_manage_cards_menu, font=("Arial", 12)).pack(pady=5)
+                tk.Button(frame, text="Run Night Audit", font=("Arial", 12),
+                          command=lambda: self.run_action(self.controller.run_night_audit, label="Running night audit...",
+                                                          read_only=True)).pack(pady=5)
+                tk.Button(frame, text="Logout", command=self.logout, font=("Arial", 12)).pack(pady=5)
+            elif role in ["service_provider_a", "service_provider_b"]:
+                tk.Button(frame, text="View Pending Service Requests", command=self.show_pending_requests, font=("Arial", 12)).pack(pady=5)
+                if role == "service_provider_b":
+                    tk.Button(frame, text="Housekeeping Queue", command=self.show_housekeeping_queue, font=("Arial", 12)).pack(pady=5)
+                tk.Button(frame, text="Logout", command=self.logout, font=("Arial", 12)).pack(pady=5)
+        self.show_screen(f"main_menu_{role}", build)
 
     def show_manage_customer_reservation(self):
-        self.clear_window()
-        tk.Label(self.root, text="Manage Customer Reservation", font=("Arial", 14)).pack(pady=10)
-
-        tk.Label(self.root, text="Add New Reservation", font=("Arial", 12, "bold")).pack(pady=5)
-        tk.Label(self.root, text="Customer Name:", font=("Arial", 12)).pack()
-        self.customer_name_entry = tk.Entry(self.root, font=("Arial", 12))
-        self.customer_name_entry.pack(pady=5)
-        tk.Label(self.root, text="Select Room:", font=("Arial", 12)).pack()
-        room_numbers = [r.room_number for r in self.controller.admin.rooms]
-        self.room_combobox = ttk.Combobox(self.root, values=room_numbers, font=("Arial", 12))
-        self.room_combobox.pack(pady=5)
-        self.room_combobox.set(room_numbers[0] if room_numbers else "")
-        tk.Label(self.root, text="Stay Length (days):", font=("Arial", 12)).pack()
-        self.length_entry = tk.Entry(self.root, font=("Arial", 12))
-        self.length_entry.pack(pady=5)
-        tk.Button(self.root, text="Create Reservation", command=self.create_reservation_action, font=("Arial", 12)).pack(pady=5)
-
-        tk.Label(self.root, text="Existing Reservations", font=("Arial", 12, "bold")).pack(pady=10)
-        reservations = [(cid, stay) for cid, stay in self.controller.admin.reservations.items() if stay and not stay.is_active]
-        if not reservations:
-            tk.Label(self.root, text="No pending reservations available.", font=("Arial", 12)).pack()
-        else:
-            customer_map = {c.customer_id: c.name for c in self.controller.admin.customers}
-            self.reservation_combobox = ttk.Combobox(self.root, values=[
-                f"{cid} - {customer_map[cid]} (Room: {stay.room.room_number}, {stay.length} days)"
-                for cid, stay in reservations
-            ], font=("Arial", 12))
+        def build(frame):
+            tk.Label(frame, text="Manage Customer Reservation", font=("Arial", 14)).pack(pady=10)
+
+            tk.Label(frame, text="Add New Reservation", font=("Arial", 12, "bold")).pack(pady=5)
+            tk.Label(frame, text="Customer Name:", font=("Arial", 12)).pack()
+            self.customer_name_entry = tk.Entry(frame, font=("Arial", 12))
+            self.customer_name_entry.pack(pady=5)
+            tk.Label(frame, text="Select Room:", font=("Arial", 12)).pack()
+            self.room_combobox = ttk.Combobox(frame, font=("Arial", 12))
+            self.room_combobox.pack(pady=5)
+            tk.Label(frame, text="Stay Length (days):", font=("Arial", 12)).pack()
+            self.length_entry = tk.Entry(frame, font=("Arial", 12))
+            self.length_entry.pack(pady=5)
+            tk.Label(frame, text="Arrival Date (YYYY-MM-DD, blank for today):", font=("Arial", 12)).pack()
+            self.start_date_entry = tk.Entry(frame, font=("Arial", 12))
+            self.start_date_entry.pack(pady=5)
+            tk.Button(frame, text="Create Reservation", command=self.create_reservation_action, font=("Arial", 12)).pack(pady=5)
+
+            tk.Label(frame, text="Existing Reservations", font=("Arial", 12, "bold")).pack(pady=10)
+            self.no_reservations_label = tk.Label(frame, text="No pending reservations available.", font=("Arial", 12))
+            self.reservations_panel = tk.Frame(frame)
+            self.reservation_combobox = ttk.Combobox(self.reservations_panel, font=("Arial", 12))
             self.reservation_combobox.pack(pady=5)
-            self.reservation_combobox.set([
-                f"{cid} - {customer_map[cid]} (Room: {stay.room.room_number}, {stay.length} days)"
-                for cid, stay in reservations
-            ][0] if reservations else "")
-            tk.Button(self.root, text="Update Reservation", command=self.show_update_reservation, font=("Arial", 12)).pack(pady=5)
-            tk.Button(self.root, text="Delete Reservation", command=self.delete_reservation_action, font=("Arial", 12)).pack(pady=5)
-
-        tk.Button(self.root, text="Back", command=self.show_main_menu, font=("Arial", 12)).pack(pady=10)
+            tk.Button(self.reservations_panel, text="Update Reservation", command=self.show_update_reservation, font=("Arial", 12)).pack(pady=5)
+            tk.Button(self.reservations_panel, text="Delete Reservation", command=self.delete_reservation_action, font=("Arial", 12)).pack(pady=5)
+            tk.Button(frame, text="Back", command=self.show_main_menu, font=("Arial", 12)).pack(pady=10, side=tk.BOTTOM)
+
+        def refresh():
+            for entry in (self.customer_name_entry, self.length_entry, self.start_date_entry):
+                entry.delete(0, tk.END)
+            self.fill_combobox(self.room_combobox, self.room_numbers())
+            choices = self.view_models.get("reservation_labels", lambda snapshot: [
+                f"{view.customer_id} - {view.name} (Room: {view.room_number}, {view.start_date:%Y-%m-%d}, {view.length} days)"
+                for view in self.pending_reservation_choices()
+            ])
+            self.fill_combobox(self.reservation_combobox, choices)
+            self.show_either(self.reservations_panel, self.no_reservations_label, bool(choices))
+        self.show_screen("manage_reservation", build, refresh)
 
     def create_reservation_action(self):
         customer_name = self.customer_name_entry.get().strip()
@@ -115,6 +227,15 @@ class HotelManagementGUI:
             messagebox.showerror("Error", f"Invalid stay length: {e}")
             return
 
+        start_date = None
+        start_date_input = self.start_date_entry.get().strip()
+        if start_date_input:
+            try:
+                start_date = datetime.strptime(start_date_input, "%Y-%m-%d")
+            except ValueError:
+                messagebox.showerror("Error", "Arrival date must be in YYYY-MM-DD format.")
+                return
+
         if not customer_name:
             messagebox.showerror("Error", "Customer name cannot be empty.")
             return
@@ -122,14 +243,9 @@ class HotelManagementGUI:
             messagebox.showerror("Error", "Please select a room.")
             return
 
-        customer_id = f"CUST{self.customer_counter:03d}"
-        self.customer_counter += 1
-        success, message = self.controller.create_reservation(customer_name, customer_id, room_number, length)
-        if success:
-            messagebox.showinfo("Success", message)
-            self.show_manage_customer_reservation()
-        else:
-            messagebox.showerror("Error", message)
+        # The customer ID is allocated from the persisted sequence by the controller
+        self.run_action(self.controller.create_reservation, customer_name, None, room_number, length, start_date,
+                        on_success=self.show_manage_customer_reservation)
 
     def show_update_reservation(self):
         selected_reservation = self.reservation_combobox.get()
@@ -137,21 +253,34 @@ class HotelManagementGUI:
             messagebox.showerror("Error", "Please select a reservation to update.")
             return
 
-        customer_id = selected_reservation.split(" - ")[0]
-        self.clear_window()
-        tk.Label(self.root, text=f"Update Reservation for {customer_id}", font=("Arial", 14)).pack(pady=10)
+        self.update_customer_id = selected_reservation.split(" - ")[0]
+
+        def build(frame):
+            self.update_title_label = tk.Label(frame, font=("Arial", 14))
+            self.update_title_label.pack(pady=10)
 
-        tk.Label(self.root, text="New Room (leave blank to keep current):", font=("Arial", 12)).pack()
-        room_numbers = [r.room_number for r in self.controller.admin.rooms]
-        self.update_room_combobox = ttk.Combobox(self.root, values=room_numbers, font=("Arial", 12))
-        self.update_room_combobox.pack(pady=5)
+            tk.Label(frame, text="New Room (leave blank to keep current):", font=("Arial", 12)).pack()
+            self.update_room_combobox = ttk.Combobox(frame, font=("Arial", 12))
+            self.update_room_combobox.pack(pady=5)
 
-        tk.Label(self.root, text="New Stay Length (days, leave blank to keep current):", font=("Arial", 12)).pack()
-        self.update_length_entry = tk.Entry(self.root, font=("Arial", 12))
-        self.update_length_entry.pack(pady=5)
+            tk.Label(frame, text="New Stay Length (days, leave blank to keep current):", font=("Arial", 12)).pack()
+            self.update_length_entry = tk.Entry(frame, font=("Arial", 12))
+            self.update_length_entry.pack(pady=5)
 
-        tk.Button(self.root, text="Update", command=lambda: self.update_reservation_action(customer_id), font=("Arial", 12)).pack(pady=5)
-        tk.Button(self.root, text="Back", command=self.show_manage_customer_reservation, font=("Arial", 12)).pack(pady=5)
+            tk.Label(frame, text="New Arrival Date (YYYY-MM-DD, leave blank to keep current):", font=("Arial", 12)).pack()
+            self.update_start_date_entry = tk.Entry(frame, font=("Arial", 12))
+            self.update_start_date_entry.pack(pady=5)
+
+            tk.Button(frame, text="Update", command=lambda: self.update_reservation_action(self.update_customer_id), font=("Arial", 12)).pack(pady=5)
+            tk.Button(frame, text="Back", command=self.show_manage_customer_reservation, font=("Arial", 12)).pack(pady=5)
+
+        def refresh():
+            self.update_title_label.config(text=f"Update Reservation for {self.update_customer_id}")
+            self.fill_combobox(self.update_room_combobox, self.room_numbers())
+            self.update_room_combobox.set("")
+            self.update_length_entry.delete(0, tk.END)
+            self.update_start_date_entry.delete(0, tk.END)
+        self.show_screen("update_reservation", build, refresh)
 
     def update_reservation_action(self, customer_id):
         room_number = self.update_room_combobox.get() or None
@@ -166,12 +295,17 @@ class HotelManagementGUI:
                 messagebox.showerror("Error", f"Invalid stay length: {e}")
                 return
 
-        success, message = self.controller.update_reservation(customer_id, room_number, length)
-        if success:
-            messagebox.showinfo("Success", message)
-            self.show_manage_customer_reservation()
-        else:
-            messagebox.showerror("Error", message)
+        start_date = None
+        start_date_input = self.update_start_date_entry.get().strip()
+        if start_date_input:
+            try:
+                start_date = datetime.strptime(start_date_input, "%Y-%m-%d")
+            except ValueError:
+                messagebox.showerror("Error", "Arrival date must be in YYYY-MM-DD format.")
+                return
+
+        self.run_action(self.controller.update_reservation, customer_id, room_number, length, start_date,
+                        on_success=self.show_manage_customer_reservation)
 
     def delete_reservation_action(self):
         selected_reservation = self.reservation_combobox.get()
@@ -181,69 +315,57 @@ class HotelManagementGUI:
 
         customer_id = selected_reservation.split(" - ")[0]
         if messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete the reservation for {customer_id}?"):
-            success, message = self.controller.delete_reservation(customer_id)
-            if success:
-                messagebox.showinfo("Success", message)
-                self.show_manage_customer_reservation()
-            else:
-                messagebox.showerror("Error", message)
+            self.run_action(self.controller.delete_reservation, customer_id,
+                            on_success=self.show_manage_customer_reservation)
 
     def show_check_in(self):
-        self.clear_window()
-        tk.Label(self.root, text="Check-in Customer", font=("Arial", 14)).pack(pady=10)
-        tk.Label(self.root, text="Select Reservation:", font=("Arial", 12)).pack()
-        reservations = [(cid, stay) for cid, stay in self.controller.admin.reservations.items() if stay and not stay.is_active]
-        if not reservations:
-            tk.Label(self.root, text="No pending reservations available.", font=("Arial", 12)).pack()
-            tk.Button(self.root, text="Back", command=self.show_main_menu, font=("Arial", 12)).pack(pady=10)
-            return
-        customer_map = {c.customer_id: c.name for c in self.controller.admin.customers}
-        self.reservation_combobox = ttk.Combobox(self.root, values=[
-            f"{cid} - {customer_map[cid]} (Room: {stay.room.room_number})"
-            for cid, stay in reservations
-        ], font=("Arial", 12))
-        self.reservation_combobox.pack(pady=5)
-        self.reservation_combobox.set([
-            f"{cid} - {customer_map[cid]} (Room: {stay.room.room_number})"
-            for cid, stay in reservations
-        ][0] if reservations else "")
-        self.payment_var = tk.BooleanVar()
-        tk.Checkbutton(self.root, text="Payment Done", variable=self.payment_var, font=("Arial", 12)).pack(pady=5)
-        tk.Button(self.root, text="Check-in", command=self.check_in_action, font=("Arial", 12)).pack(pady=10)
-        tk.Button(self.root, text="Back", command=self.show_main_menu, font=("Arial", 12)).pack()
+        def build(frame):
+            tk.Label(frame, text="Check-in Customer", font=("Arial", 14)).pack(pady=10)
+            tk.Label(frame, text="Select Reservation:", font=("Arial", 12)).pack()
+            tk.Button(frame, text="Back", command=self.show_main_menu, font=("Arial", 12)).pack(pady=10, side=tk.BOTTOM)
+            self.no_check_in_label = tk.Label(frame, text="No pending reservations available.", font=("Arial", 12))
+            self.check_in_panel = tk.Frame(frame)
+            self.check_in_combobox = ttk.Combobox(self.check_in_panel, font=("Arial", 12))
+            self.check_in_combobox.pack(pady=5)
+            self.payment_var = tk.BooleanVar()
+            tk.Checkbutton(self.check_in_panel, text="Payment Done", variable=self.payment_var, font=("Arial", 12)).pack(pady=5)
+            tk.Button(self.check_in_panel, text="Check-in", command=self.check_in_action, font=("Arial", 12)).pack(pady=10)
+
+        def refresh():
+            choices = self.view_models.get("check_in_labels", lambda snapshot: [
+                f"{view.customer_id} - {view.name} (Room: {view.room_number})"
+                for view in self.pending_reservation_choices()
+            ])
+            self.fill_combobox(self.check_in_combobox, choices)
+            self.payment_var.set(False)
+            self.show_either(self.check_in_panel, self.no_check_in_label, bool(choices))
+        self.show_screen("check_in", build, refresh)
 
     def check_in_action(self):
-        selected_reservation = self.reservation_combobox.get()
+        selected_reservation = self.check_in_combobox.get()
         if not selected_reservation:
             messagebox.showerror("Error", "Please select a reservation.")
             return
         customer_id = selected_reservation.split(" - ")[0]
         payment_done = self.payment_var.get()
-        success, message = self.controller.check_in_customer(customer_id, payment_done)
-        if success:
-            messagebox.showinfo("Success", message)
-            self.show_main_menu()
-        else:
-            messagebox.showerror("Error", message)
+        self.run_action(self.controller.check_in_customer, customer_id, payment_done, on_success=self.show_main_menu)
 
     def show_check_out(self):
-        self.clear_window()
-        tk.Label(self.root, text="Check-out Customer", font=("Arial", 14)).pack(pady=10)
-        tk.Label(self.root, text="Select Customer:", font=("Arial", 12)).pack()
-        customers = [c for c in self.controller.admin.customers if c.stay and c.stay.is_active]
-        if not customers:
-            tk.Label(self.root, text="No checked-in customers available.", font=("Arial", 12)).pack()
-            tk.Button(self.root, text="Back", command=self.show_main_menu, font=("Arial", 12)).pack(pady=10)
-            return
-        self.customer_combobox = ttk.Combobox(self.root, values=[
-            f"{c.customer_id} - {c.name}" for c in customers
-        ], font=("Arial", 12))
-        self.customer_combobox.pack(pady=5)
-        self.customer_combobox.set([
-            f"{c.customer_id} - {c.name}" for c in customers
-        ][0] if customers else "")
-        tk.Button(self.root, text="Check-out", command=self.check_out_action, font=("Arial", 12)).pack(pady=10)
-        tk.Button(self.root, text="Back", command=self.show_main_menu, font=("Arial", 12)).pack()
+        def build(frame):
+            tk.Label(frame, text="Check-out Customer", font=("Arial", 14)).pack(pady=10)
+            tk.Label(frame, text="Select Customer:", font=("Arial", 12)).pack()
+            tk.Button(frame, text="Back", command=self.show_main_menu, font=("Arial", 12)).pack(pady=10, side=tk.BOTTOM)
+            self.no_check_out_label = tk.Label(frame, text="No checked-in customers available.", font=("Arial", 12))
+            self.check_out_panel = tk.Frame(frame)
+            self.customer_combobox = ttk.Combobox(self.check_out_panel, font=("Arial", 12))
+            self.customer_combobox.pack(pady=5)
+            tk.Button(self.check_out_panel, text="Check-out", command=self.check_out_action, font=("Arial", 12)).pack(pady=10)
+
+        def refresh():
+            choices = self.checked_in_choices()
+            self.fill_combobox(self.customer_combobox, choices)
+            self.show_either(self.check_out_panel, self.no_check_out_label, bool(choices))
+        self.show_screen("check_out", build, refresh)
 
     def check_out_action(self):
         selected_customer = self.customer_combobox.get()
@@ -251,134 +373,198 @@ class HotelManagementGUI:
             messagebox.showerror("Error", "Please select a customer.")
             return
         customer_id = selected_customer.split(" - ")[0]
-        success, message = self.controller.check_out_customer(customer_id)
-        if success:
-            messagebox.showinfo("Success", message)
-            self.show_main_menu()
-        else:
-            messagebox.showerror("Error", message)
+        self.run_action(self.controller.check_out_customer, customer_id, on_success=self.show_main_menu)
 
     def show_request_service(self):
-        self.clear_window()
-        tk.Label(self.root, text="Request Service", font=("Arial", 14)).pack(pady=10)
-        occupied_rooms = [c.stay.room for c in self.controller.admin.customers if c.stay and c.stay.is_active]
-        if not occupied_rooms:
-            tk.Label(self.root, text="No occupied rooms available.", font=("Arial", 12)).pack()
-            tk.Button(self.root, text="Back", command=self.show_main_menu, font=("Arial", 12)).pack(pady=10)
-            return
-        tk.Label(self.root, text="Select Room:", font=("Arial", 12)).pack()
-        room_combobox = ttk.Combobox(self.root, values=[room.room_number for room in occupied_rooms], font=("Arial", 12))
-        room_combobox.pack(pady=5)
-        room_combobox.set(occupied_rooms[0].room_number)
-        tk.Label(self.root, text="Select Service:", font=("Arial", 12)).pack()
-        # Combine services from all providers for the admin
-        all_services = []
-        for provider in self.controller.admin.service_providers.values():
-            all_services.extend([item.name for item in provider.items])
-        service_combobox = ttk.Combobox(self.root, values=all_services, font=("Arial", 12))
-        service_combobox.pack(pady=5)
-        service_combobox.set(all_services[0] if all_services else "")
-        tk.Button(self.root, text="Request Service", 
-                 command=lambda: self.request_service_action(room_combobox.get(), service_combobox.get()), 
-                 font=("Arial", 12)).pack(pady=10)
-        tk.Button(self.root, text="Back", command=self.show_main_menu, font=("Arial", 12)).pack()
+        def build(frame):
+            tk.Label(frame, text="Request Service", font=("Arial", 14)).pack(pady=10)
+            tk.Button(frame, text="Back", command=self.show_main_menu, font=("Arial", 12)).pack(pady=10, side=tk.BOTTOM)
+            self.no_occupied_label = tk.Label(frame, text="No occupied rooms available.", font=("Arial", 12))
+            self.request_service_panel = tk.Frame(frame)
+            tk.Label(self.request_service_panel, text="Select Room:", font=("Arial", 12)).pack()
+            self.request_room_combobox = ttk.Combobox(self.request_service_panel, font=("Arial", 12))
+            self.request_room_combobox.pack(pady=5)
+            tk.Label(self.request_service_panel, text="Select Service:", font=("Arial", 12)).pack()
+            self.request_service_combobox = ttk.Combobox(self.request_service_panel, font=("Arial", 12))
+            self.request_service_combobox.pack(pady=5)
+            tk.Button(self.request_service_panel, text="Request Service",
+                     command=lambda: self.request_service_action(self.request_room_combobox.get(), self.request_service_combobox.get()),
+                     font=("Arial", 12)).pack(pady=10)
+
+        def refresh():
+            occupied_rooms = self.view_models.get("occupied_rooms", lambda snapshot: [
+                view.room_number for view in snapshot.rooms() if view.occupant_id
+            ])
+            # Combine services from all providers for the admin
+            all_services = self.view_models.get("service_names", lambda snapshot: list(snapshot.service_names))
+            self.fill_combobox(self.request_room_combobox, occupied_rooms)
+            self.fill_combobox(self.request_service_combobox, all_services)
+            self.show_either(self.request_service_panel, self.no_occupied_label, bool(occupied_rooms))
+        self.show_screen("request_service", build, refresh)
 
     def request_service_action(self, room_number, service_name):
-        success, message = self.controller.request_service(room_number, service_name)
-        if success:
-            messagebox.showinfo("Success", message)
-        else:
-            messagebox.showerror("Error", message)
+        self.run_action(self.controller.request_service, room_number, service_name)
 
     def show_pending_requests(self):
-        self.clear_window()
-        tk.Label(self.root, text="Pending Service Requests", font=("Arial", 14)).pack(pady=10)
-        pending_services = self.controller.get_pending_services()
-        if not pending_services:
-            tk.Label(self.root, text="No pending service requests.", font=("Arial", 12)).pack()
-            tk.Button(self.root, text="Back", command=self.show_main_menu, font=("Arial", 12)).pack(pady=10)
+        def build(frame):
+            tk.Label(frame, text="Pending Service Requests", font=("Arial", 14)).pack(pady=10)
+            self.pending_status_label = tk.Label(frame, text="Loading...", font=("Arial", 12))
+            self.pending_status_label.pack()
+
+            self.pending_view = VirtualTreeview(frame, ["room", "service", "claimed_by"],
+                                                ["Room", "Service", "Claimed By"], height=12)
+            self.pending_view.pack(pady=5, fill=tk.BOTH, expand=True)
+            self.pending_view.bind("<Double-1>", self.select_service_line)
+
+            # Add optional completion details text box
+            tk.Label(frame, text="Completion Details (Optional):", font=("Arial", 12)).pack(pady=5)
+            self.completion_details_entry = tk.Text(frame, height=3, width=50, font=("Arial", 10))
+            self.completion_details_entry.pack(pady=5)
+
+            tk.Button(frame, text=f"Claim Next {self.CLAIM_BATCH}", command=self.claim_services_action,
+                      font=("Arial", 12)).pack(pady=5)
+            tk.Button(frame, text="Mark Selected as Completed",
+                    command=self.complete_service_action,
+                    font=("Arial", 12)).pack(pady=5)
+            tk.Button(frame, text="Back", command=self.show_main_menu, font=("Arial", 12)).pack()
+
+        def refresh():
+            self.reload_pending_requests()
+            self.start_refresh("service", self.apply_service_changes, self.reload_pending_requests)
+        self.show_screen("pending_requests", build, refresh)
+
+    def reload_pending_requests(self):
+        def done(result):
+            self.feed_seq, rows = result
+            self.pending_view.set_rows([(request_id, (room_number, service_name, self.claim_label(holder)))
+                                        for request_id, room_number, service_name, holder in rows])
+            self.update_pending_status()
+        self.executor.submit(self.load_with_seq, self.controller.get_pending_service_rows, on_done=done)
+
+    def apply_service_changes(self, events):
+        provider_name = "Hotel" if self.controller.current_user_role == "service_provider_a" else "RoomSupport"
+        for _, _, request_id, action, data in events:
+            if action == "added" and data.get("provider_name") == provider_name:
+                self.pending_view.upsert(request_id, (data["room_number"], data["name"], ""), render=False)
+            elif action in ("claimed", "released"):
+                values = self.pending_view.values(request_id)
+                if values is not None:
+                    self.pending_view.upsert(request_id, values[:2] + (self.claim_label(data["holder"]),),
+                                             render=False)
+            elif action == "removed":
+                self.pending_view.remove(request_id, render=False)
+        self.pending_view.render()
+        self.update_pending_status()
+
+    def claim_label(self, holder):
+        if not holder:
+            return ""
+        return "You" if holder == self.controller.worker_id else "Another worker"
+
+    def claim_services_action(self):
+        def done(rows):
+            if not rows:
+                messagebox.showinfo("Claim", "No unclaimed requests are waiting.")
+                return
+            for request_id, room_number, service_name in rows:
+                self.pending_view.upsert(request_id, (room_number, service_name, "You"), render=False)
+            self.pending_view.render()
+        self.executor.submit(self.controller.claim_services, self.CLAIM_BATCH, on_done=done)
+
+    def update_pending_status(self):
+        count = len(self.pending_view)
+        self.pending_status_label.config(text=f"{count} pending request(s)" if count else "No pending service requests.")
+
+    def show_housekeeping_queue(self):
+        def build(frame):
+            tk.Label(frame, text="Housekeeping Queue", font=("Arial", 14)).pack(pady=10)
+            tk.Label(frame, text="Attendant:", font=("Arial", 12)).pack()
+            self.attendant_combobox = ttk.Combobox(frame, font=("Arial", 12), state="readonly")
+            self.attendant_combobox.pack(pady=5)
+            self.attendant_combobox.bind("<<ComboboxSelected>>", lambda e: self.reload_housekeeping_queue())
+            self.housekeeping_view = VirtualTreeview(frame, ["room", "task", "next_arrival"],
+                                                     ["Room", "Task", "Next Arrival"], height=12)
+            self.housekeeping_view.pack(pady=5, fill=tk.BOTH, expand=True)
+            tk.Button(frame, text="Mark Selected as Done", command=self.complete_housekeeping_action,
+                      font=("Arial", 12)).pack(pady=5)
+            tk.Button(frame, text="Back", command=self.show_main_menu, font=("Arial", 12)).pack()
+
+        def refresh():
+            def staff_loaded(staff):
+                self.fill_combobox(self.attendant_combobox, staff)
+                self.reload_housekeeping_queue()
+            self.executor.submit(self.controller.get_housekeeping_staff, on_done=staff_loaded)
+            # Assignments can move between attendants, so any change reloads the selected queue
+            self.start_refresh("housekeeping", lambda events: self.reload_housekeeping_queue(),
+                               self.reload_housekeeping_queue)
+        self.show_screen("housekeeping_queue", build, refresh)
+
+    def reload_housekeeping_queue(self):
+        attendant = self.attendant_combobox.get()
+
+        def done(result):
+            if self.attendant_combobox.get() != attendant:
+                return
+            self.feed_seq, rows = result
+            self.housekeeping_view.set_rows([(task_id, (room_number, kind, arrival))
+                                             for task_id, room_number, kind, arrival in rows])
+        self.executor.submit(self.load_with_seq, self.controller.get_housekeeping_queue, attendant, on_done=done)
+
+    def complete_housekeeping_action(self):
+        task_id = self.housekeeping_view.selected_key
+        if task_id is None or self.housekeeping_view.values(task_id) is None:
+            messagebox.showerror("Error", "Please select a task.")
+            return
+        self.run_action(self.controller.complete_housekeeping_task, task_id,
+                        on_success=self.reload_housekeeping_queue)
+
+    def complete_selected_service(self, completion_details=None):
+        request_id = self.pending_view.selected_key
+        if self.pending_view.values(request_id) is None:
+            messagebox.showerror("Error", "The selected request is no longer pending.")
             return
+        room_number, service_name, _ = self.pending_view.values(request_id)
 
-        frame = tk.Frame(self.root)
-        frame.pack(pady=5, fill=tk.BOTH, expand=True)
-        scrollbar = tk.Scrollbar(frame)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.service_text_area = tk.Text(frame, height=10, width=50, font=("Arial", 10), yscrollcommand=scrollbar.set)
-        self.service_text_area.pack(pady=5, fill=tk.BOTH, expand=True)
-        scrollbar.config(command=self.service_text_area.yview)
-
-        self.service_lines = []
-        for idx, (room_number, service_name) in enumerate(pending_services, 1):
-            line_text = f"Room: {room_number} | Service: {service_name}\n"
-            self.service_text_area.insert(tk.END, line_text)
-            self.service_lines.append((room_number, service_name))
-
-        self.service_text_area.config(state=tk.NORMAL)
-        self.service_text_area.bind("<Double-1>", self.select_service_line)
-
-        # Add optional completion details text box
-        tk.Label(self.root, text="Completion Details (Optional):", font=("Arial", 12)).pack(pady=5)
-        self.completion_details_entry = tk.Text(self.root, height=3, width=50, font=("Arial", 10))
-        self.completion_details_entry.pack(pady=5)
-
-        tk.Button(self.root, text="Mark Selected as Completed", 
-                command=self.complete_service_action, 
-                font=("Arial", 12)).pack(pady=5)
-        tk.Button(self.root, text="Back", command=self.show_main_menu, font=("Arial", 12)).pack()
+        def completed():
+            self.pending_view.remove(request_id)
+            self.update_pending_status()
+        self.run_action(self.controller.complete_service, room_number, service_name, completion_details, request_id,
+                        on_success=completed)
 
     def complete_service_action(self):
-        if self.selected_service_line is None:
-            messagebox.showerror("Error", "Please double-click a request to select it.")
+        if self.pending_view.selected_key is None:
+            messagebox.showerror("Error", "Please select a request first.")
             return
 
-        room_number, service_name = self.service_lines[self.selected_service_line]
         # Get the completion details from the text box
         completion_details = self.completion_details_entry.get("1.0", tk.END).strip()
         if not completion_details:
             completion_details = None  # Treat empty input as None
-
-        success, message = self.controller.complete_service(room_number, service_name, completion_details)
-        if success:
-            messagebox.showinfo("Success", message)
-            self.selected_service_line = None
-            self.show_pending_requests()
-        else:
-            messagebox.showerror("Error", message)
+        self.complete_selected_service(completion_details)
 
     def select_service_line(self, event):
-        index = self.service_text_area.index("@%d,%d" % (event.x, event.y))
-        line_number = int(index.split('.')[0])
-        if 1 <= line_number <= len(self.service_lines):
-            self.selected_service_line = line_number - 1
-            self.service_text_area.tag_remove("highlight", "1.0", tk.END)
-            self.service_text_area.tag_add("highlight", f"{line_number}.0", f"{line_number}.end")
-            self.service_text_area.tag_configure("highlight", background="yellow")
-        room_number, service_name = self.service_lines[self.selected_service_line]
-        success, message = self.controller.complete_service(room_number, service_name)
-        if success:
-            messagebox.showinfo("Success", message)
-            self.selected_service_line = None
-            self.show_pending_requests()
-        else:
-            messagebox.showerror("Error", message)
+        iid = self.pending_view.tree.identify_row(event.y)
+        if not iid:
+            return
+        self.pending_view.tree.selection_set(iid)
+        self.pending_view.selected_key = int(iid)
+        self.complete_selected_service()
 
     def show_generate_service_record(self):
-        self.clear_window()
-        tk.Label(self.root, text="Generate Service Record", font=("Arial", 14)).pack(pady=10)
-        customers = [c for c in self.controller.admin.customers if c.stay and c.stay.is_active]
-        if not customers:
-            tk.Label(self.root, text="No checked-in customers available.", font=("Arial", 12)).pack()
-            tk.Button(self.root, text="Back", command=self.show_main_menu, font=("Arial", 12)).pack(pady=10)
-            return
-        self.service_record_customer_combobox = ttk.Combobox(self.root, values=[
-            f"{c.customer_id} - {c.name}" for c in customers
-        ], font=("Arial", 12))
-        self.service_record_customer_combobox.pack(pady=5)
-        self.service_record_customer_combobox.set([
-            f"{c.customer_id} - {c.name}" for c in customers
-        ][0] if customers else "")
-        tk.Button(self.root, text="Generate Report", command=self.generate_service_record_action, font=("Arial", 12)).pack(pady=10)
-        tk.Button(self.root, text="Back", command=self.show_main_menu, font=("Arial", 12)).pack()
+        def build(frame):
+            tk.Label(frame, text="Generate Service Record", font=("Arial", 14)).pack(pady=10)
+            tk.Button(frame, text="Back", command=self.show_main_menu, font=("Arial", 12)).pack(pady=10, side=tk.BOTTOM)
+            self.no_service_record_label = tk.Label(frame, text="No checked-in customers available.", font=("Arial", 12))
+            self.service_record_panel = tk.Frame(frame)
+            self.service_record_customer_combobox = ttk.Combobox(self.service_record_panel, font=("Arial", 12))
+            self.service_record_customer_combobox.pack(pady=5)
+            tk.Button(self.service_record_panel, text="Generate Report", command=self.generate_service_record_action, font=("Arial", 12)).pack(pady=10)
+
+        def refresh():
+            choices = self.checked_in_choices()
+            self.fill_combobox(self.service_record_customer_combobox, choices)
+            self.show_either(self.service_record_panel, self.no_service_record_label, bool(choices))
+        self.show_screen("service_record", build, refresh)
 
     def generate_service_record_action(self):
         selected_customer = self.service_record_customer_combobox.get()
@@ -386,67 +572,128 @@ class HotelManagementGUI:
             messagebox.showerror("Error", "Please select a customer.")
             return
         customer_id = selected_customer.split(" - ")[0]
-        report = self.controller.generate_customer_service_record(customer_id)
-        messagebox.showinfo("Service Record", report)
+        self.executor.submit(self.controller.generate_customer_service_record, customer_id,
+                             on_done=lambda report: messagebox.showinfo("Service Record", report),
+                             label="Generating report...", read_only=True)
 
     def show_room_occupancy(self):
-        self.clear_window()
-        tk.Label(self.root, text="Room Occupancy Details", font=("Arial", 14)).pack(pady=10)
+        def build(frame):
+            tk.Label(frame, text="Room Occupancy Details", font=("Arial", 14)).pack(pady=10)
+            tk.Button(frame, text="Back", command=self.show_main_menu, font=("Arial", 12)).pack(pady=10, side=tk.BOTTOM)
 
-        frame = tk.Frame(self.root)
-        frame.pack(pady=5, fill=tk.BOTH, expand=True)
+            text_frame = tk.Frame(frame)
+            text_frame.pack(pady=5, fill=tk.BOTH, expand=True)
 
-        scrollbar = tk.Scrollbar(frame)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+            scrollbar = tk.Scrollbar(text_frame)
+            scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
-        occupancy_text = tk.Text(frame, height=20, width=70, font=("Courier New", 10), 
-                                yscrollcommand=scrollbar.set, wrap=tk.WORD)
-        occupancy_text.pack(pady=5, fill=tk.BOTH, expand=True)
+            self.occupancy_text = tk.Text(text_frame, height=20, width=70, font=("Courier New", 10),
+                                          yscrollcommand=scrollbar.set, wrap=tk.WORD)
+            self.occupancy_text.pack(pady=5, fill=tk.BOTH, expand=True)
 
-        scrollbar.config(command=occupancy_text.yview)
+            scrollbar.config(command=self.occupancy_text.yview)
+            self.occupancy_version = None
 
-        occupancy_details = self.controller.get_room_occupancy_details()
-        occupancy_text.insert(tk.END, occupancy_details)
+        def show_details(result):
+            version, occupancy_details = result
+            self.occupancy_version = version
+            self.occupancy_text.config(state=tk.NORMAL)
+            self.occupancy_text.delete("1.0", tk.END)
+            self.occupancy_text.insert(tk.END, occupancy_details)
+            self.occupancy_text.config(state=tk.DISABLED)
 
-        occupancy_text.config(state=tk.DISABLED)
+        def refresh():
+            if self.occupancy_version == self.controller.admin.snapshot().version:
+                return
+            self.executor.submit(self.controller.get_versioned_occupancy_details,
+                                 on_done=show_details, label="Loading room occupancy...", read_only=True)
+        self.show_screen("room_occupancy", build, refresh)
+
+    def show_find_guest(self):
+        def build(frame):
+            tk.Label(frame, text="Find Guest", font=("Arial", 14)).pack(pady=10)
+            tk.Label(frame, text="Name or Customer ID:", font=("Arial", 12)).pack()
+            self.guest_query_entry = tk.Entry(frame, font=("Arial", 12))
+            self.guest_query_entry.pack(pady=5)
+            self.guest_query_entry.bind("<KeyRelease>", lambda e: self.search_guests_action())
+            self.guest_results = VirtualTreeview(frame, ["customer_id", "name", "status"],
+                                                 ["Customer ID", "Name", "Status"], height=12)
+            self.guest_results.pack(pady=5, fill=tk.BOTH, expand=True)
+            tk.Button(frame, text="Back", command=self.show_main_menu, font=("Arial", 12)).pack(pady=10)
+
+        def refresh():
+            self.guest_query_entry.delete(0, tk.END)
+            self.guest_results.set_rows([])
+            self.guest_query_entry.focus_set()
+        self.show_screen("find_guest", build, refresh)
+
+    def search_guests_action(self):
+        query = self.guest_query_entry.get().strip()
+        if not query:
+            self.guest_results.set_rows([])
+            return
 
-        tk.Button(self.root, text="Back", command=self.show_main_menu, font=("Arial", 12)).pack(pady=10)
+        def done(results):
+            # Keystrokes queue searches; only the one matching the current text is shown
+            if self.guest_query_entry.get().strip() == query:
+                self.guest_results.set_rows([(row[0], row) for row in results])
+        self.executor.submit(self.controller.search_guests, query, on_done=done, label="Searching guests...")
 
     def show_manage_cards_menu(self):
-        self.clear_window()
-        tk.Label(self.root, text="Manage Cards by Room", font=("Arial", 14)).pack(pady=10)
-        tk.Label(self.root, text="Select Room:", font=("Arial", 12)).pack()
-        room_numbers = [r.room_number for r in self.controller.admin.rooms]
-        if not room_numbers:
-            tk.Label(self.root, text="No rooms available.", font=("Arial", 12)).pack()
-            tk.Button(self.root, text="Back", command=self.show_main_menu, font=("Arial", 12)).pack(pady=10)
-            return
-        self.manage_cards_room_combobox = ttk.Combobox(self.root, values=room_numbers, font=("Arial", 12), state="readonly")
-        self.manage_cards_room_combobox.pack(pady=5)
-        self.manage_cards_room_combobox.set(room_numbers[0] if room_numbers else "")
-        self.manage_cards_room_combobox.bind("<<ComboboxSelected>>", self.update_card_list)
-        self.card_list_label = tk.Label(self.root, text="Cards in Room:", font=("Arial", 12))
-        self.card_list_label.pack(pady=5)
-        self.card_list_scrollbar = tk.Scrollbar(self.root)
-        self.card_list_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.card_list = tk.Listbox(self.root, yscrollcommand=self.card_list_scrollbar.set, font=("Arial", 10))
-        self.card_list.pack(pady=5, fill=tk.BOTH, expand=True)
-        self.card_list_scrollbar.config(command=self.card_list.yview)
-        tk.Button(self.root, text="Add Card to Room", command=self.add_card_to_room_action, font=("Arial", 12)).pack(pady=5)
-        tk.Button(self.root, text="Delete Selected Card", command=self.delete_card_action, font=("Arial", 12)).pack(pady=5)
-        tk.Button(self.root, text="Activate Selected Card", command=self.activate_selected_card_action, font=("Arial", 12)).pack(pady=5)
-        tk.Button(self.root, text="Deactivate Selected Card", command=self.deactivate_selected_card_action, font=("Arial", 12)).pack(pady=5)
-        tk.Button(self.root, text="Back", command=self.show_main_menu, font=("Arial", 12)).pack(pady=10)
-        if room_numbers:
-            self.update_card_list(None)
+        def build(frame):
+            tk.Label(frame, text="Manage Cards by Room", font=("Arial", 14)).pack(pady=10)
+            tk.Label(frame, text="Select Room:", font=("Arial", 12)).pack()
+            self.manage_cards_room_combobox = ttk.Combobox(frame, font=("Arial", 12), state="readonly")
+            self.manage_cards_room_combobox.pack(pady=5)
+            self.manage_cards_room_combobox.bind("<<ComboboxSelected>>", self.update_card_list)
+            self.card_list_label = tk.Label(frame, text="Cards in Room:", font=("Arial", 12))
+            self.card_list_label.pack(pady=5)
+            self.card_list = VirtualTreeview(frame, ["card_id", "status"], ["Card ID", "Status"], height=8)
+            self.card_list.pack(pady=5, fill=tk.BOTH, expand=True)
+            tk.Button(frame, text="Add Card to Room", command=self.add_card_to_room_action, font=("Arial", 12)).pack(pady=5)
+            tk.Button(frame, text="Delete Selected Card", command=self.delete_card_action, font=("Arial", 12)).pack(pady=5)
+            tk.Button(frame, text="Activate Selected Card", command=self.activate_selected_card_action, font=("Arial", 12)).pack(pady=5)
+            tk.Button(frame, text="Deactivate Selected Card", command=self.deactivate_selected_card_action, font=("Arial", 12)).pack(pady=5)
+            tk.Button(frame, text="Back", command=self.show_main_menu, font=("Arial", 12)).pack(pady=10)
+
+        def refresh():
+            self.fill_combobox(self.manage_cards_room_combobox, self.room_numbers())
+            if self.manage_cards_room_combobox.get():
+                self.update_card_list(None)
+            self.start_refresh("card", self.apply_card_changes, self.update_card_list)
+        self.show_screen("manage_cards", build, refresh)
+
+    def run_card_action(self, func, args, success_message=None, failure_message=None):
+        def done(result):
+            if result:
+                self.update_card_list()
+                if success_message:
+                    messagebox.showinfo("Success", success_message)
+            else:
+                messagebox.showerror("Error", failure_message)
+        self.executor.submit(func, *args, on_done=done)
+
+    def card_row(self, card_id, is_active):
+        return card_id, (card_id, "Active" if is_active else "Inactive")
 
     def update_card_list(self, event=None):
         selected_room = self.manage_cards_room_combobox.get()
-        cards = self.controller.get_cards_for_room(selected_room)
-        self.card_list.delete(0, tk.END)
-        for card in cards:
-            status = "Active" if card.is_active else "Inactive"
-            self.card_list.insert(tk.END, f"ID: {card.card_id} ({status})")
+
+        def done(result):
+            if self.manage_cards_room_combobox.get() != selected_room:
+                return
+            self.feed_seq, cards = result
+            self.card_list.set_rows([self.card_row(card.card_id, card.is_active) for card in cards])
+        self.executor.submit(self.load_with_seq, self.controller.get_cards_for_room, selected_room, on_done=done)
+
+    def apply_card_changes(self, events):
+        selected_room = self.manage_cards_room_combobox.get()
+        for _, _, card_id, action, data in events:
+            if action == "removed":
+                self.card_list.remove(card_id, render=False)
+            elif data.get("room_number") == selected_room:
+                self.card_list.upsert(*self.card_row(card_id, data["is_active"]), render=False)
+        self.card_list.render()
 
     def add_card_to_room_action(self):
         selected_room = self.manage_cards_room_combobox.get()
@@ -455,52 +702,34 @@ class HotelManagementGUI:
             return
         new_card_id = simpledialog.askstring("Add Card", f"Enter ID for new card for Room {selected_room}:")
         if new_card_id:
-            new_card = self.controller.add_card_to_room(selected_room, new_card_id)
-            if new_card:
-                self.update_card_list()
-            else:
-                messagebox.showerror("Error", "Failed to add card.")
+            self.run_card_action(self.controller.add_card_to_room, (selected_room, new_card_id),
+                                 failure_message="Failed to add card.")
 
     def delete_card_action(self):
         selected_room = self.manage_cards_room_combobox.get()
-        selected_index = self.card_list.curselection()
-        if not selected_room or not selected_index:
+        card_id = self.card_list.selected_key
+        if not selected_room or card_id is None:
             messagebox.showerror("Error", "Please select a room and a card to delete.")
             return
-        card_info = self.card_list.get(selected_index[0])
-        card_id = card_info.split(" ")[1]
         if messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete Card {card_id} from Room {selected_room}?"):
-            if self.controller.delete_card(card_id):
-                self.update_card_list()
-                messagebox.showinfo("Success", f"Card {card_id} deleted.")
-            else:
-                messagebox.showerror("Error", f"Could not delete card {card_id}.")
+            self.run_card_action(self.controller.delete_card, (card_id,),
+                                 f"Card {card_id} deleted.", f"Could not delete card {card_id}.")
 
     def activate_selected_card_action(self):
-        selected_index = self.card_list.curselection()
-        if not selected_index:
+        card_id = self.card_list.selected_key
+        if card_id is None:
             messagebox.showerror("Error", "Please select a card to activate.")
             return
-        card_info = self.card_list.get(selected_index[0])
-        card_id = card_info.split(" ")[1]
-        if self.controller.activate_card(card_id):
-            self.update_card_list()
-            messagebox.showinfo("Success", f"Card {card_id} activated.")
-        else:
-            messagebox.showerror("Error", f"Could not activate card {card_id}.")
+        self.run_card_action(self.controller.activate_card, (card_id,),
+                             f"Card {card_id} activated.", f"Could not activate card {card_id}.")
 
     def deactivate_selected_card_action(self):
-        selected_index = self.card_list.curselection()
-        if not selected_index:
+        card_id = self.card_list.selected_key
+        if card_id is None:
             messagebox.showerror("Error", "Please select a card to deactivate.")
             return
-        card_info = self.card_list.get(selected_index[0])
-        card_id = card_info.split(" ")[1]
-        if self.controller.deactivate_card(card_id):
-            self.update_card_list()
-            messagebox.showinfo("Success", f"Card {card_id} deactivated.")
-        else:
-            messagebox.showerror("Error", f"Could not deactivate card {card_id}.")
+        self.run_card_action(self.controller.deactivate_card, (card_id,),
+                             f"Card {card_id} deactivated.", f"Could not deactivate card {card_id}.")
 
 def main():
     root = tk.Tk()
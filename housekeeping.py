@@ -0,0 +1,194 @@
+import heapq
+from datetime import datetime
+from typing import Dict, List, Optional
+
+class HousekeepingTask:
+    CHECKOUT_CLEAN = "Checkout Clean"
+    DAILY_SERVICE = "Daily Service"
+    # Lower runs first: turnover cleans gate the next arrival, guest requests beat routine service
+    PRIORITIES = {CHECKOUT_CLEAN: 0, DAILY_SERVICE: 2}
+    REQUEST_PRIORITY = 1
+
+    def __init__(self, task_id: int, room_number: str, floor: int, kind: str, created_at: datetime,
+                 deadline: Optional[datetime] = None, request_id: int = None):
+        self.task_id = task_id
+        self.room_number = room_number
+        self.floor = floor
+        self.kind = kind
+        self.created_at = created_at
+        self.deadline = deadline
+        self.request_id = request_id
+        self.assigned_to: Optional[str] = None
+        self.is_open = True
+
+    @property
+    def priority(self) -> int:
+        return self.PRIORITIES.get(self.kind, self.REQUEST_PRIORITY)
+
+    def sort_key(self) -> tuple:
+        # Priority class, then the next guest's arrival in the room, then when the task came in
+        deadline = self.deadline.timestamp() if self.deadline else float("inf")
+        return self.priority, deadline, self.created_at.timestamp(), self.task_id
+
+    def __str__(self):
+        return f"{self.kind} for Room {self.room_number}"
+
+    def to_dict(self):
+        return {
+            "task_id": self.task_id,
+            "room_number": self.room_number,
+            "floor": self.floor,
+            "kind": self.kind,
+            "created_at": self.created_at.isoformat(),
+            "deadline": self.deadline.isoformat() if self.deadline else None,
+            "request_id": self.request_id,
+            "assigned_to": self.assigned_to
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        task = cls(data["task_id"], data["room_number"], data["floor"], data["kind"],
+                   datetime.fromisoformat(data["created_at"]),
+                   datetime.fromisoformat(data["deadline"]) if data["deadline"] else None,
+                   data.get("request_id"))
+        task.assigned_to = data.get("assigned_to")
+        return task
+
+class HousekeepingScheduler:
+    # Extra queue length an attendant is charged per floor between their home floor and the room
+    FLOOR_DISTANCE_PENALTY = 3
+
+    def __init__(self):
+        self.tasks: Dict[int, HousekeepingTask] = {}
+        self.staff: Dict[str, int] = {}  # attendant name -> home floor
+        self.next_task_id = 1
+        # Unassigned tasks wait in one heap; each attendant has their own heap.
+        # Closed tasks are left in the heaps and skipped when they surface.
+        self._unassigned: List[tuple] = []
+        self._queues: Dict[str, List[tuple]] = {}
+        self._load: Dict[str, int] = {}
+        self._by_room: Dict[str, set] = {}
+        self._by_request: Dict[int, int] = {}
+
+    def add_staff(self, name: str, floor: int):
+        self.staff[name] = floor
+        self._queues.setdefault(name, [])
+        self._load.setdefault(name, 0)
+        self.dispatch()
+
+    def remove_staff(self, name: str):
+        # The attendant's open tasks go back into the shared heap for the others
+        self.staff.pop(name, None)
+        self._load.pop(name, None)
+        for entry in self._queues.pop(name, []):
+            task = self.tasks.get(entry[-1])
+            if task and task.is_open:
+                task.assigned_to = None
+                heapq.heappush(self._unassigned, entry)
+        self.dispatch()
+
+    def add_task(self, room_number: str, floor: int, kind: str, created_at: datetime,
+                 deadline: datetime = None, request_id: int = None) -> HousekeepingTask:
+        task = HousekeepingTask(self.next_task_id, room_number, floor, kind, created_at, deadline, request_id)
+        self.next_task_id += 1
+        self._track(task)
+        heapq.heappush(self._unassigned, task.sort_key())
+        self.dispatch()
+        return task
+
+    def _track(self, task: HousekeepingTask):
+        self.tasks[task.task_id] = task
+        self._by_room.setdefault(task.room_number, set()).add(task.task_id)
+        if task.request_id is not None:
+            self._by_request[task.request_id] = task.task_id
+
+    def open_tasks_for_room(self, room_number: str) -> List[HousekeepingTask]:
+        return [self.tasks[task_id] for task_id in self._by_room.get(room_number, ())]
+
+    def task_for_request(self, request_id: int) -> Optional[HousekeepingTask]:
+        task_id = self._by_request.get(request_id)
+        return self.tasks.get(task_id) if task_id is not None else None
+
+    def _pick_attendant(self, task: HousekeepingTask) -> Optional[str]:
+        best, best_cost = None, None
+        for name, floor in self.staff.items():
+            cost = self._load[name] + self.FLOOR_DISTANCE_PENALTY * abs(floor - task.floor)
+            if best_cost is None or cost < best_cost:
+                best, best_cost = name, cost
+        return best
+
+    def dispatch(self) -> int:
+        # Hands out waiting tasks most urgent first; each goes to the attendant with
+        # the lightest queue, counting distance from their home floor as extra load
+        assigned = 0
+        while self._unassigned and self.staff:
+            entry = heapq.heappop(self._unassigned)
+            task = self.tasks.get(entry[-1])
+            if not task or not task.is_open:
+                continue
+            name = self._pick_attendant(task)
+            task.assigned_to = name
+            heapq.heappush(self._queues[name], entry)
+            self._load[name] += 1
+            assigned += 1
+        return assigned
+
+    def close(self, task_id: int) -> Optional[HousekeepingTask]:
+        task = self.tasks.pop(task_id, None)
+        if not task:
+            return None
+        task.is_open = False
+        self._by_room.get(task.room_number, set()).discard(task_id)
+        if task.request_id is not None:
+            self._by_request.pop(task.request_id, None)
+        if task.assigned_to in self._load:
+            self._load[task.assigned_to] -= 1
+        return task
+
+    def _is_closed(self, entry: tuple) -> bool:
+        task = self.tasks.get(entry[-1])
+        return task is None or not task.is_open
+
+    def queue_for(self, name: str) -> List[HousekeepingTask]:
+        queue = self._queues.get(name, [])
+        # Drop closed entries from the top so the heap does not accumulate them
+        while queue and self._is_closed(queue[0]):
+            heapq.heappop(queue)
+        return [self.tasks[entry[-1]] for entry in sorted(queue) if not self._is_closed(entry)]
+
+    def next_task(self, name: str) -> Optional[HousekeepingTask]:
+        queue = self.queue_for(name)
+        return queue[0] if queue else None
+
+    def unassigned(self) -> List[HousekeepingTask]:
+        return [self.tasks[entry[-1]] for entry in sorted(self._unassigned) if not self._is_closed(entry)]
+
+    def to_dict(self):
+        return {
+            "next_task_id": self.next_task_id,
+            "staff": dict(self.staff),
+            "tasks": [task.to_dict() for task in self.tasks.values()]
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        scheduler = cls()
+        scheduler.next_task_id = data.get("next_task_id", 1)
+        for name, floor in data.get("staff", {}).items():
+            scheduler.staff[name] = floor
+            scheduler._queues[name] = []
+            scheduler._load[name] = 0
+        for task_data in data.get("tasks", []):
+            task = HousekeepingTask.from_dict(task_data)
+            scheduler._track(task)
+            if task.assigned_to in scheduler.staff:
+                scheduler._queues[task.assigned_to].append(task.sort_key())
+                scheduler._load[task.assigned_to] += 1
+            else:
+                task.assigned_to = None
+                scheduler._unassigned.append(task.sort_key())
+        for queue in scheduler._queues.values():
+            heapq.heapify(queue)
+        heapq.heapify(scheduler._unassigned)
+        scheduler.dispatch()
+        return scheduler
@@ -1,23 +1,45 @@
-class ItemService:
+from datetime import datetime
+from typing import Optional
+
+from tracking import Tracked
+
+class ItemService(Tracked):
     def __init__(self, name: str, price: float, provider_name: str = None):
         self.name = name
         self.price = price
         self.completed = False
         self.provider_name = provider_name  # Track which provider offers this service
+        self.request_id: int = None  # Set when the item is a requested (pending or completed) service
+        self.requested_at: Optional[datetime] = None
+        self.completed_at: Optional[datetime] = None
 
-    def mark_completed(self):
+    def mark_completed(self, when: datetime = None):
         self.completed = True
+        self.completed_at = when or datetime.now()
+
+    def wait_seconds(self) -> Optional[float]:
+        if self.requested_at and self.completed_at:
+            return (self.completed_at - self.requested_at).total_seconds()
+        return None
 
     def to_dict(self):
         return {
             "name": self.name,
             "price": self.price,
             "completed": self.completed,
-            "provider_name": self.provider_name
+            "provider_name": self.provider_name,
+            "request_id": self.request_id,
+            "requested_at": self.requested_at.isoformat() if self.requested_at else None,
+            "completed_at": self.completed_at.isoformat() if self.completed_at else None
         }
 
     @classmethod
     def from_dict(cls, data):
         item = cls(data["name"], data["price"], data.get("provider_name"))
         item.completed = data["completed"]
+        item.request_id = data.get("request_id")
+        if data.get("requested_at"):
+            item.requested_at = datetime.fromisoformat(data["requested_at"])
+        if data.get("completed_at"):
+            item.completed_at = datetime.fromisoformat(data["completed_at"])
         return item
\ No newline at end of file
@@ -0,0 +1,126 @@
+from collections.abc import MutableSequence
+
+class LazyList(MutableSequence):
+    def __init__(self, items=None, deferred=None, build=None, on_load=None):
+        # `items` are live objects; `deferred` are raw dicts that are only turned
+        # into objects (via `build`) the first time the full sequence is needed.
+        self._items = list(items or [])
+        self._split = len(self._items)
+        self._deferred = list(deferred) if deferred else None
+        self._build = build
+        self._on_load = on_load
+        # Removed items are tombstoned (keyed by id, holding the object so the id
+        # cannot be reused) and swept out once they are a large share of the list
+        # or the full sequence is next needed.
+        self._dead = {}
+
+    @property
+    def loaded(self) -> bool:
+        return self._deferred is None
+
+    def loaded_items(self) -> list:
+        self._compact()
+        return self._items
+
+    def _compact(self):
+        if self._dead:
+            dead, self._dead = self._dead, {}
+            self._split -= sum(1 for item in self._items[:self._split] if id(item) in dead)
+            self._items = [item for item in self._items if id(item) not in dead]
+
+    def load(self) -> list:
+        self._compact()
+        if self._deferred is not None:
+            deferred, self._deferred = self._deferred, None
+            built = [self._build(data) for data in deferred]
+            self._items[self._split:self._split] = built
+            if self._on_load:
+                self._on_load(built)
+        return self._items
+
+    def deferred_matching(self, predicate) -> list:
+        # Raw dicts still deferred that satisfy `predicate`, left unbuilt
+        return [data for data in self._deferred if predicate(data)] if self._deferred else []
+
+    def load_matching(self, predicate) -> list:
+        # Builds only the deferred dicts that satisfy `predicate`; the rest stay deferred
+        if not self._deferred:
+            return []
+        matching, rest = [], []
+        for data in self._deferred:
+            (matching if predicate(data) else rest).append(data)
+        if not matching:
+            return []
+        self._compact()
+        self._deferred = rest
+        built = [self._build(data) for data in matching]
+        # Kept just ahead of the deferred block, so to_dicts keeps its order for everything else
+        self._items[self._split:self._split] = built
+        self._split += len(built)
+        if self._on_load:
+            self._on_load(built)
+        return built
+
+    def remove_items(self, items, raw_predicate=None):
+        # Drops the given objects (all must be present) without scanning the list.
+        # Deferred raw dicts are only filtered, unbuilt, when `raw_predicate` is given.
+        if self._deferred is not None and raw_predicate is not None:
+            self._deferred = [data for data in self._deferred if not raw_predicate(data)]
+        for item in items:
+            self._dead[id(item)] = item
+        if len(self._dead) * 2 > len(self._items):
+            self._compact()
+
+    def to_dicts(self, serialize) -> list:
+        # Deferred entries go back out as they came in, without being built
+        self._compact()
+        if self._deferred is None:
+            return [serialize(item) for item in self._items]
+        return ([serialize(item) for item in self._items[:self._split]] + self._deferred
+                + [serialize(item) for item in self._items[self._split:]])
+
+    def iter_entries(self):
+        # Live objects and still-deferred raw dicts in to_dicts order, without building anything
+        self._compact()
+        if self._deferred is None:
+            yield from self._items
+            return
+        yield from self._items[:self._split]
+        yield from self._deferred
+        yield from self._items[self._split:]
+
+    def iter_dicts(self, serialize):
+        # Same order as to_dicts, one entry at a time, for streaming exports
+        for entry in self.iter_entries():
+            yield entry if isinstance(entry, dict) else serialize(entry)
+
+    def __len__(self):
+        return len(self._items) - len(self._dead) + (len(self._deferred) if self._deferred else 0)
+
+    def __getitem__(self, index):
+        return self.load()[index]
+
+    def __setitem__(self, index, value):
+        self.load()[index] = value
+
+    def __delitem__(self, index):
+        del self.load()[index]
+
+    def __iter__(self):
+        return iter(self.load())
+
+    def __contains__(self, value):
+        return value in self.load()
+
+    def insert(self, index, value):
+        self.load().insert(index, value)
+
+    def append(self, value):
+        self._items.append(value)
+
+    def extend(self, values):
+        self._items.extend(values)
+
+    def __repr__(self):
+        state = "loaded" if self.loaded else f"{len(self._deferred)} deferred"
+        return f"LazyList({len(self._items)} items, {state})"
@@ -0,0 +1,96 @@
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from typing import Dict, List
+
+def audit_partition(rooms: List['RoomView']) -> dict:
+    # Runs in a worker process: folios and consistency checks for one slice of rooms
+    folios, issues, card_rooms = [], [], {}
+    for view in rooms:
+        active_cards = [card.card_id for card in view.cards if card.is_active]
+        for card in view.cards:
+            card_rooms.setdefault(card.card_id, []).append(view.room_number)
+        service_cents = sum(round(price * 100) for _, price in view.services)
+        folios.append({"room_number": view.room_number, "customer_id": view.occupant_id,
+                       "services": len(view.services), "service_charges": service_cents / 100,
+                       "pending_services": len(view.pending)})
+        if view.occupant_id:
+            if view.overdue:
+                issues.append((view.room_number, f"Stay for {view.occupant_id} is past its end date."))
+            elif not active_cards:
+                issues.append((view.room_number, f"Active stay for {view.occupant_id} has no active card."))
+        else:
+            if view.pending:
+                issues.append((view.room_number, f"{len(view.pending)} pending service(s) in a vacant room."))
+            if active_cards:
+                issues.append((view.room_number, f"Active card(s) {', '.join(active_cards)} in a vacant room."))
+    return {"folios": folios, "issues": issues, "card_rooms": card_rooms,
+            "occupied": sum(1 for view in rooms if view.occupant_id),
+            "service_cents": sum(round(folio["service_charges"] * 100) for folio in folios)}
+
+class NightAudit:
+    # Works from a committed snapshot, so the audit never holds up front-desk
+    # writes however long the partitions take.
+    PARTITION_ROOMS = 250
+
+    def __init__(self, directory: str, workers: int = None):
+        self.directory = directory
+        self.workers = workers or os.cpu_count() or 1
+
+    def partitions(self, snapshot: 'AdminSnapshot') -> List[list]:
+        # Contiguous runs of the room order, so a floor usually stays within one partition
+        rooms = snapshot.rooms()
+        return [rooms[i:i + self.PARTITION_ROOMS] for i in range(0, len(rooms), self.PARTITION_ROOMS)]
+
+    def run(self, snapshot: 'AdminSnapshot', business_date: date = None) -> dict:
+        business_date = business_date or date.today()
+        partitions = self.partitions(snapshot)
+        if self.workers > 1 and len(partitions) > 1:
+            # spawn rather than fork: the GUI and scheduler threads may be mid-write when the audit starts
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(partitions)),
+                                     mp_context=multiprocessing.get_context("spawn")) as pool:
+                results = list(pool.map(audit_partition, partitions))
+        else:
+            results = [audit_partition(partition) for partition in partitions]
+        report = self.merge(results, snapshot, business_date)
+        self.write(report)
+        return report
+
+    @staticmethod
+    def merge(results: List[dict], snapshot: 'AdminSnapshot', business_date: date) -> dict:
+        card_rooms: Dict[str, list] = {}
+        issues = []
+        for result in results:
+            issues.extend(result["issues"])
+            for card_id, rooms in result["card_rooms"].items():
+                card_rooms.setdefault(card_id, []).extend(rooms)
+        # Only visible once the partitions are combined: the same card issued in several rooms
+        for card_id, rooms in card_rooms.items():
+            if len(rooms) > 1:
+                issues.extend((room_number, f"Card {card_id} is also issued for another room.") for room_number in rooms)
+        issues.sort()
+        rooms_total = len(snapshot.room_order)
+        occupied = sum(result["occupied"] for result in results)
+        return {
+            "business_date": business_date.isoformat(),
+            "audited_at": datetime.now().isoformat(),
+            "snapshot_version": snapshot.version,
+            "rooms": rooms_total,
+            "occupied": occupied,
+            "occupancy_rate": round(occupied / rooms_total, 4) if rooms_total else 0.0,
+            "service_charges": sum(result["service_cents"] for result in results) / 100,
+            "issues": [{"room_number": room_number, "issue": text} for room_number, text in issues],
+            "folios": [folio for result in results for folio in result["folios"]]
+        }
+
+    def path_for(self, business_date: str) -> str:
+        return os.path.join(self.directory, f"{business_date}.json")
+
+    def write(self, report: dict):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path_for(report["business_date"])
+        with open(path + ".tmp", 'w') as f:
+            json.dump(report, f, indent=4)
+        os.replace(path + ".tmp", path)
@@ -0,0 +1,102 @@
+from array import array
+from datetime import date, timedelta
+from itertools import accumulate
+from typing import Dict, List, Optional
+
+class RateEngine:
+    # Nightly rates are laid out once per room type as a per-date table with a
+    # running total, so any stay is priced from two lookups instead of a loop
+    # over its nights. Tables are rebuilt whenever the rate setup changes.
+    TABLE_DAYS = 730
+
+    def __init__(self):
+        self.base_rates: Dict[str, float] = {}
+        self.weekday_modifiers: List[float] = [1.0] * 7  # Monday first
+        self.seasons: List[tuple] = []  # (first day, last day inclusive, multiplier)
+        self.length_discounts: List[tuple] = []  # (minimum nights, fraction off), largest minimum first
+        self._table_start: Optional[date] = None
+        self._cumulative: Dict[str, array] = {}
+
+    def set_base_rate(self, room_type: str, rate: float):
+        self.base_rates[room_type] = rate
+        self._invalidate()
+
+    def set_weekday_modifier(self, weekday: int, multiplier: float):
+        self.weekday_modifiers[weekday] = multiplier
+        self._invalidate()
+
+    def add_season(self, first_day: date, last_day: date, multiplier: float):
+        self.seasons.append((first_day, last_day, multiplier))
+        self._invalidate()
+
+    def set_length_discount(self, min_nights: int, fraction: float):
+        self.length_discounts = sorted([entry for entry in self.length_discounts if entry[0] != min_nights]
+                                       + [(min_nights, fraction)], reverse=True)
+
+    def _invalidate(self):
+        self._table_start = None
+        self._cumulative = {}
+
+    def nightly_rate(self, room_type: str, night: date) -> float:
+        rate = self.base_rates.get(room_type, 0.0) * self.weekday_modifiers[night.weekday()]
+        for first_day, last_day, multiplier in self.seasons:
+            if first_day <= night <= last_day:
+                rate *= multiplier
+        return rate
+
+    def _build(self, start: date):
+        # Modifiers are applied as whole-table passes: weekday pattern, then each season's slice
+        self._table_start = start
+        weekday = [self.weekday_modifiers[(start + timedelta(days=n)).weekday()] for n in range(self.TABLE_DAYS)]
+        for first_day, last_day, multiplier in self.seasons:
+            lo = max(0, (first_day - start).days)
+            hi = min(self.TABLE_DAYS, (last_day - start).days + 1)
+            weekday[lo:hi] = [value * multiplier for value in weekday[lo:hi]]
+        self._cumulative = {room_type: array('d', accumulate([base * value for value in weekday], initial=0.0))
+                            for room_type, base in self.base_rates.items()}
+
+    def _covers(self, start: date, nights: int) -> bool:
+        if self._table_start is None:
+            return False
+        offset = (start - self._table_start).days
+        return offset >= 0 and offset + nights <= self.TABLE_DAYS
+
+    def length_discount(self, nights: int) -> float:
+        return next((fraction for min_nights, fraction in self.length_discounts if nights >= min_nights), 0.0)
+
+    def quote(self, room_type: str, start: date, nights: int) -> float:
+        if nights <= 0:
+            return 0.0
+        if not self._covers(start, nights):
+            # Tables start at the earliest date asked for, so quotes for today onwards share one build
+            self._build(min(start, date.today()))
+        if self._covers(start, nights) and room_type in self._cumulative:
+            table = self._cumulative[room_type]
+            offset = (start - self._table_start).days
+            total = table[offset + nights] - table[offset]
+        else:
+            total = sum(self.nightly_rate(room_type, start + timedelta(days=n)) for n in range(nights))
+        return round(total * (1 - self.length_discount(nights)), 2)
+
+    def quote_rooms(self, rooms: List['Room'], start: date, nights: int) -> Dict[str, float]:
+        # One quote per room type, shared by every room of that type
+        by_type = {room_type: self.quote(room_type, start, nights) for room_type in {room.room_type for room in rooms}}
+        return {room.room_number: by_type[room.room_type] for room in rooms}
+
+    def to_dict(self):
+        return {
+            "base_rates": dict(self.base_rates),
+            "weekday_modifiers": list(self.weekday_modifiers),
+            "seasons": [[first.isoformat(), last.isoformat(), multiplier] for first, last, multiplier in self.seasons],
+            "length_discounts": [list(entry) for entry in self.length_discounts]
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        engine = cls()
+        engine.base_rates = dict(data.get("base_rates", {}))
+        engine.weekday_modifiers = list(data.get("weekday_modifiers", [1.0] * 7))
+        engine.seasons = [(date.fromisoformat(first), date.fromisoformat(last), multiplier)
+                          for first, last, multiplier in data.get("seasons", [])]
+        engine.length_discounts = sorted((tuple(entry) for entry in data.get("length_discounts", [])), reverse=True)
+        return engine
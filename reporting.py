@@ -0,0 +1,179 @@
+import csv
+import json
+import os
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+from typing import Dict, List
+
+class KpiReports:
+    # Daily KPIs are built from raw sums (rooms sold, revenue in cents, wait
+    # seconds) so that months and other ranges are exact re-aggregations of days.
+    SUM_FIELDS = ("rooms_available", "rooms_sold", "room_revenue_cents", "service_revenue_cents",
+                  "services_completed", "wait_seconds", "timed_services")
+
+    def __init__(self, admin: 'Admin', cache_path: str):
+        self.admin = admin
+        self.cache_path = cache_path
+        self._days: Dict[date, dict] = {}
+        self._loaded = False
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        if os.path.exists(self.cache_path):
+            with open(self.cache_path, 'r') as f:
+                for line in f:
+                    day = json.loads(line)
+                    self._days[date.fromisoformat(day["date"])] = day
+
+    def _settled_before(self, today: date) -> date:
+        # A day is final once it has passed and no stay still in the house began on or before it;
+        # later check-outs would otherwise add room revenue to it
+        active_starts = [(stay.checked_in_at or stay.start_date).date()
+                         for stay in self.admin.reservations.values() if stay.is_active]
+        return min([today] + active_starts)
+
+    def daily(self, start: date, end: date, today: date = None) -> List[dict]:
+        # One row per day, start <= day < end; settled days come from the cache, the rest are recomputed together
+        self._load()
+        today = today or date.today()
+        settled = self._settled_before(today)
+        missing = [start + timedelta(days=n) for n in range((end - start).days)
+                   if start + timedelta(days=n) not in self._days or start + timedelta(days=n) >= settled]
+        for day in missing:
+            # A cached day can reopen when a back-dated stay is checked in; it is cached again once settled
+            self._days.pop(day, None)
+        if missing:
+            computed = self._compute(missing[0], missing[-1] + timedelta(days=1), today)
+            new_days = [computed[day] for day in missing if day < settled]
+            for row in new_days:
+                self._days[date.fromisoformat(row["date"])] = row
+            if new_days:
+                os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+                with open(self.cache_path, 'a') as f:
+                    for row in new_days:
+                        f.write(json.dumps(row) + "\n")
+        else:
+            computed = {}
+        rows = []
+        for n in range((end - start).days):
+            day = start + timedelta(days=n)
+            rows.append(self._with_rates(computed.get(day) or self._days[day]))
+        return rows
+
+    def monthly(self, start: date, end: date, today: date = None) -> List[dict]:
+        months: Dict[str, List[dict]] = {}
+        for row in self.daily(start, end, today):
+            months.setdefault(row["date"][:7], []).append(row)
+        return [self.combine(rows, month) for month, rows in months.items()]
+
+    def month_to_date(self, today: date = None) -> dict:
+        today = today or date.today()
+        first = today.replace(day=1)
+        return self.combine(self.daily(first, today + timedelta(days=1), today), first.strftime("%Y-%m"))
+
+    def combine(self, rows: List[dict], label: str) -> dict:
+        total = {"date": label}
+        for field in self.SUM_FIELDS:
+            total[field] = sum(row[field] for row in rows)
+        for field in ("service_revenue_by_provider", "service_revenue_by_item"):
+            merged: Dict[str, int] = {}
+            for row in rows:
+                for name, cents in row[field].items():
+                    merged[name] = merged.get(name, 0) + cents
+            total[field] = merged
+        return self._with_rates(total)
+
+    @staticmethod
+    def _with_rates(row: dict) -> dict:
+        row = dict(row)
+        sold, available = row["rooms_sold"], row["rooms_available"]
+        row["occupancy_rate"] = round(sold / available, 4) if available else 0.0
+        row["adr"] = round(row["room_revenue_cents"] / sold / 100, 2) if sold else 0.0
+        row["revpar"] = round(row["room_revenue_cents"] / available / 100, 2) if available else 0.0
+        row["service_revenue"] = row["service_revenue_cents"] / 100
+        row["avg_turnaround_minutes"] = (round(row["wait_seconds"] / row["timed_services"] / 60, 1)
+                                         if row["timed_services"] else None)
+        return row
+
+    def _stays(self, start: date, today: date):
+        # (first night, nights, room revenue in cents) for checked-out and in-house stays; nights
+        # run from the actual check-in, as they are charged, with the booked start for older stays
+        window_start = datetime.combine(start, datetime.min.time())
+        for record in self.admin.archive.records_between(window_start, datetime.now()):
+            stay = record.get("stay")
+            if not stay or not stay.get("end_date"):
+                continue
+            first = datetime.fromisoformat(stay.get("checked_in_at") or stay["start_date"]).date()
+            nights = max(1, (datetime.fromisoformat(stay["end_date"]).date() - first).days)
+            yield first, nights, round(stay.get("room_charges", 0) * 100)
+        for stay in self.admin.reservations.values():
+            if stay.is_active:
+                first = (stay.checked_in_at or stay.start_date).date()
+                booked_end = stay.start_date.date() + timedelta(days=stay.length)
+                yield first, max(1, (booked_end - first).days, (today - first).days + 1), 0
+
+    def _compute(self, start: date, end: date, today: date) -> Dict[date, dict]:
+        span = (end - start).days
+        # Stays are laid onto the range as difference arrays, then prefix-summed into per-night totals
+        sold_delta = [0] * (span + 1)
+        revenue_delta = [0.0] * (span + 1)
+        for first, nights, cents in self._stays(start, today):
+            lo = max(0, (first - start).days)
+            hi = min(span, (first - start).days + nights)
+            if lo >= hi:
+                continue
+            sold_delta[lo] += 1
+            sold_delta[hi] -= 1
+            revenue_delta[lo] += cents / nights
+            revenue_delta[hi] -= cents / nights
+        sold = list(accumulate(sold_delta))
+        revenue = list(accumulate(revenue_delta))
+        by_provider = self.admin.ledger.daily_totals(start, end, "provider")
+        by_item = self.admin.ledger.daily_totals(start, end, "item")
+        # Each room counts from the day it was added; rooms from before that was recorded count on every day
+        available_delta = [0] * (span + 1)
+        for room in self.admin.rooms:
+            available_delta[min(span, max(0, (room.opened_on - start).days)) if room.opened_on else 0] += 1
+        rooms_available = list(accumulate(available_delta))
+        days = {}
+        for n in range(span):
+            day = start + timedelta(days=n)
+            days[day] = {"date": day.isoformat(), "rooms_available": rooms_available[n], "rooms_sold": sold[n],
+                         "room_revenue_cents": round(revenue[n]), "service_revenue_cents": 0,
+                         "services_completed": 0, "wait_seconds": 0, "timed_services": 0,
+                         "service_revenue_by_provider": {}, "service_revenue_by_item": {}}
+        for (day, provider), (count, cents, wait, timed) in by_provider.items():
+            row = days[day]
+            row["service_revenue_cents"] += cents
+            row["services_completed"] += count
+            row["wait_seconds"] += wait
+            row["timed_services"] += timed
+            row["service_revenue_by_provider"][provider] = cents
+        for (day, item), totals in by_item.items():
+            days[day]["service_revenue_by_item"][item] = totals[1]
+        return days
+
+    @staticmethod
+    def _flatten(row: dict) -> dict:
+        flat = {}
+        for key, value in row.items():
+            if isinstance(value, dict):
+                for name, cents in value.items():
+                    flat[f"{key}[{name}]"] = cents / 100
+            else:
+                flat[key] = value
+        return flat
+
+    def export_csv(self, rows: List[dict], path: str):
+        flat = [self._flatten(row) for row in rows]
+        columns = list(dict.fromkeys(key for row in flat for key in row))
+        with open(path, 'w', newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=columns)
+            writer.writeheader()
+            writer.writerows(flat)
+
+    def export_json(self, rows: List[dict], path: str):
+        with open(path, 'w') as f:
+            json.dump(rows, f, indent=4)
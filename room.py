@@ -1,12 +1,62 @@
-class Room:
-    def __init__(self, room_number: str):
+from datetime import date
+from typing import Optional
+
+from tracking import Tracked
+
+class Room(Tracked):
+    def __init__(self, room_number: str, room_type: str = "standard", floor: int = None, capacity: int = 2,
+                 features: list = None):
         self.room_number = room_number
-        self.service_record: list['ItemService'] = []
-        self.pending_services: list['ItemService'] = []
+        self.room_type = room_type
+        self._floor = floor
+        self.capacity = capacity
+        self.features: list[str] = sorted(set(features or ()))
+        # First day the room counted as available; unknown for rooms saved before it was recorded
+        self.opened_on: Optional[date] = None
+        self._service_record: list['ItemService'] = []
+        self._pending_services: list['ItemService'] = []
+        # Raw dicts from the data file, turned into ItemService objects on first access
+        self._raw_service_record = None
+        self._raw_pending_services = None
+
+    @property
+    def service_record(self) -> list['ItemService']:
+        if self._raw_service_record is not None:
+            from item_service import ItemService
+            self._service_record = [ItemService.from_dict(item) for item in self._raw_service_record]
+            self._raw_service_record = None
+        return self._service_record
+
+    @service_record.setter
+    def service_record(self, items: list['ItemService']):
+        self._raw_service_record = None
+        self._service_record = items
+
+    @property
+    def pending_services(self) -> list['ItemService']:
+        if self._raw_pending_services is not None:
+            from item_service import ItemService
+            self._pending_services = [ItemService.from_dict(item) for item in self._raw_pending_services]
+            self._raw_pending_services = None
+        return self._pending_services
+
+    @pending_services.setter
+    def pending_services(self, items: list['ItemService']):
+        self._raw_pending_services = None
+        self._pending_services = items
+
+    @property
+    def floor(self) -> int:
+        if self._floor is not None:
+            return self._floor
+        # Rooms without a configured floor take it from the hundreds of their number
+        digits = "".join(ch for ch in self.room_number if ch.isdigit())
+        return int(digits) // 100 if digits else 0
 
     def add_service(self, item: 'ItemService'):
         if item not in self.service_record:
             self.service_record.append(item)
+            self.touch()
 
     def get_service_charges(self) -> float:
         return sum(item.price for item in self.service_record)
@@ -22,14 +72,23 @@ class Room:
     def to_dict(self):
         return {
             "room_number": self.room_number,
-            "service_record": [item.to_dict() for item in self.service_record],
-            "pending_services": [item.to_dict() for item in self.pending_services]
+            "room_type": self.room_type,
+            "floor": self._floor,
+            "capacity": self.capacity,
+            "features": list(self.features),
+            "opened_on": self.opened_on.isoformat() if self.opened_on else None,
+            "service_record": (self._raw_service_record if self._raw_service_record is not None
+                               else [item.to_dict() for item in self._service_record]),
+            "pending_services": (self._raw_pending_services if self._raw_pending_services is not None
+                                 else [item.to_dict() for item in self._pending_services])
         }
 
     @classmethod
     def from_dict(cls, data):
-        room = cls(data["room_number"])
-        from item_service import ItemService
-        room.service_record = [ItemService.from_dict(item) for item in data["service_record"]]
-        room.pending_services = [ItemService.from_dict(item) for item in data["pending_services"]]
+        room = cls(data["room_number"], data.get("room_type", "standard"), data.get("floor"),
+                   data.get("capacity", 2), data.get("features"))
+        if data.get("opened_on"):
+            room.opened_on = date.fromisoformat(data["opened_on"])
+        room._raw_service_record = data["service_record"] or None
+        room._raw_pending_services = data["pending_services"] or None
         return room
\ No newline at end of file
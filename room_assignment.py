@@ -0,0 +1,140 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+class StayRequest:
+    def __init__(self, customer_name: str, customer_id: str, start_date: datetime, nights: int,
+                 group: str = None, same_floor: bool = False, adjacent: bool = False, floor: int = None):
+        self.customer_name = customer_name
+        self.customer_id = customer_id
+        self.start_date = start_date
+        self.nights = nights
+        self.group = group
+        self.same_floor = same_floor or adjacent
+        self.adjacent = adjacent
+        self.floor = floor
+
+    def __str__(self):
+        return f"Stay request for {self.customer_name} from {self.start_date:%Y-%m-%d} for {self.nights} nights"
+
+class RoomAssigner:
+    EDGE_PENALTY = 7
+
+    def __init__(self, admin: 'Admin'):
+        self.admin = admin
+        self.availability = admin.availability
+        self.floors: Dict[int, List['Room']] = {}
+        for room in sorted(admin.rooms, key=lambda r: (r.floor, r.room_number.zfill(8))):
+            self.floors.setdefault(room.floor, []).append(room)
+
+    def assign(self, requests: List[StayRequest]) -> List[tuple]:
+        # Groups first (they are the hardest to place), then singles; each in
+        # arrival order, longest stays first, so tight gaps get filled early.
+        # A customer asked for more than once gets no room for any of the
+        # requests: one reservation each, and there is no telling which was meant.
+        seen, duplicates = set(), set()
+        for request in requests:
+            (duplicates if request.customer_id in seen else seen).add(request.customer_id)
+        groups: Dict[str, List[StayRequest]] = {}
+        singles = []
+        for request in requests:
+            if request.customer_id in self.admin.reservations or request.customer_id in duplicates:
+                continue
+            if request.group:
+                groups.setdefault(request.group, []).append(request)
+            else:
+                singles.append(request)
+
+        assigned: Dict[str, 'Room'] = {}
+        for members in sorted(groups.values(), key=lambda g: (min(r.start_date for r in g), -len(g))):
+            rooms = self._assign_group(members)
+            for request, room in zip(members, rooms or []):
+                assigned[request.customer_id] = room
+                self._book(request, room)
+        for request in sorted(singles, key=lambda r: (r.start_date, -r.nights)):
+            room = self._best_room(request, self._candidate_rooms(request))
+            if room:
+                assigned[request.customer_id] = room
+                self._book(request, room)
+        return [(request, None if request.customer_id in duplicates else assigned.get(request.customer_id))
+                for request in requests]
+
+    def _book(self, request: StayRequest, room: 'Room'):
+        self.availability.book(request.customer_id, room.room_number, request.start_date, request.nights)
+
+    def _score(self, request: StayRequest, room: 'Room') -> Optional[int]:
+        return self.availability.fit_score(room.room_number, request.start_date, request.nights, self.EDGE_PENALTY)
+
+    def _candidate_rooms(self, request: StayRequest) -> List['Room']:
+        if request.floor is not None:
+            return self.floors.get(request.floor, [])
+        return [room for rooms in self.floors.values() for room in rooms]
+
+    def _best_room(self, request: StayRequest, rooms: List['Room']) -> Optional['Room']:
+        best_room, best_score = None, None
+        for room in rooms:
+            score = self._score(request, room)
+            if score is None:
+                continue
+            if best_score is None or score < best_score:
+                best_room, best_score = room, score
+                if score == 0:
+                    break
+        return best_room
+
+    def _assign_group(self, members: List[StayRequest]) -> Optional[List['Room']]:
+        needs_floor = any(r.same_floor for r in members)
+        needs_adjacent = any(r.adjacent for r in members)
+        if not needs_floor:
+            rooms = []
+            for request in members:
+                room = self._best_room(request, [r for r in self._candidate_rooms(request) if r not in rooms])
+                if not room:
+                    return None
+                rooms.append(room)
+            return rooms
+
+        floors = [members[0].floor] if members[0].floor is not None else list(self.floors)
+        best_rooms, best_score = None, None
+        for floor in floors:
+            rooms = self.floors.get(floor, [])
+            if needs_adjacent:
+                choice = self._best_adjacent_run(members, rooms)
+            else:
+                choice = self._best_on_floor(members, rooms)
+            if choice and (best_score is None or choice[1] < best_score):
+                best_rooms, best_score = choice
+        return best_rooms
+
+    def _best_on_floor(self, members: List[StayRequest], rooms: List['Room']) -> Optional[tuple]:
+        chosen, total = [], 0
+        for request in members:
+            room, score = None, None
+            for candidate in rooms:
+                if candidate in chosen:
+                    continue
+                candidate_score = self._score(request, candidate)
+                if candidate_score is not None and (score is None or candidate_score < score):
+                    room, score = candidate, candidate_score
+            if not room:
+                return None
+            chosen.append(room)
+            total += score
+        return chosen, total
+
+    def _best_adjacent_run(self, members: List[StayRequest], rooms: List['Room']) -> Optional[tuple]:
+        # Sliding window over the floor's rooms in number order; a run is usable
+        # only if every member fits the room at the same position.
+        size = len(members)
+        best = None
+        for first in range(len(rooms) - size + 1):
+            window = rooms[first:first + size]
+            total = 0
+            for request, room in zip(members, window):
+                score = self._score(request, room)
+                if score is None:
+                    break
+                total += score
+            else:
+                if best is None or total < best[1]:
+                    best = (window, total)
+        return best
@@ -0,0 +1,111 @@
+import json
+from typing import Dict, Iterable, List, Optional
+
+from room import Room
+
+def _span(value) -> range:
+    # "3-5", [3, 5] or 3, inclusive at both ends
+    if isinstance(value, str):
+        first, _, last = value.partition("-")
+        return range(int(first), int(last or first) + 1)
+    if isinstance(value, (list, tuple)):
+        return range(value[0], value[-1] + 1)
+    return range(value, value + 1)
+
+def generate_rooms(config: dict) -> List[Room]:
+    # Each block numbers its rooms floor by floor, e.g. floors "3-5" x numbers "1-20" gives 301..320, 401..420, ...;
+    # entries under "rooms" are added after the blocks and replace generated rooms with the same number
+    rooms: Dict[str, Room] = {}
+    for block in config.get("blocks", []):
+        width = block.get("number_width", 2)
+        for floor in _span(block["floors"]):
+            for number in _span(block["numbers"]):
+                room_number = f"{floor}{number:0{width}d}"
+                rooms[room_number] = Room(room_number, block.get("room_type", "standard"), floor,
+                                          block.get("capacity", 2), block.get("features"))
+    for entry in config.get("rooms", []):
+        rooms[entry["room_number"]] = Room(entry["room_number"], entry.get("room_type", "standard"),
+                                           entry.get("floor"), entry.get("capacity", 2), entry.get("features"))
+    return list(rooms.values())
+
+def load_inventory(path: str) -> List[Room]:
+    with open(path, 'r') as f:
+        return generate_rooms(json.load(f))
+
+class RoomInventoryIndex:
+    # Every room owns one bit; each attribute value and live status is an int
+    # bitmap over those bits, so a search is a few ANDs however many rooms match.
+    STATUSES = ("vacant", "occupied", "clean", "dirty")
+
+    def __init__(self):
+        self._bits: Dict[str, int] = {}
+        self._room_numbers: List[str] = []
+        self.all = 0
+        self.by_type: Dict[str, int] = {}
+        self.by_floor: Dict[int, int] = {}
+        self.by_capacity: Dict[int, int] = {}
+        self.by_feature: Dict[str, int] = {}
+        self.occupied = 0
+        self.dirty = 0
+
+    def __len__(self):
+        return len(self._room_numbers)
+
+    def add(self, room: Room):
+        if room.room_number in self._bits:
+            return
+        bit = 1 << len(self._room_numbers)
+        self._bits[room.room_number] = bit
+        self._room_numbers.append(room.room_number)
+        self.all |= bit
+        self.by_type[room.room_type] = self.by_type.get(room.room_type, 0) | bit
+        self.by_floor[room.floor] = self.by_floor.get(room.floor, 0) | bit
+        self.by_capacity[room.capacity] = self.by_capacity.get(room.capacity, 0) | bit
+        for feature in room.features:
+            self.by_feature[feature] = self.by_feature.get(feature, 0) | bit
+
+    def set_occupied(self, room_number: str, occupied: bool):
+        bit = self._bits.get(room_number, 0)
+        self.occupied = self.occupied | bit if occupied else self.occupied & ~bit
+
+    def set_dirty(self, room_number: str, dirty: bool):
+        bit = self._bits.get(room_number, 0)
+        self.dirty = self.dirty | bit if dirty else self.dirty & ~bit
+
+    @staticmethod
+    def _union(bitmaps: Dict, keys: Iterable) -> int:
+        mask = 0
+        for key in keys:
+            mask |= bitmaps.get(key, 0)
+        return mask
+
+    def match(self, room_type: str = None, floors: Iterable[int] = None, features: Iterable[str] = (),
+              min_capacity: int = None, status: Iterable[str] = ()) -> int:
+        mask = self.all
+        if room_type is not None:
+            mask &= self.by_type.get(room_type, 0)
+        if floors is not None:
+            mask &= self._union(self.by_floor, floors)
+        for feature in features:
+            mask &= self.by_feature.get(feature, 0)
+        if min_capacity is not None:
+            mask &= self._union(self.by_capacity, [c for c in self.by_capacity if c >= min_capacity])
+        for state in status:
+            if state not in self.STATUSES:
+                raise ValueError(f"Unknown room status {state!r}")
+            mask &= {"vacant": ~self.occupied, "occupied": self.occupied,
+                     "clean": ~self.dirty, "dirty": self.dirty}[state]
+        return mask
+
+    def room_numbers(self, mask: int) -> List[str]:
+        # Set bits read off the binary string, lowest bit (first room added) first
+        return [self._room_numbers[i] for i, digit in enumerate(reversed(bin(mask)[2:])) if digit == "1"]
+
+    def count(self, mask: int) -> int:
+        return mask.bit_count()
+
+    def status_of(self, room_number: str) -> Optional[tuple]:
+        bit = self._bits.get(room_number)
+        if bit is None:
+            return None
+        return ("occupied" if self.occupied & bit else "vacant", "dirty" if self.dirty & bit else "clean")
@@ -0,0 +1,135 @@
+import math
+import time
+from typing import Callable, Dict, Hashable, List
+
+class Timer:
+    __slots__ = ("key", "due_tick", "callback", "cancelled", "level")
+
+    def __init__(self, key: Hashable, due_tick: int, callback: Callable):
+        self.key = key
+        self.due_tick = due_tick
+        self.callback = callback
+        self.cancelled = False
+        self.level = None  # wheel level counted in _counts, None while ready or in overflow
+
+class TimerWheel:
+    def __init__(self, clock: Callable[[], float] = time.time, tick_seconds: int = 60,
+                 slots: int = 64, levels: int = 4):
+        # Hierarchical wheel: level n slots each span slots**n ticks. A timer is
+        # placed once, cascades down at most `levels` times and fires from level 0,
+        # so scheduling, cancelling and expiring are O(1) whatever the timer count.
+        self.clock = clock
+        self.tick_seconds = tick_seconds
+        self.slots = slots
+        self.levels = levels
+        self.current_tick = int(clock() // tick_seconds)
+        self._wheels = [[[] for _ in range(slots)] for _ in range(levels)]
+        self._counts = [0] * levels
+        self._overflow: List[Timer] = []
+        self._ready: List[Timer] = []
+        self._timers: Dict[Hashable, Timer] = {}
+
+    def __len__(self):
+        return len(self._timers)
+
+    def __contains__(self, key: Hashable):
+        return key in self._timers
+
+    def schedule(self, key: Hashable, due: float, callback: Callable) -> Timer:
+        # Rescheduling a key replaces its previous timer; callback(key) runs once the clock passes `due`
+        self.cancel(key)
+        timer = Timer(key, math.ceil(due / self.tick_seconds), callback)
+        self._timers[key] = timer
+        self._place(timer)
+        return timer
+
+    def cancel(self, key: Hashable) -> bool:
+        timer = self._timers.pop(key, None)
+        if timer is None:
+            return False
+        timer.cancelled = True
+        if timer.level is not None:
+            # Counted out now so _next_busy_tick can skip levels left holding only cancelled timers
+            self._counts[timer.level] -= 1
+            timer.level = None
+        return True
+
+    def _place(self, timer: Timer):
+        timer.level = None
+        delta = timer.due_tick - self.current_tick
+        if delta <= 0:
+            self._ready.append(timer)
+            return
+        span = 1
+        for level, wheel in enumerate(self._wheels):
+            if delta < span * self.slots:
+                wheel[(timer.due_tick // span) % self.slots].append(timer)
+                timer.level = level
+                self._counts[level] += 1
+                return
+            span *= self.slots
+        self._overflow.append(timer)
+
+    def _cascade(self, tick: int):
+        span = self.slots
+        for level in range(1, self.levels):
+            if tick % span:
+                return
+            for timer in self._take(level, (tick // span) % self.slots):
+                if not timer.cancelled:
+                    self._place(timer)
+            span *= self.slots
+        if tick % span == 0 and self._overflow:
+            overflow, self._overflow = self._overflow, []
+            for timer in overflow:
+                if not timer.cancelled:
+                    self._place(timer)
+
+    def _take(self, level: int, slot: int) -> List[Timer]:
+        # Empties a slot; cancelled timers in it were already counted out by cancel
+        bucket, self._wheels[level][slot] = self._wheels[level][slot], []
+        for timer in bucket:
+            if timer.level is not None:
+                self._counts[level] -= 1
+                timer.level = None
+        return bucket
+
+    def _fire_ready(self) -> int:
+        fired = 0
+        while self._ready:
+            ready, self._ready = self._ready, []
+            for timer in ready:
+                if timer.cancelled:
+                    continue
+                del self._timers[timer.key]
+                timer.cancelled = True
+                timer.callback(timer.key)
+                fired += 1
+        return fired
+
+    def _next_busy_tick(self, target: int) -> int:
+        # Ticks before the next cascade of the lowest non-empty level cannot fire
+        # anything, so they are skipped rather than stepped through one by one
+        span = 1
+        for count in self._counts:
+            if count:
+                break
+            span *= self.slots
+        if span == 1:
+            return self.current_tick + 1
+        return min(target, (self.current_tick // span + 1) * span)
+
+    def advance(self, now: float = None) -> int:
+        # Runs every timer due by `now` (default: the clock) and returns how many fired
+        now = self.clock() if now is None else now
+        target = int(now // self.tick_seconds)
+        fired = self._fire_ready()
+        while self.current_tick < target:
+            if not self._timers:
+                self.current_tick = target
+                break
+            self.current_tick = self._next_busy_tick(target)
+            self._cascade(self.current_tick)
+            self._ready.extend(self._take(0, self.current_tick % self.slots))
+            fired += self._fire_ready()
+        return fired
@@ -0,0 +1,344 @@
+import json
+import os
+import re
+import zlib
+from typing import Dict, List, Optional, Set
+
+from checkpoint import Checkpoint
+
+class SegmentStore:
+    # The data file split into segments: room-keyed state (rooms, their cards,
+    # stays and service lists) by floor, guests by a hash of their ID, and the
+    # small sections whole. The admin touches the (section, key) entries whose
+    # membership it changes; saved objects report their own changes. A capture
+    # copies only the segments holding a touched entry, under a new generation's
+    # file names; writing one fsyncs those files and then swaps the manifest, so
+    # a crash leaves either the old set of files in force or the new one.
+    MANIFEST = "manifest.json"
+    FORMAT = 1
+    CUSTOMER_BUCKETS = 128
+    KEEP_GENERATIONS = 3
+    LIST_SECTIONS = {"rooms": "room_number", "customers": "customer_id", "cards": "card_id"}
+    WHOLE_SECTIONS = ("service_providers", "housekeeping")
+    SERVICE_SECTIONS = ("room_services", "room_pending_services")
+    SCALARS = ("name", "next_request_id", "next_customer_number", "rates")
+    HISTORY_NAME = re.compile(r"manifest\.(\d+)\.json")
+
+    def __init__(self, directory: str, keep_generations: int = None):
+        self.directory = directory
+        self.keep_generations = self.KEEP_GENERATIONS if keep_generations is None else keep_generations
+        self.generation = 0
+        self._files: Dict[str, Dict[str, str]] = {}  # section -> segment -> file
+        self._members: Dict[str, Dict[str, dict]] = {}  # section -> segment -> {key: live object or raw dict}
+        self._key_segment: Dict[str, Dict[str, str]] = {}
+        self._whole_text: Dict[str, str] = {}
+        self._scalars: Optional[dict] = None
+        self._touched: Dict[tuple, None] = {}  # (section, key), in the order they were touched
+        self._dirty: Set[tuple] = set()  # (section, segment) to write
+        self._changed: List['Tracked'] = []
+        self._history: List[tuple] = []  # (generation, files it references) on disk, oldest first
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    @staticmethod
+    def _history_name(generation: int) -> str:
+        return f"manifest.{generation}.json"
+
+    def _history_generations(self) -> List[int]:
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(int(match.group(1)) for match in map(self.HISTORY_NAME.fullmatch, os.listdir(self.directory))
+                      if match)
+
+    def exists(self) -> bool:
+        return os.path.exists(self._path(self.MANIFEST)) or bool(self._history_generations())
+
+    # Reading
+
+    def _read_manifest(self, name: str) -> Optional[dict]:
+        # None unless the manifest parses and every file it names is present
+        try:
+            with open(self._path(name), 'r') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if all(os.path.exists(self._path(file)) for files in manifest["segments"].values() for file in files.values()):
+            return manifest
+        return None
+
+    def load(self, sections) -> dict:
+        # Data in the single-file layout; sections not asked for come back empty
+        manifest = self._read_manifest(self.MANIFEST)
+        generations = self._history_generations()
+        for generation in reversed(generations):
+            if manifest is not None:
+                break
+            manifest = self._read_manifest(self._history_name(generation))
+            if manifest is not None:
+                print(f"Data manifest could not be read; restored generation {generation}.")
+        if manifest is None:
+            raise FileNotFoundError(f"No readable data manifest in {self.directory}")
+        self.generation = manifest["generation"]
+        self._files = manifest["segments"]
+        self._scalars = {key: manifest[key] for key in self.SCALARS if key in manifest}
+        data = dict(self._scalars)
+        for section, files in self._files.items():
+            merged = [] if section in self.LIST_SECTIONS else {}
+            if section in sections:
+                for segment in sorted(files):
+                    with open(self._path(files[segment]), 'r') as f:
+                        text = f.read()
+                    self._read_segment(section, segment, text)
+                    if section in self.WHOLE_SECTIONS:
+                        merged = json.loads(text)
+                    elif section in self.LIST_SECTIONS:
+                        merged.extend(self._members[section][segment].values())
+                    else:
+                        merged.update(self._members[section][segment])
+            data[section] = merged
+        self._history = []
+        for generation in generations:
+            earlier = self._read_manifest(self._history_name(generation)) if generation < self.generation else None
+            if earlier is not None:
+                self._history.append((generation, self._referenced(earlier)))
+        self._history.append((self.generation, self._referenced(manifest)))
+        self._retire()
+        self._sweep()
+        return data
+
+    def _read_segment(self, section: str, segment: str, text: str):
+        if section in self.WHOLE_SECTIONS:
+            self._whole_text[section] = text
+            return
+        payload = json.loads(text)
+        if section in self.LIST_SECTIONS:
+            field = self.LIST_SECTIONS[section]
+            payload = {entry[field]: entry for entry in payload}
+        self._members.setdefault(section, {})[segment] = payload
+        keys = self._key_segment.setdefault(section, {})
+        for key in payload:
+            keys[key] = segment
+
+    @staticmethod
+    def _referenced(manifest: dict) -> Set[str]:
+        return {name for files in manifest["segments"].values() for name in files.values()}
+
+    def _sweep(self):
+        # Files from a write that died before its manifest swap, or from generations no longer kept
+        kept = {self.MANIFEST}
+        for generation, files in self._history:
+            kept.add(self._history_name(generation))
+            kept.update(files)
+        for name in os.listdir(self.directory):
+            if name not in kept:
+                self._remove(name)
+
+    def _retire(self):
+        # The generation in force and keep_generations before it stay on disk
+        while len(self._history) > self.keep_generations + 1:
+            generation, files = self._history.pop(0)
+            for name in files.difference(*(later for _, later in self._history)):
+                self._remove(name)
+            self._remove(self._history_name(generation))
+
+    def _remove(self, name: str):
+        try:
+            os.remove(self._path(name))
+        except FileNotFoundError:
+            pass
+
+    def adopt_all(self, admin: 'Admin'):
+        # Once the admin is built, its objects stand in for the raw entries they were read from
+        for section, keys in self._key_segment.items():
+            for key in keys:
+                value = self._resolve(admin, section, key)
+                if value is not None:
+                    self.adopt(section, key, value)
+
+    def adopt(self, section: str, key: str, value):
+        segment = self._key_segment.get(section, {}).get(key)
+        if segment is not None:
+            self._members[section][segment][key] = value
+            self._place(section, key, value)
+
+    # Change tracking
+
+    def touch(self, section: str, key: str):
+        self._touched[(section, key)] = None
+
+    def changed(self, obj: 'Tracked'):
+        self._touched.update(dict.fromkeys(obj.__dict__.get("_saved_in", ())))
+        self._changed.append(obj)
+
+    def _place(self, section: str, key: str, value):
+        # Changes to the object, or to anything embedded in its saved form, now touch this entry
+        for obj in value if isinstance(value, list) else [value]:
+            if isinstance(obj, dict):
+                continue
+            state = obj.__dict__
+            state["_store"] = self
+            state["_dirty"] = False
+            state.setdefault("_saved_in", set()).add((section, key))
+            for name in obj.NESTED:
+                child = state.get(name)
+                if child is not None:
+                    self._place(section, key, child)
+
+    # Writing
+
+    @staticmethod
+    def _resolve(admin: 'Admin', section: str, key: str):
+        # The entry's current value, or None once it has left the admin
+        if section == "rooms":
+            return admin.find_room(key)
+        if section == "customers":
+            return admin._customer_index.get(key)
+        if section == "cards":
+            return admin._card_index.get(key)
+        return getattr(admin, section).get(key)
+
+    @staticmethod
+    def _floor_segment(floor: int) -> str:
+        return f"floor-{floor:04d}"
+
+    def _segment_of(self, admin: 'Admin', section: str, key: str, value) -> str:
+        if section == "rooms":
+            return self._floor_segment(value.floor)
+        if section == "customers":
+            return f"bucket-{zlib.crc32(key.encode()) % self.CUSTOMER_BUCKETS:03d}"
+        if section in ("cards", "reservations"):
+            return self._floor_segment(value.room.floor)
+        return self._room_segment(admin, key)
+
+    def _room_segment(self, admin: 'Admin', room_number: str) -> str:
+        room = admin.find_room(room_number)
+        return self._floor_segment(room.floor if room else 0)
+
+    def _touch_everything(self, admin: 'Admin'):
+        for section, field in self.LIST_SECTIONS.items():
+            self._members.setdefault(section, {})
+            entries = admin.rooms if section == "rooms" else getattr(admin, section).iter_entries()
+            for entry in entries:
+                if not isinstance(entry, dict):
+                    self.touch(section, getattr(entry, field))
+                    continue
+                # Deferred entries have no index to resolve them by, so they are filed straight from their raw dicts
+                key = entry[field]
+                segment = (self._room_segment(admin, entry["room"]["room_number"]) if section == "cards"
+                           else self._segment_of(admin, section, key, None))
+                self._members[section].setdefault(segment, {})[key] = entry
+                self._key_segment.setdefault(section, {})[key] = segment
+        for section in ("reservations",) + self.SERVICE_SECTIONS:
+            for key in getattr(admin, section):
+                self.touch(section, key)
+
+    @staticmethod
+    def _serialize(value):
+        if isinstance(value, dict):
+            return value
+        if isinstance(value, list):
+            return [item.to_dict() for item in value]
+        return value.to_dict()
+
+    def _write(self, name: str, text: str):
+        # Flushed through to the disk before anything can name the file
+        with open(self._path(name), 'w') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _sync_directory(self):
+        # Makes the manifest rename itself durable; directories cannot be opened this way on Windows
+        if hasattr(os, "O_DIRECTORY"):
+            fd = os.open(self.directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def capture(self, admin: 'Admin') -> Optional[Checkpoint]:
+        # Runs on the thread that mutates the admin, so the copies are consistent with each other.
+        # None when nothing changed since the last capture.
+        if self.generation == 0:
+            self._touch_everything(admin)
+        touched, self._touched = self._touched, {}
+        for section, key in touched:
+            keys = self._key_segment.setdefault(section, {})
+            old = keys.get(key)
+            value = self._resolve(admin, section, key)
+            segment = self._segment_of(admin, section, key, value) if value is not None else None
+            if old is not None and old != segment:
+                del self._members[section][old][key]
+                del keys[key]
+                self._dirty.add((section, old))
+            if segment is not None:
+                self._members.setdefault(section, {}).setdefault(segment, {})[key] = value
+                keys[key] = segment
+                self._dirty.add((section, segment))
+        if self.generation == 0:
+            self._dirty.update((section, segment) for section, segments in self._members.items()
+                               for segment in segments)
+        generation = self.generation + 1
+        files = {section: dict(self._files.get(section, {})) for section in admin.SECTIONS}
+        writes = {}
+        for section, segment in sorted(self._dirty):
+            members = self._members[section][segment]
+            files[section].pop(segment, None)
+            if not members:
+                continue
+            if section in self.LIST_SECTIONS:
+                payload = [self._serialize(value) for value in members.values()]
+            else:
+                payload = {key: self._serialize(value) for key, value in members.items()}
+            name = f"{section}.{segment}.{generation}.json"
+            writes[name] = payload
+            files[section][segment] = name
+        for section in self.WHOLE_SECTIONS:
+            value = getattr(admin, section)
+            text = json.dumps({name: entry.to_dict() for name, entry in value.items()}
+                              if section == "service_providers" else value.to_dict())
+            if "all" in files[section] and self._whole_text.get(section) == text:
+                continue
+            name = f"{section}.all.{generation}.json"
+            writes[name] = text
+            self._whole_text[section] = text
+            files[section]["all"] = name
+        scalars = {"name": admin.name, "next_request_id": admin.next_request_id,
+                   "next_customer_number": admin.next_customer_number, "rates": admin.rates.to_dict()}
+        for section, segment in self._dirty:
+            members = self._members[section][segment]
+            if not members:
+                del self._members[section][segment]
+            for key, value in members.items():
+                self._place(section, key, value)
+        self._dirty = set()
+        changed, self._changed = self._changed, []
+        for obj in changed:
+            obj.__dict__["_dirty"] = False
+        if files == self._files and scalars == self._scalars:
+            return None
+        self.generation = generation
+        self._files = files
+        self._scalars = scalars
+        return Checkpoint(generation, dict(scalars, format=self.FORMAT, generation=generation, segments=files), writes)
+
+    def write(self, checkpoint: Checkpoint) -> int:
+        # Runs on the checkpoint thread. Returns the number of segment files written; raises
+        # OSError with the previous generation still in force.
+        os.makedirs(self.directory, exist_ok=True)
+        manifest = checkpoint.manifest
+        referenced = self._referenced(manifest)
+        written = 0
+        for name, payload in checkpoint.writes.items():
+            if name in referenced:
+                self._write(name, payload if isinstance(payload, str) else json.dumps(payload))
+                written += 1
+        text = json.dumps(manifest)
+        self._write(self._history_name(checkpoint.generation), text)
+        self._write(self.MANIFEST + ".tmp", text)
+        os.replace(self._path(self.MANIFEST + ".tmp"), self._path(self.MANIFEST))
+        self._sync_directory()
+        self._history.append((checkpoint.generation, referenced))
+        self._retire()
+        return written
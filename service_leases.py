@@ -0,0 +1,243 @@
+import heapq
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+from scheduler import TimerWheel
+
+class ServiceLeaseBoard:
+    # With a directory, every lease is mirrored to a small file named after its
+    # request, so staff terminals running as separate processes on the same data
+    # see each other's claims. A lease file holds its worker and expiry. It is
+    # created exclusively, and an expired one is moved aside before it is
+    # replaced, so two processes never both hold a request. Finished requests
+    # leave a "done" file behind, so no other process picks them up again.
+    # Without a directory, leases are shared only by the workers of this process.
+    DONE_RETENTION_SECONDS = 86400
+    # A release in another process is not signalled here, so held requests are looked at again this often
+    RECHECK_SECONDS = 30
+
+    def __init__(self, clock=time.time, lease_seconds: int = 300, directory: str = None):
+        self.clock = clock
+        self.lease_seconds = lease_seconds
+        self.directory = directory
+        # Lease expiry runs on its own fine-grained wheel so claiming never fires
+        # unrelated hotel timers.
+        self._timers = TimerWheel(clock, tick_seconds=5)
+        self._queues: Dict[str, List[int]] = {}   # provider -> heap of unclaimed request ids
+        self._provider: Dict[int, str] = {}       # every pending request id -> provider
+        self._names: Dict[int, str] = {}          # request id -> lease file name, shared across processes
+        self._leases: Dict[int, tuple] = {}       # request id -> (worker, expires_at)
+        self._held: Dict[str, set] = {}           # worker -> request ids
+        self._lock = threading.Lock()
+        self.on_change = None
+        if directory and os.path.isdir(directory):
+            self._prune()
+
+    def add(self, provider_name: str, request_id: int, name: str = None):
+        # `name` identifies the request the same way in every process that loaded it
+        with self._lock:
+            self._provider[request_id] = provider_name
+            self._names[request_id] = name or str(request_id)
+            heapq.heappush(self._queues.setdefault(provider_name, []), request_id)
+
+    def discard(self, request_id: int):
+        # The request is finished or gone; its heap entry is skipped when it surfaces
+        with self._lock:
+            self._drop_lease(request_id)
+            if request_id in self._provider:
+                self._write_file(request_id, "", 0, done=True)
+            self._provider.pop(request_id, None)
+            self._names.pop(request_id, None)
+
+    def holder(self, request_id: int) -> Optional[str]:
+        lease = self._leases.get(request_id)
+        if lease and lease[1] >= self.clock():
+            return lease[0]
+        if self.directory and request_id in self._names:
+            lease = self._read_file(self._path(request_id))
+            if lease and not lease[2] and lease[1] >= self.clock():
+                return lease[0]
+        return None
+
+    def claimed_by(self, worker: str) -> List[int]:
+        return sorted(self._held.get(worker, ()))
+
+    def claim(self, provider_name: str, worker: str, count: int) -> List[int]:
+        # Oldest unclaimed requests first; only the handed-out entries are touched
+        with self._lock:
+            self._timers.advance()
+            queue = self._queues.get(provider_name, [])
+            claimed = []
+            while queue and len(claimed) < count:
+                request_id = heapq.heappop(queue)
+                if self._provider.get(request_id) != provider_name or request_id in self._leases:
+                    continue
+                if self._grant(request_id, worker):
+                    claimed.append(request_id)
+        for request_id in claimed:
+            self._notify(request_id, "claimed", worker)
+        return claimed
+
+    def renew(self, worker: str) -> int:
+        # Heartbeat: pushes every lease the worker holds out by another lease period
+        with self._lock:
+            self._timers.advance()
+            held = list(self._held.get(worker, ()))
+            renewed = sum(1 for request_id in held if self._grant(request_id, worker))
+        return renewed
+
+    def release(self, worker: str, request_ids: List[int] = None) -> int:
+        with self._lock:
+            held = self._held.get(worker, set())
+            released = [rid for rid in (request_ids if request_ids is not None else list(held)) if rid in held]
+            for request_id in released:
+                self._remove_file(request_id, worker)
+                self._requeue(request_id)
+        for request_id in released:
+            self._notify(request_id, "released", None)
+        return len(released)
+
+    def expire_due(self) -> int:
+        with self._lock:
+            return self._timers.advance()
+
+    def _grant(self, request_id: int, worker: str) -> bool:
+        expires_at = self.clock() + self.lease_seconds
+        foreign_expiry = self._acquire_file(request_id, worker, expires_at)
+        if foreign_expiry is not None:
+            # Held by another process: it is offered again once that lease may have ended
+            self._drop_lease(request_id)
+            if foreign_expiry != float("inf"):
+                recheck_at = min(foreign_expiry, self.clock() + self.RECHECK_SECONDS)
+                self._timers.schedule(("foreign", request_id), recheck_at, self._recheck)
+            return False
+        self._leases[request_id] = (worker, expires_at)
+        self._held.setdefault(worker, set()).add(request_id)
+        self._timers.schedule(request_id, expires_at, self._expire)
+        return True
+
+    def _drop_lease(self, request_id: int):
+        lease = self._leases.pop(request_id, None)
+        if lease:
+            self._held.get(lease[0], set()).discard(request_id)
+            self._timers.cancel(request_id)
+
+    def _requeue(self, request_id: int):
+        self._drop_lease(request_id)
+        provider_name = self._provider.get(request_id)
+        if provider_name:
+            heapq.heappush(self._queues.setdefault(provider_name, []), request_id)
+
+    def _expire(self, request_id: int):
+        # Runs under the lock from inside _timers.advance()
+        lease = self._leases.get(request_id)
+        if lease:
+            self._remove_file(request_id, lease[0])
+        self._requeue(request_id)
+        self._notify(request_id, "released", None)
+
+    def _recheck(self, key: tuple):
+        request_id = key[1]
+        if request_id not in self._leases:
+            self._requeue(request_id)
+
+    def _notify(self, request_id: int, action: str, worker: Optional[str]):
+        if self.on_change:
+            self.on_change(request_id, action, worker)
+
+    # Lease files
+
+    def _path(self, request_id: int) -> str:
+        return os.path.join(self.directory, f"{self._names.get(request_id, request_id)}.lease")
+
+    @staticmethod
+    def _read_file(path: str) -> Optional[tuple]:
+        # (worker, expires_at, done), None if there is no file; a torn one counts as expired
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+            return data["worker"], data["expires_at"], data.get("done", False)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError):
+            return "", 0, False
+
+    def _write_file(self, request_id: int, worker: str, expires_at: float, done: bool = False):
+        if not self.directory:
+            return
+        path = self._path(request_id)
+        os.makedirs(self.directory, exist_ok=True)
+        with open(f"{path}.{os.getpid()}.tmp", 'w') as f:
+            json.dump({"worker": worker, "expires_at": expires_at, "done": done}, f)
+        os.replace(f"{path}.{os.getpid()}.tmp", path)
+
+    def _remove_file(self, request_id: int, worker: str):
+        if not self.directory:
+            return
+        lease = self._read_file(self._path(request_id))
+        if lease and lease[0] == worker and not lease[2]:
+            try:
+                os.remove(self._path(request_id))
+            except FileNotFoundError:
+                pass
+
+    def _acquire_file(self, request_id: int, worker: str, expires_at: float) -> Optional[float]:
+        # None once the file names this worker; otherwise when the other holder's lease ends (inf when done)
+        if not self.directory:
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(request_id)
+        for _ in range(3):
+            try:
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                lease = self._read_file(path)
+                if lease is None:
+                    continue
+                holder, held_until, done = lease
+                if done:
+                    return float("inf")
+                if holder == worker:
+                    self._write_file(request_id, worker, expires_at)
+                    return None
+                if held_until >= self.clock():
+                    return held_until
+                if not self._take_over(path):
+                    return self.clock() + self.lease_seconds
+                continue
+            with os.fdopen(fd, 'w') as f:
+                json.dump({"worker": worker, "expires_at": expires_at, "done": False}, f)
+            return None
+        return self.clock() + self.lease_seconds
+
+    def _take_over(self, path: str) -> bool:
+        # Moves an expired lease aside. If another process replaced it with a live
+        # lease in the meantime, that one was moved instead and is put back.
+        aside = f"{path}.{os.getpid()}.stale"
+        try:
+            os.rename(path, aside)
+        except FileNotFoundError:
+            return True
+        lease = self._read_file(aside)
+        if lease and (lease[2] or lease[1] >= self.clock()):
+            try:
+                os.link(aside, path)
+            except OSError:
+                pass
+            os.remove(aside)
+            return False
+        os.remove(aside)
+        return True
+
+    def _prune(self):
+        # Done markers and long-expired leases are only needed while another process may still list the request
+        cutoff = self.clock() - self.DONE_RETENTION_SECONDS
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
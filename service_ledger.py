@@ -0,0 +1,278 @@
+import json
+import os
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+class ServiceLedger:
+    # Completed services as parallel typed columns. Full chunks are sealed into
+    # one columnar file each; the open chunk is mirrored by an append-only
+    # row file so an append costs a single small write.
+    CHUNK_ROWS = 65536
+    FORMAT = 2
+    COLUMNS = (("completed_at", "d"), ("room", "I"), ("item", "I"), ("provider", "I"),
+               ("price_cents", "q"), ("wait_seconds", "i"))
+    ROW = struct.Struct("=dIIIqi")
+    # Format 1 stored item and provider codes in 16 and 8 bits; it is converted on load
+    LEGACY_COLUMNS = (("completed_at", "d"), ("room", "I"), ("item", "H"), ("provider", "B"),
+                      ("price_cents", "q"), ("wait_seconds", "i"))
+    LEGACY_ROW = struct.Struct("=dIHBqi")
+    GROUPS = ("room", "item", "provider")
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.labels: Dict[str, List[str]] = {group: [] for group in self.GROUPS}
+        self._codes: Dict[str, Dict[str, int]] = {group: {} for group in self.GROUPS}
+        self._chunks: List[dict] = []  # {"file", "rows", "first_ts", "last_ts", "sorted"}
+        self._chunk_data: Dict[str, dict] = {}
+        self._rollups: Dict[tuple, dict] = {}
+        self._tail = self._empty_columns()
+        self._tail_sorted = True
+        self._loaded = False
+
+    @classmethod
+    def _empty_columns(cls) -> Dict[str, array]:
+        return {name: array(code) for name, code in cls.COLUMNS}
+
+    def _meta_path(self) -> str:
+        return os.path.join(self.directory, "ledger.json")
+
+    def _tail_path(self) -> str:
+        return os.path.join(self.directory, "tail.bin")
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        if not os.path.exists(self._meta_path()):
+            return
+        with open(self._meta_path(), 'r') as f:
+            meta = json.load(f)
+        for group in self.GROUPS:
+            self.labels[group] = meta["labels"][group]
+            self._codes[group] = {label: code for code, label in enumerate(self.labels[group])}
+        self._chunks = meta["chunks"]
+        if meta.get("format", 1) < self.FORMAT:
+            self._upgrade()
+        if os.path.exists(self._tail_path()):
+            rows = self._read_tail(self.ROW)
+            if rows:
+                self._tail = {name: array(code, values) for (name, code), values in zip(self.COLUMNS, rows)}
+                timestamps = self._tail["completed_at"]
+                self._tail_sorted = all(a <= b for a, b in zip(timestamps, timestamps[1:]))
+
+    def _read_tail(self, layout: struct.Struct) -> List[tuple]:
+        with open(self._tail_path(), 'rb') as f:
+            data = f.read()
+        # A torn final record from an interrupted write is dropped
+        data = data[:len(data) - len(data) % layout.size]
+        return list(zip(*layout.iter_unpack(data)))
+
+    def _upgrade(self):
+        # Chunks and the tail are rewritten in the current layout before the meta file records it
+        for chunk in self._chunks:
+            columns = {}
+            path = os.path.join(self.directory, chunk["file"])
+            with open(path, 'rb') as f:
+                for name, code in self.LEGACY_COLUMNS:
+                    columns[name] = array(code)
+                    columns[name].fromfile(f, chunk["rows"])
+            with open(path + ".tmp", 'wb') as f:
+                for name, code in self.COLUMNS:
+                    array(code, columns[name]).tofile(f)
+            os.replace(path + ".tmp", path)
+        if os.path.exists(self._tail_path()):
+            rows = list(zip(*self._read_tail(self.LEGACY_ROW)))
+            with open(self._tail_path() + ".tmp", 'wb') as f:
+                f.write(b"".join(self.ROW.pack(*row) for row in rows))
+            os.replace(self._tail_path() + ".tmp", self._tail_path())
+        self._save_meta()
+
+    def _save_meta(self):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._meta_path(), 'w') as f:
+            json.dump({"format": self.FORMAT, "labels": self.labels, "chunks": self._chunks}, f)
+
+    def _code(self, group: str, label: str, new_labels: list) -> int:
+        # New labels are only proposed here; append registers them once the row is known to be valid
+        code = self._codes[group].get(label)
+        if code is None:
+            code = len(self.labels[group])
+            new_labels.append((group, label))
+        return code
+
+    def _add_row(self, row: tuple):
+        tail = self._tail
+        if tail["completed_at"] and row[0] < tail["completed_at"][-1]:
+            self._tail_sorted = False
+        for (name, _), value in zip(self.COLUMNS, row):
+            tail[name].append(value)
+
+    def __len__(self):
+        self._load()
+        return sum(chunk["rows"] for chunk in self._chunks) + len(self._tail["completed_at"])
+
+    def append(self, completed_at: datetime, room_number: str, item_name: str, provider_name: str,
+               price: float, wait_seconds: Optional[float] = None):
+        self._load()
+        new_labels = []
+        row = (completed_at.timestamp(), self._code("room", room_number, new_labels),
+               self._code("item", item_name, new_labels), self._code("provider", provider_name or "", new_labels),
+               round(price * 100), -1 if wait_seconds is None else int(wait_seconds))
+        # Packing checks every field against its column type before the ledger changes at all
+        try:
+            record = self.ROW.pack(*row)
+        except struct.error as e:
+            raise ValueError(f"Service ledger row out of range: {e}") from e
+        if new_labels:
+            for group, label in new_labels:
+                self._codes[group][label] = len(self.labels[group])
+                self.labels[group].append(label)
+            self._save_meta()
+        self._add_row(row)
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._tail_path(), 'ab') as f:
+            f.write(record)
+        if len(self._tail["completed_at"]) >= self.CHUNK_ROWS:
+            self._seal()
+
+    def _seal(self):
+        tail = self._tail
+        timestamps = tail["completed_at"]
+        name = f"chunk-{len(self._chunks) + 1:06d}.bin"
+        with open(os.path.join(self.directory, name), 'wb') as f:
+            for column, _ in self.COLUMNS:
+                tail[column].tofile(f)
+        self._chunks.append({"file": name, "rows": len(timestamps), "first_ts": min(timestamps),
+                             "last_ts": max(timestamps), "sorted": self._tail_sorted})
+        self._chunk_data[name] = tail
+        self._save_meta()
+        for group in self.GROUPS:
+            self._rollup(self._chunks[-1], group)
+        os.remove(self._tail_path())
+        self._tail = self._empty_columns()
+        self._tail_sorted = True
+
+    def _read_chunk(self, chunk: dict) -> Dict[str, array]:
+        columns = self._chunk_data.get(chunk["file"])
+        if columns is None:
+            columns = self._empty_columns()
+            with open(os.path.join(self.directory, chunk["file"]), 'rb') as f:
+                for name, _ in self.COLUMNS:
+                    columns[name].fromfile(f, chunk["rows"])
+            self._chunk_data[chunk["file"]] = columns
+        return columns
+
+    def _segments(self, start_ts: float, end_ts: float):
+        # Sealed chunks whose time range misses the window are skipped without being read
+        self._load()
+        for chunk in self._chunks:
+            if chunk["last_ts"] >= start_ts and chunk["first_ts"] < end_ts:
+                yield self._read_chunk(chunk), chunk["sorted"]
+        if self._tail["completed_at"]:
+            yield self._tail, self._tail_sorted
+
+    def _slice(self, segment: dict, is_sorted: bool, start_ts: float, end_ts: float, names) -> Optional[dict]:
+        # Sorted segments are cut by bisection; the rare out-of-order one is filtered and sorted
+        timestamps = segment["completed_at"]
+        if is_sorted:
+            lo, hi = bisect_left(timestamps, start_ts), bisect_left(timestamps, end_ts)
+            return {name: segment[name][lo:hi] for name in names} if lo < hi else None
+        order = sorted((i for i, ts in enumerate(timestamps) if start_ts <= ts < end_ts), key=timestamps.__getitem__)
+        if not order:
+            return None
+        return {name: array(segment[name].typecode, map(segment[name].__getitem__, order)) for name in names}
+
+    def scan(self, start: datetime, end: datetime, columns=None):
+        # Yields time-ordered {column: array} slices covering [start, end)
+        start_ts, end_ts = start.timestamp(), end.timestamp()
+        names = list(columns or [name for name, _ in self.COLUMNS])
+        if "completed_at" not in names:
+            names.append("completed_at")
+        for segment, is_sorted in self._segments(start_ts, end_ts):
+            columns = self._slice(segment, is_sorted, start_ts, end_ts, names)
+            if columns:
+                yield columns
+
+    @staticmethod
+    def _day_start(day: date) -> float:
+        return datetime.combine(day, datetime.min.time()).timestamp()
+
+    def daily_totals(self, start: date, end: date, group: str = "provider") -> Dict[tuple, list]:
+        # {(day, label): [count, revenue_cents, total_wait_seconds, timed_count]} for start <= day < end.
+        # Sealed chunks answer from their per-day rollups; only the open chunk is scanned.
+        self._load()
+        start_ts, end_ts = self._day_start(start), self._day_start(end)
+        labels = self.labels[group]
+        totals: Dict[tuple, list] = {}
+        sums = []
+        for chunk in self._chunks:
+            if chunk["last_ts"] >= start_ts and chunk["first_ts"] < end_ts:
+                sums.append(self._rollup(chunk, group))
+        if self._tail["completed_at"]:
+            columns = self._slice(self._tail, self._tail_sorted, start_ts, end_ts,
+                                  [group, "price_cents", "wait_seconds", "completed_at"])
+            if columns:
+                sums.append(self._day_sums(columns, group))
+        for day_sums in sums:
+            for (day, code), entry in day_sums.items():
+                if start <= day < end:
+                    total = totals.setdefault((day, labels[code]), [0, 0, 0, 0])
+                    for n in range(4):
+                        total[n] += entry[n]
+        return totals
+
+    def _rollup_path(self, chunk: dict, group: str) -> str:
+        return os.path.join(self.directory, f"{chunk['file'][:-4]}.{group}.json")
+
+    def _rollup(self, chunk: dict, group: str) -> Dict[tuple, list]:
+        # Per-day sums of a sealed chunk, written once per group next to the chunk
+        key = (chunk["file"], group)
+        rollup = self._rollups.get(key)
+        if rollup is not None:
+            return rollup
+        path = self._rollup_path(chunk, group)
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                rollup = {(date.fromisoformat(day), code): entry for day, code, *entry in json.load(f)}
+        else:
+            columns = self._read_chunk(chunk)
+            if not chunk["sorted"]:
+                columns = self._slice(columns, False, chunk["first_ts"], chunk["last_ts"] + 1,
+                                      [name for name, _ in self.COLUMNS])
+            rollup = self._day_sums(columns, group)
+            with open(path, 'w') as f:
+                json.dump([[day.isoformat(), code] + entry for (day, code), entry in rollup.items()], f)
+        self._rollups[key] = rollup
+        return rollup
+
+    def _day_sums(self, columns: dict, group: str) -> Dict[tuple, list]:
+        # Time-ordered columns are split into days by bisecting day boundaries, then summed per group code
+        timestamps = columns["completed_at"]
+        codes, cents, waits = columns[group], columns["price_cents"], columns["wait_seconds"]
+        sums: Dict[tuple, list] = {}
+        day = datetime.fromtimestamp(timestamps[0]).date()
+        lo = 0
+        while lo < len(timestamps):
+            next_day = day + timedelta(days=1)
+            hi = bisect_left(timestamps, self._day_start(next_day), lo)
+            for code, entry in self._group_sums(codes[lo:hi], cents[lo:hi], waits[lo:hi]).items():
+                sums[(day, code)] = entry
+            lo, day = hi, next_day
+        return sums
+
+    @staticmethod
+    def _group_sums(codes: array, cents: array, waits: array) -> Dict[int, list]:
+        acc: Dict[int, list] = {}
+        for code, amount, wait in zip(codes, cents, waits):
+            entry = acc.get(code)
+            if entry is None:
+                entry = acc[code] = [0, 0, 0, 0]
+            entry[0] += 1
+            entry[1] += amount
+            if wait >= 0:
+                entry[2] += wait
+                entry[3] += 1
+        return acc
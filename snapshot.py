@@ -0,0 +1,161 @@
+from collections import namedtuple
+from typing import Dict, List, Optional
+
+RoomView = namedtuple("RoomView", ["room_number", "occupant_id", "occupant_name", "overdue",
+                                   "cards", "pending", "services"])
+CardView = namedtuple("CardView", ["card_id", "is_active", "holder_name"])
+ReservationView = namedtuple("ReservationView", ["customer_id", "name", "room_number", "start_date", "length"])
+
+class AdminSnapshot:
+    # Immutable point-in-time view of what the reports read. Nothing here is
+    # mutated after publication, so any number of threads can read one while
+    # the writer builds the next.
+    def __init__(self, version: int, room_order: tuple, rooms: Dict[str, RoomView], guests: Dict[str, str],
+                 reservations: Dict[str, ReservationView] = None, service_names: tuple = ()):
+        self.version = version
+        self.room_order = room_order
+        self._rooms = rooms
+        self._guests = guests  # customer_id -> room number, for guests with an active stay
+        self._reservations = reservations or {}  # customer_id -> view, for reservations not yet checked in
+        self.service_names = service_names
+
+    def room(self, room_number: str) -> Optional[RoomView]:
+        return self._rooms.get(room_number)
+
+    def rooms(self):
+        return [self._rooms[room_number] for room_number in self.room_order]
+
+    def pending_reservations(self) -> List[ReservationView]:
+        return list(self._reservations.values())
+
+    def checked_in(self) -> List[tuple]:
+        # (customer_id, name) in room order
+        return [(view.occupant_id, view.occupant_name) for view in self.rooms() if view.occupant_id]
+
+    def occupancy_report(self) -> str:
+        lines = ["--- Room Occupancy Status ---"]
+        for view in self.rooms():
+            customer_info = "Vacant"
+            if view.occupant_id:
+                customer_info = f"Occupied by Customer: {view.occupant_name} (ID: {view.occupant_id})"
+                if view.overdue:
+                    customer_info += " - OVERDUE"
+            lines.append(f"Room: {view.room_number}, Status: {customer_info}")
+            lines.append("  Cards:")
+            if not view.cards:
+                lines.append("    - None")
+            for card in view.cards:
+                assigned_to = f"Assigned to: {card.holder_name}" if card.holder_name else "Unassigned"
+                lines.append(f"    - Card ID: {card.card_id}, Active: {card.is_active}, {assigned_to}")
+            lines.append(f"  Pending Services: {', '.join(view.pending) or 'None'}")
+        lines.append("-----------------------------")
+        return "\n".join(lines) + "\n"
+
+    def service_record(self, customer_id: str) -> str:
+        view = self._rooms.get(self._guests.get(customer_id))
+        if view is None:
+            return f"Customer with ID {customer_id} has no active stay."
+        if not view.services:
+            return (f"No services used in Room {view.room_number} during the stay of "
+                    f"Customer {view.occupant_name}.")
+        report = f"--- Service Record for Customer {view.occupant_name} (ID: {customer_id}) ---\n"
+        report += f"Room: {view.room_number}\n"
+        for name, price in view.services:
+            report += f"- {name}: ${price}\n"
+        report += f"-------------------------------------------------------------------\n"
+        report += f"Total Service Charges: ${sum(price for _, price in view.services)}\n"
+        return report
+
+class SnapshotStore:
+    def __init__(self):
+        # Only the latest version is referenced here; older ones live exactly as
+        # long as a reader still holds them and are then freed.
+        self.current = AdminSnapshot(0, (), {}, {})
+        self._dirty = set()
+        self._rooms_changed = False
+        self._dirty_reservations = set()
+        self._services_changed = False
+
+    def touch(self, room_number: str):
+        self._dirty.add(room_number)
+
+    def rooms_changed(self):
+        self._rooms_changed = True
+
+    def touch_reservation(self, customer_id: str):
+        self._dirty_reservations.add(customer_id)
+
+    def services_changed(self):
+        self._services_changed = True
+
+    def _changed(self) -> bool:
+        return bool(self._dirty or self._rooms_changed or self._dirty_reservations or self._services_changed)
+
+    def reset(self, admin: 'Admin'):
+        self.current = AdminSnapshot(admin.version, (), {}, {})
+        self._dirty = {room.room_number for room in admin.rooms}
+        self._rooms_changed = True
+        self._dirty_reservations = set(admin.reservations)
+        self._services_changed = True
+        self.publish(admin)
+
+    def publish(self, admin: 'Admin') -> AdminSnapshot:
+        # Copy-on-write: the new version shares every unchanged RoomView with the
+        # old one, and only rooms touched since the last commit are rebuilt
+        self.current = self._build(admin)
+        self._dirty = set()
+        self._rooms_changed = False
+        self._dirty_reservations = set()
+        self._services_changed = False
+        return self.current
+
+    def preview(self, admin: 'Admin') -> AdminSnapshot:
+        # The writer's own view of uncommitted changes, not visible to other readers
+        return self._build(admin) if self._changed() else self.current
+
+    def _build(self, admin: 'Admin') -> AdminSnapshot:
+        base = self.current
+        reservations = base._reservations
+        if self._dirty_reservations:
+            reservations = dict(reservations)
+            for customer_id in self._dirty_reservations:
+                stay = admin.reservations.get(customer_id)
+                if stay and not stay.is_active:
+                    reservations[customer_id] = ReservationView(customer_id, stay.customer.name,
+                                                                stay.room.room_number, stay.start_date, stay.length)
+                else:
+                    reservations.pop(customer_id, None)
+        service_names = base.service_names
+        if self._services_changed:
+            service_names = tuple(item.name for provider in admin.service_providers.values() for item in provider.items)
+        if not self._dirty and not self._rooms_changed:
+            return AdminSnapshot(admin.version, base.room_order, base._rooms, base._guests, reservations, service_names)
+        rooms = dict(base._rooms)
+        guests = dict(base._guests)
+        for room_number in self._dirty:
+            old = rooms.pop(room_number, None)
+            if old and old.occupant_id and guests.get(old.occupant_id) == room_number:
+                del guests[old.occupant_id]
+            view = self._room_view(admin, room_number)
+            if view:
+                rooms[room_number] = view
+                if view.occupant_id:
+                    guests[view.occupant_id] = room_number
+        room_order = tuple(room.room_number for room in admin.rooms) if self._rooms_changed else base.room_order
+        return AdminSnapshot(admin.version, room_order, rooms, guests, reservations, service_names)
+
+    @staticmethod
+    def _room_view(admin: 'Admin', room_number: str) -> Optional[RoomView]:
+        if not admin.find_room(room_number):
+            return None
+        occupant = admin.occupant_of(room_number)
+        held_card = occupant.card.card_id if occupant and occupant.card else None
+        cards = tuple(CardView(card_id, is_active, occupant.name if card_id == held_card else None)
+                      for card_id, is_active in admin.card_entries(room_number))
+        return RoomView(room_number,
+                        occupant.customer_id if occupant else None,
+                        occupant.name if occupant else None,
+                        bool(occupant) and occupant.customer_id in admin.overdue_customers,
+                        cards,
+                        tuple(item.name for item in admin.room_pending_services.get(room_number, [])),
+                        tuple((item.name, item.price) for item in admin.room_services.get(room_number, [])))
@@ -1,14 +1,22 @@
 from datetime import datetime
 from typing import Optional
 
-class Stay:
-    def __init__(self, customer: 'Customer', room: 'Room', start_date: datetime, length: int):
+from tracking import Tracked
+
+class Stay(Tracked):
+    NESTED = ("room",)
+
+    def __init__(self, customer: 'Customer', room: 'Room', start_date: datetime, length: int,
+                 booked_at: datetime = None):
         self.customer = customer
         self.room = room
         self.start_date = start_date
         self.length = length
+        self.booked_at = booked_at or datetime.now()
         self.end_date: Optional[datetime] = None
+        self.checked_in_at: Optional[datetime] = None
         self.is_active = False
+        self.room_charges = 0.0
 
     def end_stay(self, end_date: datetime):
         self.end_date = end_date
@@ -23,13 +31,16 @@ class Stay:
             "room": self.room.to_dict(),
             "start_date": self.start_date.isoformat(),
             "length": self.length,
+            "booked_at": self.booked_at.isoformat(),
             "end_date": self.end_date.isoformat() if self.end_date else None,
-            "is_active": self.is_active
+            "checked_in_at": self.checked_in_at.isoformat() if self.checked_in_at else None,
+            "is_active": self.is_active,
+            "room_charges": self.room_charges
         }
 
     @classmethod
-    def from_dict(cls, data, customers, room_map):
-        customer = next((c for c in customers if c.customer_id == data["customer_id"]), None)
+    def from_dict(cls, data, customer_map, room_map):
+        customer = customer_map.get(data["customer_id"])
         if not customer:
             raise ValueError(f"Customer with ID {data['customer_id']} not found during deserialization")
         room_number = data["room"]["room_number"]
@@ -37,8 +48,13 @@ class Stay:
         if not room:
             raise ValueError(f"Room with number {room_number} not found in room_map during deserialization")
         start_date = datetime.fromisoformat(data["start_date"])
-        stay = cls(customer, room, start_date, data["length"])
+        # Stays saved before booking times were kept count as booked on arrival
+        booked_at = datetime.fromisoformat(data["booked_at"]) if data.get("booked_at") else start_date
+        stay = cls(customer, room, start_date, data["length"], booked_at)
         stay.is_active = data["is_active"]
+        stay.room_charges = data.get("room_charges", 0.0)
         if data["end_date"]:
             stay.end_date = datetime.fromisoformat(data["end_date"])
+        if data.get("checked_in_at"):
+            stay.checked_in_at = datetime.fromisoformat(data["checked_in_at"])
         return stay
\ No newline at end of file
@@ -0,0 +1,139 @@
+import json
+import os
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Dict, List, Optional
+
+class StayArchive:
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._partitions: List[str] = []
+        self._by_customer: Dict[str, List[tuple]] = {}
+        self._loaded = False
+
+    @staticmethod
+    def partition_key(when: datetime) -> str:
+        return when.strftime("%Y-%m")
+
+    def _data_path(self, partition: str) -> str:
+        return os.path.join(self.directory, f"{partition}.jsonl")
+
+    def _index_path(self, partition: str) -> str:
+        return os.path.join(self.directory, f"{partition}.idx")
+
+    def _guests_path(self) -> str:
+        return os.path.join(self.directory, "guests.tsv")
+
+    @staticmethod
+    def _guest_line(customer_id: str, name: str) -> str:
+        return f"{customer_id}\t{' '.join(name.split())}\n"
+
+    def _load_index(self):
+        # The .idx sidecars hold "customer_id offset" pairs, so building the
+        # index never has to parse the archived records themselves.
+        if self._loaded:
+            return
+        self._loaded = True
+        if not os.path.isdir(self.directory):
+            return
+        for filename in sorted(os.listdir(self.directory)):
+            if not filename.endswith(".idx"):
+                continue
+            partition = filename[:-4]
+            self._partitions.append(partition)
+            with open(self._index_path(partition), 'r') as f:
+                for line in f:
+                    customer_id, offset = line.rsplit(" ", 1)
+                    self._by_customer.setdefault(customer_id, []).append((partition, int(offset)))
+
+    def append(self, customer: 'Customer', stay: Optional['Stay'], services: List['ItemService'],
+               archived_at: datetime = None):
+        archived_at = archived_at or datetime.now()
+        return self._write({
+            "archived_at": archived_at.isoformat(),
+            "customer": {"name": customer.name, "customer_id": customer.customer_id},
+            "stay": stay.to_dict() if stay else None,
+            "services": [item.to_dict() for item in services]
+        }, archived_at)
+
+    def append_raw(self, customer_data: dict, archived_at: datetime = None):
+        # A guest still in its saved form, archived without building a Customer
+        archived_at = archived_at or datetime.now()
+        return self._write({
+            "archived_at": archived_at.isoformat(),
+            "customer": {"name": customer_data["name"], "customer_id": customer_data["customer_id"]},
+            "stay": customer_data.get("stay"),
+            "services": []
+        }, archived_at)
+
+    def _write(self, record: dict, archived_at: datetime) -> dict:
+        self._load_index()
+        customer_id, name = record["customer"]["customer_id"], record["customer"]["name"]
+        partition = self.partition_key(archived_at)
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._data_path(partition), 'ab') as f:
+            offset = f.tell()
+            f.write((json.dumps(record) + "\n").encode("utf-8"))
+        with open(self._index_path(partition), 'a') as f:
+            f.write(f"{customer_id} {offset}\n")
+        self._ensure_guests_file()
+        with open(self._guests_path(), 'a') as f:
+            f.write(self._guest_line(customer_id, name))
+        if partition not in self._partitions:
+            self._partitions.insert(bisect_left(self._partitions, partition), partition)
+        self._by_customer.setdefault(customer_id, []).append((partition, offset))
+        return record
+
+    def customer_ids(self) -> List[str]:
+        self._load_index()
+        return list(self._by_customer.keys())
+
+    def _ensure_guests_file(self):
+        # guests.tsv holds one "customer_id<TAB>name" line per archived stay; archives
+        # written before it existed are scanned once to fill it in.
+        path = self._guests_path()
+        if os.path.exists(path) or not self._partitions:
+            return
+        names = {}
+        for partition in self._partitions:
+            with open(self._data_path(partition), 'r') as f:
+                for line in f:
+                    customer = json.loads(line)["customer"]
+                    names[customer["customer_id"]] = customer["name"]
+        with open(path, 'w') as f:
+            for customer_id, name in names.items():
+                f.write(self._guest_line(customer_id, name))
+
+    def guest_names(self) -> Dict[str, str]:
+        self._load_index()
+        self._ensure_guests_file()
+        names = {}
+        if os.path.exists(self._guests_path()):
+            with open(self._guests_path(), 'r') as f:
+                for line in f:
+                    customer_id, name = line.rstrip("\n").split("\t", 1)
+                    names[customer_id] = name
+        return names
+
+    def records_for_customer(self, customer_id: str) -> List[dict]:
+        self._load_index()
+        records = []
+        for partition, offset in self._by_customer.get(customer_id, []):
+            with open(self._data_path(partition), 'rb') as f:
+                f.seek(offset)
+                records.append(json.loads(f.readline()))
+        return records
+
+    def records_between(self, start: datetime, end: datetime) -> List[dict]:
+        self._load_index()
+        first = bisect_left(self._partitions, self.partition_key(start))
+        last = bisect_right(self._partitions, self.partition_key(end))
+        records = []
+        for partition in self._partitions[first:last]:
+            with open(self._data_path(partition), 'r') as f:
+                for line in f:
+                    record = json.loads(line)
+                    archived_at = datetime.fromisoformat(record["archived_at"])
+                    if start <= archived_at <= end:
+                        records.append(record)
+        return records
@@ -0,0 +1,79 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from admin import Admin
+from checkpoint import Checkpointer
+
+def room_data(room_number: str) -> dict:
+    return {"room_number": room_number, "room_type": "standard", "floor": None, "capacity": 2,
+            "features": [], "service_record": [], "pending_services": []}
+
+def card_data(card_id: str, room_number: str, is_active: bool = False) -> dict:
+    return {"card_id": card_id, "room": room_data(room_number), "is_active": is_active}
+
+def legacy_data() -> dict:
+    # Single-file layout from before the segment store: one guest checked out
+    # long ago, one with a reservation, and idle cards in two rooms
+    start = datetime.now() + timedelta(days=2)
+    past_stay = {"customer_id": "PAST1", "room": room_data("101"), "start_date": "2025-01-03T14:00:00",
+                 "length": 2, "booked_at": "2024-12-01T09:00:00", "end_date": "2025-01-05T11:00:00",
+                 "is_active": False, "room_charges": 240.0}
+    return {
+        "name": "Legacy",
+        "rooms": [room_data("101"), room_data("102"), room_data("103")],
+        "customers": [{"name": "Past Guest", "customer_id": "PAST1", "stay": past_stay, "card": None},
+                      {"name": "Next Guest", "customer_id": "NEXT1", "stay": None, "card": None}],
+        "reservations": {"NEXT1": {"customer_id": "NEXT1", "room": room_data("102"),
+                                   "start_date": start.isoformat(), "length": 3,
+                                   "booked_at": datetime.now().isoformat(), "end_date": None,
+                                   "is_active": False, "room_charges": 0.0}},
+        "cards": [card_data("SPARE-101", "101"), card_data("SPARE-103A", "103"), card_data("SPARE-103B", "103")],
+        "service_providers": {},
+        "room_services": {}, "room_pending_services": {}
+    }
+
+class ArchiveLegacyGuestsTest(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.directory = tempfile.TemporaryDirectory()
+        os.chdir(self.directory.name)
+        with open(Admin.DATA_FILE, 'w') as f:
+            json.dump(legacy_data(), f)
+
+    def tearDown(self):
+        Checkpointer.flush_all()
+        os.chdir(self.cwd)
+        self.directory.cleanup()
+
+    def test_deferred_past_guest_is_archived_unbuilt(self):
+        admin = Admin.load_from_file("Legacy")
+        self.assertFalse(admin.customers.loaded)
+        self.assertEqual(admin.archive_past_customers(), 1)
+        self.assertFalse(admin.customers.loaded)
+        self.assertEqual(len(admin.customers), 1)
+        records = admin.archive.records_for_customer("PAST1")
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["customer"]["name"], "Past Guest")
+        self.assertEqual(records[0]["stay"]["room_charges"], 240.0)
+        admin.save_to_file()
+        self.assertTrue(admin.flush())
+
+        reloaded = Admin.load_from_file("Legacy")
+        self.assertEqual([c.customer_id for c in reloaded.customers], ["NEXT1"])
+        self.assertEqual(reloaded.archive_past_customers(), 0)
+
+    def test_cards_for_one_room_leave_other_rooms_deferred(self):
+        admin = Admin.load_from_file("Legacy")
+        cards = admin.get_cards_for_room("103")
+        self.assertEqual(sorted(card.card_id for card in cards), ["SPARE-103A", "SPARE-103B"])
+        self.assertFalse(admin.cards.loaded)
+        self.assertEqual([data["card_id"] for data in admin.cards.deferred_matching(lambda data: True)],
+                         ["SPARE-101"])
+        self.assertEqual(sorted(card_id for card_id, _ in admin.card_entries("103")), ["SPARE-103A", "SPARE-103B"])
+        self.assertEqual(len(admin.cards), 3)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import date
+
+from night_audit import NightAudit
+from snapshot import AdminSnapshot, CardView, RoomView
+
+def make_snapshot(room_count: int) -> AdminSnapshot:
+    rooms = {}
+    for n in range(room_count):
+        room_number = str(1000 + n)
+        occupant = f"CUST{n}" if n % 3 == 0 else None
+        cards = (CardView(f"CARD-{occupant}", n % 9 != 0, occupant),) if occupant else ()
+        pending = ((n, "Hot Beverage", "Hotel", 4.5),) if n % 7 == 0 else ()
+        services = (("Cold Beverage", 3.25),) if occupant and n % 2 == 0 else ()
+        rooms[room_number] = RoomView(room_number, occupant, occupant, n % 11 == 0 and occupant is not None,
+                                      cards, pending, services)
+    # The same card in the first and last room can only be seen once partitions are merged
+    first, last = str(1000), str(1000 + room_count - 1)
+    rooms[last] = rooms[last]._replace(cards=rooms[first].cards)
+    return AdminSnapshot(7, tuple(rooms), rooms, {})
+
+class NightAuditTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.snapshot = make_snapshot(NightAudit.PARTITION_ROOMS * 3 + 17)
+        self.business_date = date(2026, 10, 19)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def run_audit(self, workers: int) -> dict:
+        report = NightAudit(self.directory.name, workers).run(self.snapshot, self.business_date)
+        report.pop("audited_at")
+        return report
+
+    def test_pool_matches_serial_run(self):
+        audit = NightAudit(self.directory.name, workers=2)
+        self.assertEqual(len(audit.partitions(self.snapshot)), 4)
+        serial = self.run_audit(workers=1)
+        pooled = self.run_audit(workers=2)
+        self.assertEqual(pooled, serial)
+        self.assertEqual(serial["rooms"], NightAudit.PARTITION_ROOMS * 3 + 17)
+        self.assertIn({"room_number": "1000", "issue": "Card CARD-CUST0 is also issued for another room."},
+                      serial["issues"])
+
+    def test_report_is_written(self):
+        report = NightAudit(self.directory.name, workers=2).run(self.snapshot, self.business_date)
+        with open(os.path.join(self.directory.name, "2026-10-19.json")) as f:
+            self.assertEqual(json.load(f), report)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import tempfile
+import unittest
+from datetime import date, datetime, timedelta
+
+from admin import Admin
+from checkpoint import Checkpointer
+from customer import Customer
+from room import Room
+
+class LateArrivalKpiTest(unittest.TestCase):
+    # Booked three nights before today for five nights, but only checked in today
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.directory = tempfile.TemporaryDirectory()
+        os.chdir(self.directory.name)
+        self.admin = Admin("Reports")
+        self.today = date.today()
+        room = Room("101")
+        room.opened_on = self.today - timedelta(days=10)
+        self.admin.add_room(room)
+        self.admin.add_customer(Customer("Late Guest", "LATE1"))
+        self.admin.add_reservation("LATE1", room, 5, datetime.now() - timedelta(days=3))
+        self.assertTrue(self.admin.check_in("LATE1", True))
+
+    def tearDown(self):
+        Checkpointer.flush_all()
+        os.chdir(self.cwd)
+        self.directory.cleanup()
+
+    def sold_by_day(self) -> dict:
+        rows = self.admin.reports.daily(self.today - timedelta(days=4), self.today + timedelta(days=3), self.today)
+        return {date.fromisoformat(row["date"]): row["rooms_sold"] for row in rows}
+
+    def test_in_house_stay_counts_from_check_in(self):
+        sold = self.sold_by_day()
+        self.assertEqual([sold[self.today - timedelta(days=n)] for n in range(1, 5)], [0, 0, 0, 0])
+        # The booked end is two nights after today
+        self.assertEqual([sold[self.today + timedelta(days=n)] for n in range(3)], [1, 1, 0])
+
+    def test_checked_out_stay_matches_charged_nights(self):
+        ok, _ = self.admin.check_out("LATE1")
+        self.assertTrue(ok)
+        stay_charges = self.admin.archive.records_for_customer("LATE1")[-1]["stay"]["room_charges"]
+        sold = self.sold_by_day()
+        self.assertEqual(sum(sold.values()), 1)
+        self.assertEqual(sold[self.today], 1)
+        row = self.admin.reports.daily(self.today, self.today + timedelta(days=1), self.today)[0]
+        self.assertEqual(row["room_revenue_cents"], round(stay_charges * 100))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+import math
+import random
+import unittest
+
+from scheduler import TimerWheel
+
+class FakeClock:
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+class TimerWheelTest(unittest.TestCase):
+    # Small geometry so every level and the overflow list are reached quickly:
+    # level spans are 1, 4 and 16 one-second ticks, and beyond 64 ticks timers overflow
+    def setUp(self):
+        self.clock = FakeClock()
+        self.wheel = TimerWheel(self.clock, tick_seconds=1, slots=4, levels=3)
+        self.fired = []
+
+    def record(self, key):
+        self.fired.append((key, self.clock.now))
+
+    def step_to(self, until: float, step: float = 1.0):
+        while self.clock.now < until:
+            self.clock.now += step
+            self.wheel.advance()
+
+    def live_counts(self):
+        counts = [0] * self.wheel.levels
+        for level, wheel in enumerate(self.wheel._wheels):
+            counts[level] = sum(1 for bucket in wheel for timer in bucket if not timer.cancelled)
+        return counts
+
+    def test_expiry_on_each_level_is_never_early(self):
+        dues = {"level0": 3, "level1": 9, "level2": 40, "overflow": 150, "fraction": 20.5}
+        for key, due in dues.items():
+            self.wheel.schedule(key, due, self.record)
+        self.step_to(200)
+        self.assertEqual({key for key, _ in self.fired}, set(dues))
+        for key, fired_at in self.fired:
+            self.assertEqual(fired_at, math.ceil(dues[key]), key)
+
+    def test_large_jumps_fire_everything_due_and_nothing_more(self):
+        rng = random.Random(7)
+        dues = {n: rng.uniform(1, 300) for n in range(500)}
+        for key, due in dues.items():
+            self.wheel.schedule(key, due, self.record)
+        for now in (5, 17, 63, 64, 65, 150, 255, 256, 301):
+            self.clock.now = now
+            self.wheel.advance()
+            fired = {key for key, _ in self.fired}
+            self.assertEqual(fired, {key for key, due in dues.items() if math.ceil(due) <= now}, now)
+            self.assertEqual(self.wheel._counts, self.live_counts(), now)
+        self.assertEqual(len(self.wheel), 0)
+
+    def test_cascades_move_timers_down_one_level_at_a_time(self):
+        self.wheel.schedule("far", 38, self.record)
+        self.assertEqual(self.wheel._counts, [0, 0, 1])
+        self.step_to(31)
+        self.assertEqual(self.wheel._counts, [0, 0, 1])
+        self.step_to(32)
+        self.assertEqual(self.wheel._counts, [0, 1, 0])
+        self.step_to(36)
+        self.assertEqual(self.wheel._counts, [1, 0, 0])
+        self.step_to(37)
+        self.assertEqual(self.fired, [])
+        self.step_to(38)
+        self.assertEqual(self.fired, [("far", 38)])
+        self.assertEqual(self.wheel._counts, [0, 0, 0])
+
+    def test_overflow_is_placed_back_into_the_wheel(self):
+        self.wheel.schedule("overflow", 100, self.record)
+        self.assertEqual(self.wheel._counts, [0, 0, 0])
+        self.step_to(64)
+        self.assertEqual(self.wheel._counts, [0, 0, 1])
+        self.step_to(99)
+        self.assertEqual(self.fired, [])
+        self.step_to(100)
+        self.assertEqual(self.fired, [("overflow", 100)])
+
+    def test_cancel_prevents_firing_and_counts_the_timer_out(self):
+        for key, due in (("a", 2), ("b", 9), ("c", 40), ("d", 150)):
+            self.wheel.schedule(key, due, self.record)
+        for key in ("a", "b", "c", "d"):
+            self.assertTrue(self.wheel.cancel(key))
+            self.assertEqual(self.wheel._counts, self.live_counts())
+        self.assertFalse(self.wheel.cancel("a"))
+        self.assertEqual(self.wheel._counts, [0, 0, 0])
+        self.step_to(200)
+        self.assertEqual(self.fired, [])
+
+    def test_cancelled_levels_do_not_stop_tick_skipping(self):
+        self.wheel.schedule("soon", 2, self.record)
+        self.wheel.schedule("later", 50, self.record)
+        self.wheel.cancel("soon")
+        # With level 0 counted empty the wheel jumps straight to the next level-2 cascade
+        self.assertEqual(self.wheel._next_busy_tick(60), 16)
+
+    def test_reschedule_replaces_the_previous_timer(self):
+        self.wheel.schedule("k", 5, self.record)
+        self.wheel.schedule("k", 30, self.record)
+        self.assertEqual(len(self.wheel), 1)
+        self.assertEqual(self.wheel._counts, self.live_counts())
+        self.step_to(40)
+        self.assertEqual(self.fired, [("k", 30)])
+
+    def test_callbacks_may_cancel_and_schedule(self):
+        def first(key):
+            self.record(key)
+            self.wheel.cancel("second")
+            self.wheel.schedule("third", self.clock.now, self.record)
+        self.wheel.schedule("first", 10, first)
+        self.wheel.schedule("second", 10, self.record)
+        self.step_to(12)
+        self.assertEqual(self.fired, [("first", 10), ("third", 10)])
+        self.assertEqual(self.wheel._counts, [0, 0, 0])
+
+    def test_random_schedule_and_cancel_against_a_reference(self):
+        rng = random.Random(11)
+        expected = {}
+        for n in range(300):
+            now = self.clock.now
+            key = rng.randrange(60)
+            if rng.random() < 0.3:
+                self.assertEqual(self.wheel.cancel(key), expected.pop(key, None) is not None)
+            else:
+                due = now + rng.uniform(0, 120)
+                self.wheel.schedule(key, due, self.record)
+                expected[key] = math.ceil(due)
+            self.clock.now += rng.choice((0, 1, 3, 17))
+            self.fired = []
+            self.wheel.advance()
+            for fired_key, fired_at in self.fired:
+                self.assertLessEqual(expected.pop(fired_key), fired_at)
+            self.assertTrue(all(due > self.clock.now for due in expected.values()))
+            self.assertEqual(self.wheel._counts, self.live_counts())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,22 @@
+class Tracked:
+    # Once a SegmentStore has saved an object it is told about the object's first
+    # change after each save, including in-place changes reported with touch().
+    # NESTED names the tracked objects whose saved form is embedded in this one.
+    NESTED = ()
+
+    def __setattr__(self, name, value, _set=object.__setattr__):
+        # Runs on every assignment, constructors included, so the untracked case is kept to one lookup
+        _set(self, name, value)
+        state = self.__dict__
+        if "_store" in state and not state["_dirty"]:
+            state["_dirty"] = True
+            state["_store"].changed(self)
+
+    def touch(self):
+        state = self.__dict__
+        if "_store" in state and not state["_dirty"]:
+            state["_dirty"] = True
+            state["_store"].changed(self)
+
+    def is_dirty(self) -> bool:
+        return self.__dict__.get("_dirty", True)